@@ -2,10 +2,20 @@
 """
 Add regional tags to ingredients based on naming patterns.
 Phase 4.6: Ingredient Database Regional Expansion
+
+Usage:
+    python add_regional_tags.py
+    python add_regional_tags.py --input build/pipeline/ingredients_remediated.json --output build/pipeline/ingredients_tagged.json
 """
 
+import argparse
 import json
-import re
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+
+from feed_pipeline import pattern_profile  # noqa: E402
 
 # Regional patterns (name patterns -> region)
 REGIONAL_PATTERNS = {
@@ -38,20 +48,29 @@ REGIONAL_PATTERNS = {
         'Oceania, Global',
 }
 
+# Table name of REGIONAL_PATTERNS in pattern profiles
+REGIONAL_TABLE = 'regional'
+
 def get_region(ingredient_name):
     """Determine region based on ingredient name."""
     name_lower = ingredient_name.lower()
+    pattern_profile.lookup(REGIONAL_TABLE, REGIONAL_PATTERNS)
     
     for pattern, region in REGIONAL_PATTERNS.items():
-        if re.search(pattern, name_lower):
+        if pattern_profile.search(REGIONAL_TABLE, pattern, name_lower):
             return region
     
     return 'Global'  # Default
 
 def main():
+    parser = argparse.ArgumentParser(description="Tag ingredients with the regions their names point to")
+    parser.add_argument("--input", default='assets/raw/ingredients_standardized.json', help="catalog to tag")
+    parser.add_argument("--output", help="tagged catalog (default: the input, rewritten)")
+    args = parser.parse_args()
+    
     # Load ingredients
-    input_file = 'assets/raw/ingredients_standardized.json'
-    output_file = 'assets/raw/ingredients_standardized.json'
+    input_file = args.input
+    output_file = args.output or args.input
     
     with open(input_file, 'r', encoding='utf-8') as f:
         ingredients = json.load(f)
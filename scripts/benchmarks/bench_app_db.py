@@ -0,0 +1,103 @@
+"""
+Benchmark: first-launch data load, JSON import versus prebuilt database
+
+JSON path (what `_populateTables` does): read and parse the three JSON
+assets, map every record to its row, and insert the rows one statement at a
+time into a freshly created schema. Prebuilt path: copy the file built by
+`build_app_db` and read every ingredient back (`getAll`). Also compares the
+size of the JSON assets and of the database, raw and gzip-compressed (as
+packed in the APK).
+
+Usage:
+    python scripts/benchmarks/bench_app_db.py --repeat 20
+"""
+
+import argparse
+import gzip
+import json
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.app_db import (  # noqa: E402
+    ANIMAL_TYPES_JSON, CATEGORIES_JSON, DB_FILE_NAME, INGREDIENTS_JSON, build_app_db, ingredient_row, load_schema,
+)
+
+
+def json_import(path, schema):
+    """Create the schema and insert the parsed JSON assets row by row."""
+    conn = sqlite3.connect(path)
+    for statement in schema.tables:
+        conn.execute(statement)
+    for table, source, to_row in (
+            ('ingredients', INGREDIENTS_JSON, ingredient_row),
+            ('category', CATEGORIES_JSON, dict),
+            ('animal_types', ANIMAL_TYPES_JSON, dict)):
+        with open(source, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        for record in records:
+            row = to_row(record)
+            conn.execute(f"INSERT INTO {table} ({', '.join(row)}) VALUES ({', '.join('?' * len(row))})",
+                         tuple(row.values()))
+    conn.commit()
+    rows = conn.execute('SELECT * FROM ingredients').fetchall()
+    conn.close()
+    return len(rows)
+
+
+def prebuilt_copy(path, prebuilt):
+    """Copy the shipped database into place and read every ingredient."""
+    shutil.copyfile(prebuilt, path)
+    conn = sqlite3.connect(path)
+    rows = conn.execute('SELECT * FROM ingredients').fetchall()
+    conn.close()
+    return len(rows)
+
+
+def timed(fn, workdir, repeat):
+    best = float('inf')
+    for i in range(repeat):
+        path = workdir / f"{fn.__name__}_{i}.db"
+        start = time.perf_counter()
+        count = fn(path)
+        best = min(best, time.perf_counter() - start)
+        path.unlink()
+    return best, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    schema = load_schema()
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+        prebuilt = workdir / DB_FILE_NAME
+        start = time.perf_counter()
+        build_app_db(prebuilt, schema=schema)
+        build_time = time.perf_counter() - start
+
+        assets = [INGREDIENTS_JSON, CATEGORIES_JSON, ANIMAL_TYPES_JSON]
+        json_bytes = sum(path.stat().st_size for path in assets)
+        json_gzip = sum(len(gzip.compress(path.read_bytes())) for path in assets)
+        db_bytes = prebuilt.stat().st_size
+        db_gzip = len(gzip.compress(prebuilt.read_bytes()))
+
+        json_time, json_rows = timed(lambda path: json_import(path, schema), workdir, args.repeat)
+        copy_time, copy_rows = timed(lambda path: prebuilt_copy(path, prebuilt), workdir, args.repeat)
+
+    print(f"build_app_db: {build_time * 1000:.1f} ms")
+    print(f"{'':<10} {'bytes':>10} {'gzip':>10} {'load ms':>9} {'rows':>6}")
+    print(f"{'json':<10} {json_bytes:>10} {json_gzip:>10} {json_time * 1000:>9.2f} {json_rows:>6}")
+    print(f"{'prebuilt':<10} {db_bytes:>10} {db_gzip:>10} {copy_time * 1000:>9.2f} {copy_rows:>6}")
+    print(f"load speedup: {json_time / copy_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark: columnar memory-mapped store vs. json.load
+
+Writes a synthetic catalog (ingredients_standardized.json repeated to
+--rows records) to a temporary directory, builds its columnar companion,
+then times a cold start plus one nutrient scan both ways:
+- json.load + max(ing.get(field)) over the list of dicts
+- open_store + max over the mapped column
+
+Usage:
+    python scripts/benchmarks/bench_columnar.py --rows 1000000
+"""
+
+import argparse
+import json
+import math
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.columnar import build_store, open_store  # noqa: E402
+from feed_pipeline.paths import RAW_DIR  # noqa: E402
+
+
+def write_catalog(path, rows):
+    """Repeat the standardized catalog until it holds ``rows`` records."""
+    with open(RAW_DIR / "ingredients_standardized.json", 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for i in range(rows):
+            if i:
+                f.write(',')
+            record = base[i % len(base)]
+            f.write(json.dumps(record, ensure_ascii=False))
+        f.write(']')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--field", default="energy.me_pig")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = Path(tmp) / "catalog.json"
+        store_file = Path(tmp) / "catalog.json.cols"
+        write_catalog(catalog, args.rows)
+
+        start = time.perf_counter()
+        build_store(catalog, store_file)
+        build_time = time.perf_counter() - start
+
+        parent, _, child = args.field.partition('.')
+        start = time.perf_counter()
+        with open(catalog, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        if child:
+            expected = max((r.get(parent) or {}).get(child) or -math.inf for r in records)
+        else:
+            expected = max(r.get(parent) or -math.inf for r in records)
+        json_scan = time.perf_counter() - start
+        del records
+
+        start = time.perf_counter()
+        store = open_store(catalog, store_file)
+        open_time = time.perf_counter() - start
+        start = time.perf_counter()
+        actual = max(v for v in store.column(args.field) if v == v)
+        store_scan = time.perf_counter() - start
+        store.close()
+
+    print(f"{args.rows} records, field {args.field}, store built in {build_time:.2f}s")
+    print(f"{'':<12} {'open s':>9} {'scan s':>9}")
+    print(f"{'json.load':<12} {load_time:>9.3f} {json_scan:>9.3f}")
+    print(f"{'column store':<12} {open_time:>9.4f} {store_scan:>9.3f}")
+    print(f"same result: {expected == actual}")
+
+
+if __name__ == "__main__":
+    main()
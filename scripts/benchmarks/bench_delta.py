@@ -0,0 +1,64 @@
+"""
+Benchmark: delta patch build and apply on large catalogs
+
+Repeats ingredients_standardized.json to --rows records (fresh ids), makes
+a new version with --changes price updates, a few note edits, additions
+and removals, and times `make_patch` and `apply_patch`, checking that the
+applied patch is byte-identical to the new version.
+
+Usage:
+    python scripts/benchmarks/bench_delta.py --rows 100000 --changes 500
+"""
+
+import argparse
+import copy
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.delta import apply_patch, dump_patch, make_patch, patch_summary, serialize  # noqa: E402
+from feed_pipeline.paths import RAW_DIR  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--changes", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    with open(RAW_DIR / "ingredients_standardized.json", 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    old = [dict(base[i % len(base)], ingredient_id=i + 1) for i in range(args.rows)]
+    rng = random.Random(args.seed)
+    new = copy.copy(old)
+    for i in rng.sample(range(args.rows), args.changes):
+        new[i] = dict(new[i], price_kg=round(rng.uniform(0.05, 2.0), 3))
+    for i in rng.sample(range(args.rows), max(args.changes // 10, 1)):
+        new[i] = dict(new[i], notes=f"Revised {i}")
+    removed = set(rng.sample(range(args.rows), max(args.changes // 20, 1)))
+    new = [record for i, record in enumerate(new) if i not in removed]
+    for k in range(max(args.changes // 20, 1)):
+        new.insert(rng.randrange(len(new)), dict(base[k % len(base)], ingredient_id=args.rows + k + 1))
+    old_bytes, new_bytes = serialize(old), serialize(new)
+
+    start = time.perf_counter()
+    patch = make_patch(old_bytes, new_bytes)
+    diff_time = time.perf_counter() - start
+    encoded = dump_patch(patch)
+    start = time.perf_counter()
+    result = apply_patch(old_bytes, patch)
+    apply_time = time.perf_counter() - start
+
+    print(f"{args.rows} records, {len(new_bytes) / 1e6:.1f} MB; {patch_summary(patch)}")
+    print(f"diff  {diff_time:>7.2f}s")
+    print(f"apply {apply_time:>7.2f}s  byte-identical: {result == new_bytes}")
+    print(f"patch {len(encoded)} bytes ({len(encoded) / len(new_bytes):.2%} of the new version)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: batch least-cost formulation throughput
+
+Formulates --rations rations (the app's requirement tables under
+randomized prices) against ingredients_standardized.json with each
+available solver and worker count, and reports rations per second. When
+several solvers run, their costs are compared. Then times --scenarios
+price vectors for one ration (pig grower) cold versus warm-started
+(`price_scenarios`).
+
+Usage:
+    python scripts/benchmarks/bench_formulation.py --rations 5000 --workers 1,4
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.formulation import IngredientMatrix, Ration, formulate_batch, price_scenarios  # noqa: E402
+from feed_pipeline.lp import OPTIMAL, linprog  # noqa: E402
+from feed_pipeline.paths import RAW_DIR  # noqa: E402
+from feed_pipeline.requirements import DEFAULT_FEED_TYPE, load_requirements  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rations", type=int, default=2000)
+    parser.add_argument("--workers", default="1")
+    parser.add_argument("--scenarios", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    matrix = IngredientMatrix.from_file(RAW_DIR / "ingredients_standardized.json")
+    tables = [(key, requirements) for key, requirements in load_requirements().items()
+              if key[1] != DEFAULT_FEED_TYPE]
+    rng = random.Random(args.seed)
+    rations = []
+    for i in range(args.rations):
+        (animal, feed_type), requirements = tables[i % len(tables)]
+        prices = {ingredient_id: price * rng.uniform(0.8, 1.2)
+                  for ingredient_id, price in zip(matrix.ids, matrix.prices)}
+        rations.append(Ration(animal, feed_type, requirements, prices=prices))
+
+    solvers = ['simplex'] + (['highs'] if linprog is not None else [])
+    costs = {}
+    print(f"{len(rations)} rations, {len(matrix)} ingredients")
+    print(f"{'solver':<8} {'workers':>7} {'seconds':>8} {'rations/s':>10} {'optimal':>8}")
+    for solver in solvers:
+        for workers in (int(w) for w in args.workers.split(',')):
+            start = time.perf_counter()
+            results = list(formulate_batch(matrix, rations, solver=solver, workers=workers))
+            elapsed = time.perf_counter() - start
+            optimal = sum(result.status == OPTIMAL for result in results)
+            costs[solver] = [result.cost for result in results]
+            print(f"{solver:<8} {workers:>7} {elapsed:>8.2f} {len(rations) / elapsed:>10.0f} {optimal:>8}")
+    if len(costs) > 1:
+        worst = max((abs(a - b) for a, b in zip(costs['simplex'], costs['highs']) if a != b), default=0.0)
+        print(f"max cost difference simplex vs highs: {worst:.2e}")
+
+    requirements = dict(tables)[(1, 'grower')]
+    ration = Ration(1, 'grower', requirements)
+    vectors = [[price * rng.uniform(0.8, 1.2) for price in matrix.prices] for _ in range(args.scenarios)]
+    start = time.perf_counter()
+    cold = [matrix.formulate(ration._replace(prices=dict(zip(matrix.ids, prices))), solver='simplex').cost
+            for prices in vectors]
+    cold_time = time.perf_counter() - start
+    start = time.perf_counter()
+    table = price_scenarios(matrix, ration, vectors)
+    warm_time = time.perf_counter() - start
+    worst = max(abs(a - b) for a, b in zip(cold, table.costs))
+    print(f"\n{args.scenarios} price scenarios (pig grower)")
+    print(f"{'cold':<8} {cold_time:>8.2f}s {args.scenarios / cold_time:>8.0f}/s")
+    print(f"{'warm':<8} {warm_time:>8.2f}s {args.scenarios / warm_time:>8.0f}/s  max cost difference {worst:.1e}")
+
+
+if __name__ == "__main__":
+    main()
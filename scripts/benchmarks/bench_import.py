@@ -0,0 +1,89 @@
+"""
+Benchmark: import time of the pipeline scripts and package
+Imports feed_pipeline and the validation/standards scripts in a fresh
+interpreter (``python -X importtime``), --repeat times, and reports:
+- the median import time against --budget-ms
+- whether an import loaded a standards table (feed_pipeline.standards
+  loads scripts/standards.json only when a command asks for a table)
+- the modules with the highest self import time of the last run
+
+scripts/tests/test_import_budget.py enforces both checks; this script only
+reports them.
+
+Usage:
+    python scripts/benchmarks/bench_import.py
+    python scripts/benchmarks/bench_import.py --budget-ms 50 --repeat 9 --top 20
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+MODULES = (
+    'feed_pipeline', 'validate_ingredients', 'validate_refined', 'validate_industry_standards', 'check_units',
+    'standardize_ingredients_nrc', 'remediate_ingredients_standards', 'validate_all',
+)
+IMPORT_BUDGET_MS = 100.0
+
+CHILD = """
+import json
+for name in {modules!r}:
+    __import__(name)  # unlike importlib.import_module, reported by -X importtime
+from feed_pipeline import standards
+print(json.dumps({{'standards_loaded': standards.loaded()}}))
+"""
+
+
+def measure(modules):
+    """
+    (seconds, standards loaded, [(self us, cumulative us, module)]) of one
+    fresh import; seconds is the cumulative -X importtime of ``modules``.
+    """
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', CHILD.format(modules=tuple(modules))],
+                               cwd=SCRIPTS_DIR, capture_output=True, text=True, check=True)
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    rows = []
+    total_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(own), int(cumulative), name.strip()))
+        if name.strip() in modules and name == ' ' + name.strip():  # top level, not nested in another import
+            total_us += int(cumulative)
+    return total_us / 1e6, result['standards_loaded'], rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--modules", default=','.join(MODULES))
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest modules to list")
+    args = parser.parse_args()
+
+    modules = [name for name in args.modules.split(',') if name]
+    runs = [measure(modules) for _ in range(max(args.repeat, 1))]
+    median_ms = statistics.median(seconds for seconds, _, _ in runs) * 1000
+    loaded = any(standards_loaded for _, standards_loaded, _ in runs)
+
+    print(f"{'self ms':>8} {'cumul ms':>9}  module")
+    for own, cumulative, name in sorted(runs[-1][2], reverse=True)[:args.top]:
+        print(f"{own / 1000:>8.2f} {cumulative / 1000:>9.2f}  {name}")
+    print(f"\nImport of {len(modules)} modules: median {median_ms:.1f} ms over {len(runs)} runs "
+          f"(budget {args.budget_ms:.0f} ms)")
+    if median_ms > args.budget_ms:
+        print(f"✗ Over the import budget by {median_ms - args.budget_ms:.1f} ms")
+    if loaded:
+        print("✗ Importing loaded the standards tables; load them inside the command instead")
+    if median_ms <= args.budget_ms and not loaded:
+        print("✓ Within budget; no standards loaded at import")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Benchmark: indexed vs. full-scan duplicate detection in IngredientMerger
+
+Builds synthetic supplier catalogs from the real ingredient names (exact
+repeats, typos, supplier qualifiers and new names from the same vocabulary),
+then runs the merge-time duplicate search both ways. The full scan is only
+timed up to --max-scan records; above that only the index is timed.
+
+The run fails if the index changes a decision of the full scan, or if its
+time grows faster than --max-growth per 10x records between the smallest
+and the largest size (10x would be linear, 100x quadratic).
+
+Usage:
+    python scripts/benchmarks/bench_name_index.py --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import math
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from merge_ingredients import IngredientMerger  # noqa: E402
+from feed_pipeline.name_index import NameCandidateIndex  # noqa: E402
+
+RAW = Path(__file__).resolve().parent.parent.parent / "assets" / "raw"
+SOURCES = ["ingredient", "initial_ingredients_.json", "new_regional.json"]
+SUPPLIER_TAGS = ["premium", "grade A", "grade B", "bulk", "imported", "local", "batch", "lot"]
+
+
+def load_names():
+    names = []
+    for source in SOURCES:
+        with open(RAW / source, "r", encoding="utf-8") as f:
+            names.extend(ing.get("name", "") for ing in json.load(f))
+    return [n for n in names if n]
+
+
+def synthetic_catalog(base_names, size, seed=42):
+    """Supplier-style catalog: repeats, typos, tagged variants, new names."""
+    rng = random.Random(seed)
+    vocabulary = sorted({w.strip(",()") for name in base_names for w in name.split()})
+    catalog = []
+    for _ in range(size):
+        roll = rng.random()
+        name = rng.choice(base_names)
+        if roll < 0.35:
+            pass
+        elif roll < 0.55:
+            pos = rng.randrange(len(name))
+            name = name[:pos] + rng.choice("aeinorst") + name[pos + 1:]
+        elif roll < 0.75:
+            name = f"{name} {rng.choice(SUPPLIER_TAGS)} {rng.randint(1, 99)}"
+        else:
+            name = " ".join(rng.sample(vocabulary, rng.randint(2, 4)))
+        catalog.append(name)
+    return catalog
+
+
+def dedupe_indexed(names, threshold):
+    index = NameCandidateIndex(threshold=threshold)
+    decisions, kept = [], 0
+    for name in names:
+        key = index.find(name)
+        decisions.append(key)
+        if key is None:
+            index.add(kept, name)
+            kept += 1
+    return decisions, index.comparisons
+
+
+def dedupe_full_scan(names, threshold):
+    decisions, kept = [], []
+    comparisons = 0
+    for name in names:
+        match = None
+        for idx, other in enumerate(kept):
+            if not name or not other:
+                continue
+            comparisons += 1
+            if SequenceMatcher(None, name, other).ratio() >= threshold:
+                match = idx
+                break
+        decisions.append(match)
+        if match is None:
+            kept.append(name)
+    return decisions, comparisons
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 2000, 5000, 10000, 20000])
+    parser.add_argument("--max-scan", type=int, default=2000,
+                        help="largest size to also time with the full scan")
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--max-growth", type=float, default=20.0,
+                        help="largest allowed indexed-time ratio per 10x records")
+    parser.add_argument("--repeat", type=int, default=3, help="indexed runs per size (best is kept)")
+    args = parser.parse_args()
+
+    merger = IngredientMerger()
+    base_names = load_names()
+
+    print(f"{'records':>8} {'indexed s':>10} {'comparisons':>12} {'scan s':>8} "
+          f"{'scan comps':>11} {'speedup':>8} {'same':>5}")
+    timings = {}
+    failed = False
+    for size in args.sizes:
+        names = [merger.normalize_name(n) for n in synthetic_catalog(base_names, size)]
+
+        indexed_time = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            indexed, comparisons = dedupe_indexed(names, args.threshold)
+            indexed_time = min(indexed_time, time.perf_counter() - start)
+        timings[size] = indexed_time
+
+        if size <= args.max_scan:
+            start = time.perf_counter()
+            scanned, scan_comparisons = dedupe_full_scan(names, args.threshold)
+            scan_time = time.perf_counter() - start
+            print(f"{size:>8} {indexed_time:>10.3f} {comparisons:>12} {scan_time:>8.2f} "
+                  f"{scan_comparisons:>11} {scan_time / indexed_time:>7.1f}x "
+                  f"{str(indexed == scanned):>5}")
+            failed |= indexed != scanned
+        else:
+            print(f"{size:>8} {indexed_time:>10.3f} {comparisons:>12} {'-':>8} {'-':>11} "
+                  f"{'-':>8} {'-':>5}")
+
+    smallest, largest = min(timings), max(timings)
+    if largest > smallest:
+        growth = (timings[largest] / timings[smallest]) ** (1 / math.log10(largest / smallest))
+        verdict = "✓" if growth <= args.max_growth else "✗"
+        print(f"\n{verdict} Indexed time grows {growth:.1f}x per 10x records "
+              f"({smallest} -> {largest}, limit {args.max_growth:g}x)")
+        failed |= growth > args.max_growth
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: float32 nutrient matrix vs. building the formulator inputs from JSON
+
+Writes a synthetic catalog (ingredients_standardized.json repeated to
+--rows records, fresh ids), builds its nutrient matrix, then times a cold
+start up to the inputs of one ration program both ways:
+- IngredientMatrix.from_file + nutrient rows and caps for pig grower
+- NutrientMatrix on the mapped file + the same
+and checks that both give the same pig grower formulation cost.
+
+Usage:
+    python scripts/benchmarks/bench_nutrient_matrix.py --rows 100000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.formulation import IngredientMatrix, Ration  # noqa: E402
+from feed_pipeline.nutrient_matrix import NutrientMatrix, build_matrix  # noqa: E402
+from feed_pipeline.paths import RAW_DIR  # noqa: E402
+from feed_pipeline.requirements import load_requirements  # noqa: E402
+
+
+def write_catalog(path, rows):
+    with open(RAW_DIR / "ingredients_standardized.json", 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    records = [dict(base[i % len(base)], ingredient_id=i + 1) for i in range(rows)]
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(records, f, ensure_ascii=False)
+
+
+def cold_start(load, path):
+    start = time.perf_counter()
+    matrix = load(path)
+    matrix.nutrient_rows(1)
+    matrix.caps(1, 'grower')
+    return time.perf_counter() - start, matrix
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    ration = Ration(1, 'grower', load_requirements()[(1, 'grower')])
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = Path(tmp) / "catalog.json"
+        matrix_file = Path(tmp) / "catalog.json.f32"
+        write_catalog(catalog, args.rows)
+
+        start = time.perf_counter()
+        build_matrix(catalog, matrix_file)
+        build_time = time.perf_counter() - start
+
+        json_time, from_json = cold_start(IngredientMatrix.from_file, catalog)
+        matrix_time, mapped = cold_start(NutrientMatrix, matrix_file)
+        start = time.perf_counter()
+        current = mapped.matches(catalog)
+        check_time = time.perf_counter() - start
+
+        print(f"{args.rows} ingredients; matrix built in {build_time:.2f}s")
+        print(f"{'':<8} {'bytes':>12} {'cold start s':>13}")
+        print(f"{'json':<8} {catalog.stat().st_size:>12} {json_time:>13.3f}")
+        print(f"{'matrix':<8} {matrix_file.stat().st_size:>12} {matrix_time:>13.3f}")
+        print(f"speedup {json_time / matrix_time:.1f}x; checksum check {check_time:.3f}s ({current})")
+        if args.rows <= 20000:
+            cost_json = from_json.formulate(ration, solver='simplex').cost
+            cost_matrix = mapped.formulate(ration, solver='simplex').cost
+            print(f"pig grower cost: json {cost_json:.6f}, matrix {cost_matrix:.6f}")
+        mapped.close()
+
+
+if __name__ == "__main__":
+    main()
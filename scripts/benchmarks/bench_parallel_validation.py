@@ -0,0 +1,68 @@
+"""
+Benchmark: validation and standards cross-reference on 1/2/4/8 processes
+
+Repeats initial_ingredients_.json to --rows records (fresh ids) and times
+`run_validation` (all registered rules) and the standardizer's
+per-ingredient checks for each worker count, checking that every run
+produces the same result as the single-process one.
+
+Usage:
+    python scripts/benchmarks/bench_parallel_validation.py --rows 200000 --workers 1,2,4,8
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.paths import RAW_DIR  # noqa: E402
+from feed_pipeline.validation import run_validation  # noqa: E402
+from standardize_ingredients_nrc import IngredientStandardizer  # noqa: E402
+
+
+def cross_reference(records, workers, chunk_size):
+    """Standardizer report (without timestamp) for ``records``."""
+    standardizer = IngredientStandardizer.__new__(IngredientStandardizer)
+    standardizer.ingredients = records
+    standardizer.issues, standardizer.corrections, standardizer.separations_needed = [], [], []
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, report = standardizer.standardize_all(workers=workers, chunk_size=chunk_size)
+    report.pop('timestamp')
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--workers", default="1,2,4,8")
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    with open(RAW_DIR / "initial_ingredients_.json", 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    records = [dict(base[i % len(base)], id=i + 1, ingredient_id=i + 1) for i in range(args.rows)]
+
+    print(f"{args.rows} records, chunks of {args.chunk_size}")
+    print(f"{'workers':>7} {'validate s':>11} {'speedup':>8} {'cross-ref s':>12} {'speedup':>8}  same")
+    baseline = None
+    for workers in (int(w) for w in args.workers.split(',')):
+        start = time.perf_counter()
+        report = run_validation(records, workers=workers, chunk_size=args.chunk_size).to_dict()
+        validate_time = time.perf_counter() - start
+        start = time.perf_counter()
+        cross = cross_reference(records, workers, args.chunk_size)
+        cross_time = time.perf_counter() - start
+        if baseline is None:
+            baseline = (validate_time, cross_time, report, cross)
+        same = report == baseline[2] and cross == baseline[3]
+        print(f"{workers:>7} {validate_time:>11.2f} {baseline[0] / validate_time:>7.2f}x "
+              f"{cross_time:>12.2f} {baseline[1] / cross_time:>7.2f}x  {same}")
+
+
+if __name__ == "__main__":
+    main()
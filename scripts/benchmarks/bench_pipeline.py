@@ -0,0 +1,202 @@
+"""
+Benchmark: every pipeline stage on synthetic catalogs of growing size
+
+Generates seeded catalogs modelled on the real assets (feed_pipeline.synthetic:
+names, nutrient distributions and nested profiles sampled from them, with
+exact and near-duplicates) at each --sizes, then runs each stage in a fresh
+process and records wall time, peak RSS and throughput:
+- merge: IngredientMerger over the three source files
+- standardized_merge: StandardizedIngredientMerger over the same files
+- standardize: IngredientStandardizer cross-reference of a merged catalog
+- remediate: IngredientRemediator over the same merged catalog
+- regional_tags: add_regional_tags.get_region for every name
+
+Results are compared with scripts/benchmarks/baselines.json; a stage slower
+or larger than its baseline by more than --tolerance is flagged and the run
+exits with status 1. --save-baseline records the current results instead.
+Generated catalogs are kept in build/pipeline/synthetic/.
+
+Usage:
+    python scripts/benchmarks/bench_pipeline.py
+    python scripts/benchmarks/bench_pipeline.py --sizes 1000 10000 100000 1000000 --stages merge,regional_tags
+    python scripts/benchmarks/bench_pipeline.py --save-baseline
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.id_registry import IdRegistry  # noqa: E402
+from feed_pipeline.paths import CACHE_DIR, RAW_DIR, REPO_ROOT  # noqa: E402
+from feed_pipeline.synthetic import CatalogGenerator, write_catalog  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+SOURCES = ("ingredient", "initial_ingredients_.json", "new_regional.json")
+MERGED = "ingredients_merged.json"
+STAGES = ("merge", "standardized_merge", "standardize", "remediate", "regional_tags")
+BASELINE_FILE = Path(__file__).resolve().parent / "baselines.json"
+SYNTHETIC_DIR = CACHE_DIR / "synthetic"
+GENERATOR_VERSION = 1
+
+
+def dataset_dir(size, seed):
+    """Synthetic sources (split like the real ones) and merged catalog of ``size`` records."""
+    out_dir = SYNTHETIC_DIR / f"v{GENERATOR_VERSION}-{size}-{seed}"
+    if (out_dir / "complete").exists():
+        return out_dir
+    out_dir.mkdir(parents=True, exist_ok=True)
+    generators = [CatalogGenerator.from_file(RAW_DIR / name, seed=seed + k) for k, name in enumerate(SOURCES)]
+    total = sum(len(generator.templates) for generator in generators)
+    shares = [size * len(generator.templates) // total for generator in generators]
+    shares[0] += size - sum(shares)
+    for name, generator, share in zip(SOURCES, generators, shares):
+        write_catalog(out_dir / name, generator.records(share))
+    write_catalog(out_dir / MERGED, CatalogGenerator.from_file(RAW_DIR / MERGED, seed=seed).records(size))
+    (out_dir / "complete").write_text("")
+    return out_dir
+
+
+def run_stage(stage, data_dir):
+    """Run one stage on ``data_dir``; returns the records it processed."""
+    with open(os.devnull, 'w', encoding='utf-8') as sink, contextlib.redirect_stdout(sink):
+        if stage == "merge":
+            from merge_ingredients import IngredientMerger
+            merger = IngredientMerger()
+            sources = {name: merger.load_dataset(str(data_dir / name), name) for name in SOURCES}
+            merger.process_datasets(sources, registry=IdRegistry())
+            return len(merger.manifest.hashes)
+        if stage == "standardized_merge":
+            from merge_ingredients_standardized import StandardizedIngredientMerger
+            merger = StandardizedIngredientMerger()
+            merger.base_path, merger.source_files, merger.id_registry = data_dir, list(SOURCES), IdRegistry()
+            merger.process_datasets()
+            return len(merger.manifest.hashes)
+        if stage == "standardize":
+            from standardize_ingredients_nrc import IngredientStandardizer
+            standardizer = IngredientStandardizer(str(data_dir / MERGED))
+            standardizer.standardize_all()
+            return len(standardizer.ingredients)
+        if stage == "remediate":
+            from remediate_ingredients_standards import IngredientRemediator
+            remediator = IngredientRemediator(str(data_dir / MERGED))
+            remediator.remediate_all()
+            return len(remediator.ingredients)
+        if stage == "regional_tags":
+            sys.path.insert(0, str(REPO_ROOT))
+            from add_regional_tags import get_region
+            with open(data_dir / MERGED, 'r', encoding='utf-8') as f:
+                names = [record.get('name', '') for record in json.load(f)]
+            for name in names:
+                get_region(name)
+            return len(names)
+    raise ValueError(f"unknown stage: {stage}")
+
+
+def child(stage, data_dir):
+    """Entry point of the measuring process: one JSON line with time, records and peak RSS."""
+    start = time.perf_counter()
+    records = run_stage(stage, Path(data_dir))
+    seconds = time.perf_counter() - start
+    peak_mb = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        peak_mb = peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+    print(json.dumps({'seconds': seconds, 'records': records, 'peak_rss_mb': peak_mb}))
+
+
+def measure(stage, data_dir, timeout):
+    try:
+        completed = subprocess.run([sys.executable, __file__, "--child", stage, str(data_dir)],
+                                   capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f"timed out after {timeout}s"}
+    if completed.returncode != 0:
+        return {'error': (completed.stderr.strip().splitlines() or ['failed'])[-1]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def regressions(result, baseline, tolerance):
+    """Metrics of ``result`` worse than ``baseline`` by more than ``tolerance``."""
+    flagged = []
+    for metric in ('seconds', 'peak_rss_mb'):
+        if result.get(metric) is not None and baseline.get(metric):
+            if result[metric] > baseline[metric] * (1 + tolerance):
+                flagged.append(f"{metric} {result[metric]:.2f} vs {baseline[metric]:.2f}")
+    return flagged
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument("--stages", default=','.join(STAGES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=3600, help="seconds per stage run")
+    parser.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown/growth over the baseline")
+    parser.add_argument("--baseline", default=str(BASELINE_FILE))
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--child", nargs=2, metavar=("STAGE", "DIR"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    stages = [stage for stage in args.stages.split(',') if stage]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)}")
+    baseline_path = Path(args.baseline)
+    baselines = {}
+    if baseline_path.exists():
+        with open(baseline_path, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+
+    print(f"{'stage':<20} {'records':>9} {'seconds':>9} {'records/s':>11} {'peak MB':>8}  baseline")
+    flagged = []
+    for size in args.sizes:
+        data_dir = dataset_dir(size, args.seed)
+        for stage in stages:
+            key = f"{stage}@{size}"
+            result = measure(stage, data_dir, args.timeout)
+            if 'error' in result:
+                print(f"{stage:<20} {size:>9} {'-':>9} {'-':>11} {'-':>8}  ✗ {result['error']}")
+                flagged.append(key)
+                continue
+            rate = result['records'] / result['seconds'] if result['seconds'] else float('inf')
+            peak = f"{result['peak_rss_mb']:.0f}" if result['peak_rss_mb'] is not None else '-'
+            if args.save_baseline:
+                peak_mb = result['peak_rss_mb']
+                baselines[key] = {'seconds': round(result['seconds'], 4),
+                                  'peak_rss_mb': round(peak_mb, 1) if peak_mb is not None else None}
+                verdict = 'saved'
+            elif key not in baselines:
+                verdict = 'no baseline'
+            else:
+                worse = regressions(result, baselines[key], args.tolerance)
+                verdict = f"✗ REGRESSION: {'; '.join(worse)}" if worse else '✓'
+                if worse:
+                    flagged.append(key)
+            print(f"{stage:<20} {result['records']:>9} {result['seconds']:>9.2f} {rate:>11.0f} {peak:>8}  {verdict}")
+
+    if args.save_baseline:
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump(dict(sorted(baselines.items())), f, indent=2)
+            f.write('\n')
+        print(f"\n✓ Saved baselines: {baseline_path}")
+    elif flagged:
+        print(f"\n✗ {len(flagged)} stage run(s) failed or regressed: {', '.join(flagged)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
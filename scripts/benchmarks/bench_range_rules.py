@@ -0,0 +1,57 @@
+"""
+Benchmark: table-driven range validation on a large catalog
+
+Repeats initial_ingredients_.json to --rows records, builds its columnar
+store, and times `evaluate` for the industry (name pattern) and refined
+(id) standards tables used by validate_industry_standards.py and
+validate_refined.py.
+
+Usage:
+    python scripts/benchmarks/bench_range_rules.py --rows 100000
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.columnar import build_store, open_store  # noqa: E402
+from feed_pipeline.paths import RAW_DIR  # noqa: E402
+from feed_pipeline.range_rules import evaluate, rules_from_standards  # noqa: E402
+from feed_pipeline.range_standards import (  # noqa: E402
+    INDUSTRY_PARAMS, INDUSTRY_STANDARDS, INDUSTRY_TOLERANCE, REFINED_STANDARDS, REFINED_TOLERANCE,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    with open(RAW_DIR / "initial_ingredients_.json", 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    industry = rules_from_standards(INDUSTRY_STANDARDS, INDUSTRY_TOLERANCE, INDUSTRY_PARAMS)
+    refined = rules_from_standards(REFINED_STANDARDS, REFINED_TOLERANCE)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        catalog = Path(tmp) / "catalog.json"
+        with open(catalog, 'w', encoding='utf-8') as f:
+            json.dump([dict(base[i % len(base)], id=i + 1) for i in range(args.rows)], f)
+        build_store(catalog, Path(tmp) / "catalog.cols")
+        store = open_store(catalog, Path(tmp) / "catalog.cols")
+
+        print(f"{args.rows} records")
+        for label, rules, select in [("industry (name)", industry, 'name'), ("refined (id)", refined, 'id')]:
+            start = time.perf_counter()
+            findings = evaluate(store, rules, select=select)
+            elapsed = time.perf_counter() - start
+            print(f"{label:<16} {len(rules):>3} rules  {len(findings):>7} findings  {elapsed:.3f}s")
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: indexed standards database vs. scanning the tables
+Extends scripts/standards.json with --entries synthetic naming-table entries
+(four variants and a code each) and as many range-table ingredients, then
+times:
+- building the SQLite file, and opening it (what a stage pays at startup)
+  next to parsing the JSON (what `feed_pipeline.standards.load` pays)
+- --lookups name lookups and code lookups through the indexes against a
+  linear scan of the entries, checking both return the same entries
+and checks that name lookups in the database built from the shipped
+standards.json find the same standards as the cross-reference
+(`IngredientStandardizer._find_standard_match`) for every catalog name.
+
+Usage:
+    python scripts/benchmarks/bench_standards_db.py --entries 5000 --lookups 2000
+"""
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.paths import RAW_DIR  # noqa: E402
+from feed_pipeline.standards import STANDARDS_FILE, compile_standards  # noqa: E402
+from feed_pipeline.standards_db import StandardsDB, build_standards_db, words  # noqa: E402
+from standardize_ingredients_nrc import IngredientStandardizer  # noqa: E402
+
+CATALOGS = ("initial_ingredients_.json", "new_regional.json", "ingredients_merged.json", "ingredients_standardized.json")
+
+GRADES = ('meal', 'cake', 'flour', 'grain', 'bran', 'hulls', 'expeller', 'pellets', 'silage', 'concentrate')
+
+
+def synthetic_standards(base, count, rng):
+    """``base`` with ``count`` extra entries in its first naming table and range tables."""
+    data = json.loads(json.dumps(base))
+    vocabulary = sorted({word for table in data['naming'] for entry in table['entries'].values()
+                         for variant in entry['variants'] for word in words(variant) if word.isalpha()})
+    table = data['naming'][0]
+    for i in range(count):
+        stem = f"{rng.choice(vocabulary)}{i}"
+        variants = [f"{stem} {grade}" for grade in rng.sample(GRADES, 4)]
+        table['entries'][f"synthetic {i}"] = {
+            'variants': variants, 'standard_name': variants[0].capitalize(), 'forms': [],
+            table['id_field']: f"9-{i // 1000:02d}-{i % 1000:03d}",
+        }
+        data['ranges']['industry']['standards'][variants[0].capitalize()] = {
+            'crude_protein': [rng.uniform(5, 20), rng.uniform(20, 50), 'synthetic'],
+            'me_pig': [rng.uniform(2000, 3000), rng.uniform(3000, 3800), 'synthetic'],
+        }
+    return data
+
+
+def scan_name(variants, name):
+    """What the index answers, by testing every variant of every entry."""
+    name_lower = name.lower()
+    return [number for number, entry_variants in enumerate(variants)
+            if any(variant in name_lower for variant in entry_variants)]
+
+
+def catalog_names():
+    names = set()
+    for catalog in CATALOGS:
+        with open(RAW_DIR / catalog, 'r', encoding='utf-8') as f:
+            names.update(record['name'] for record in json.load(f) if record.get('name'))
+    return sorted(names)
+
+
+def scan_code(entries, code):
+    return [number for number, (table, entry) in enumerate(entries) if entry.get(table.id_field) == code]
+
+
+def timed(fn, items):
+    start = time.perf_counter()
+    results = [fn(item) for item in items]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with open(STANDARDS_FILE, 'r', encoding='utf-8') as f:
+        data = synthetic_standards(json.load(f), args.entries, rng)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source, db_file = Path(tmp) / "standards.json", Path(tmp) / "standards.sqlite"
+        with open(source, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+        start = time.perf_counter()
+        counts = build_standards_db(db_file, source)
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        with open(source, 'r', encoding='utf-8') as f:
+            compiled = compile_standards(json.load(f))
+        parse_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        db = StandardsDB(db_file)
+        db.by_code('5-01-968')
+        open_seconds = time.perf_counter() - start
+
+        entries = [(table, entry) for table in compiled['naming'] for entry in table.entries.values()]
+        all_variants = [variant for _, entry in entries for variant in entry['variants']]
+        entry_variants = [entry['variants'] for _, entry in entries]
+        names = [f"{rng.choice(all_variants)}, {rng.choice(('premium', 'imported', 'dried'))}"
+                 if rng.random() < 0.8 else f"unknown feed {i}" for i in range(args.lookups)]
+        codes = [entry.get(table.id_field) if rng.random() < 0.8 else 'none' for table, entry in
+                 (rng.choice(entries) for _ in range(args.lookups))]
+
+        print(f"{counts['standard']} entries, {counts['variant']} variants, {counts['nutrient_range']} ranges")
+        print(f"build {build_seconds:.3f}s | open + first query {open_seconds * 1000:.1f} ms | "
+              f"JSON parse {parse_seconds * 1000:.1f} ms")
+        print(f"\n{'lookup':<8} {'scan s':>9} {'index s':>9} {'speedup':>8}  same")
+        for label, scan, indexed, items in [
+            ("name", lambda n: scan_name(entry_variants, n), lambda n: [m.entry for m in db.match_name(n)], names),
+            ("code", lambda c: scan_code(entries, c), lambda c: [m.entry for m in db.by_code(c)], codes),
+        ]:
+            scan_seconds, expected = timed(scan, items)
+            index_seconds, got = timed(indexed, items)
+            print(f"{label:<8} {scan_seconds:>9.3f} {index_seconds:>9.3f} "
+                  f"{scan_seconds / index_seconds:>7.1f}x  {expected == got}")
+        db.close()
+
+        shipped_db = Path(tmp) / "shipped.sqlite"
+        build_standards_db(shipped_db, STANDARDS_FILE)
+        with StandardsDB(shipped_db) as db:
+            names = catalog_names()
+            differ = [name for name in names if [m.description for m in db.match_name(name)]
+                      != IngredientStandardizer._find_standard_match(name)[1]]
+        print(f"\ncross-reference agreement on {len(names)} catalog names: {not differ}"
+              + (f" (differ: {differ[:5]})" if differ else ""))
+
+
+if __name__ == "__main__":
+    main()
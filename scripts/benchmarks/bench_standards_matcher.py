@@ -0,0 +1,75 @@
+"""
+Benchmark: compiled standards matcher vs. per-variant / per-regex loops
+
+Times the two name-matching hot spots on a synthetic catalog:
+- IngredientStandardizer._find_standard_match (variant substring tests over
+  the NRC/CVB/INRA/FAO tables)
+- StandardizedIngredientMerger.get_standard_name (one regex per family)
+against the loops they replaced, and checks both return the same matches.
+
+Usage:
+    python scripts/benchmarks/bench_standards_matcher.py --size 100000
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bench_name_index import load_names, synthetic_catalog  # noqa: E402
+from feed_pipeline import standards  # noqa: E402
+from merge_ingredients_standardized import StandardizedIngredientMerger  # noqa: E402
+from standardize_ingredients_nrc import standards_matcher  # noqa: E402
+
+
+def legacy_standard_matches(name_lower):
+    """The nested any(var in name) loops _find_standard_match used to run."""
+    matches = []
+    for table in standards.naming_tables():
+        for data in table.entries.values():
+            if any(var in name_lower for var in data['variants']):
+                matches.append(f"{table.label}: {data['standard_name']} ({table.id_label}: {data[table.id_field]})")
+    return matches
+
+
+def legacy_family_matches(patterns, name_lower):
+    """The per-family re.search loop get_standard_name used to run."""
+    return [key for key, info in patterns.items() if re.search(info['pattern'], name_lower)]
+
+
+def timed(fn, names):
+    start = time.perf_counter()
+    results = [fn(name) for name in names]
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--size", type=int, default=100000)
+    args = parser.parse_args()
+
+    names = [n.lower() for n in synthetic_catalog(load_names(), args.size)]
+    merger = StandardizedIngredientMerger()
+    matcher = standards_matcher()
+
+    rows = [
+        ("standards tables", lambda n: legacy_standard_matches(n),
+         lambda n: [match for match, _ in matcher.matches(n)]),
+        ("pattern families", lambda n: legacy_family_matches(merger.standard_patterns, n),
+         lambda n: merger.pattern_matcher.matches(n)),
+    ]
+
+    print(f"{len(names)} names")
+    print(f"{'lookup':<18} {'loops s':>9} {'matcher s':>10} {'speedup':>8} {'same':>5}")
+    for label, legacy, compiled in rows:
+        legacy_time, expected = timed(legacy, names)
+        compiled_time, actual = timed(compiled, names)
+        print(f"{label:<18} {legacy_time:>9.3f} {compiled_time:>10.3f} "
+              f"{legacy_time / compiled_time:>7.1f}x {str(expected == actual):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Check: ingredient ids survive reruns and source edits
+Runs the two merges (IngredientMerger, StandardizedIngredientMerger) and
+IngredientRemediator on copies of the sources and of the committed id
+registries (nothing in the repo is written), and checks that:
+- the merges reproduce the ids of the shipped outputs
+- a rerun on the same input keeps every id and hands out none
+- after appending to new_regional.json a variant of --variant-of (its name
+  plus " (local variety)", which the standardized merge folds into the
+  existing ingredient) and one new ingredient, every earlier id still names
+  the same ingredient and new ids go only to new output records
+- remediation, numbered in a registry of its own, numbers a first run 1..N
+  and keeps its ids on a rerun
+
+Exits with status 1 when a check fails.
+
+Usage:
+    python scripts/benchmarks/check_id_stability.py
+    python scripts/benchmarks/check_id_stability.py --variant-of "Soybean meal, 44% CP"
+"""
+
+import argparse
+import contextlib
+import copy
+import json
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.id_registry import IdRegistry, registry_path_for  # noqa: E402
+from feed_pipeline.paths import RAW_DIR  # noqa: E402
+
+SOURCES = ("ingredient", "initial_ingredients_.json", "new_regional.json")
+MERGED = "ingredients_merged.json"
+STANDARDIZED = "ingredients_standardized.json"
+NEW_INGREDIENT = {"name": "Moringa seed cake, id stability check", "crude_protein": 37.5, "crude_fiber": 9.0,
+                  "crude_fat": 8.0, "calcium": 0.4, "phosphorus": 0.6}
+
+
+def quiet(fn, *args):
+    with open(os.devnull, 'w', encoding='utf-8') as sink, contextlib.redirect_stdout(sink):
+        return fn(*args)
+
+
+def run_merge(data_dir, registry):
+    from merge_ingredients import IngredientMerger
+    merger = IngredientMerger()
+    sources = {name: merger.load_dataset(str(data_dir / name), name) for name in SOURCES}
+    return quiet(merger.process_datasets, sources, None, registry)
+
+
+def run_standardized_merge(data_dir, registry):
+    from merge_ingredients_standardized import StandardizedIngredientMerger
+    merger = StandardizedIngredientMerger()
+    merger.base_path, merger.source_files, merger.id_registry = data_dir, list(SOURCES), registry
+    return quiet(merger.process_datasets)[0]
+
+
+def run_remediation(merged_file, registry):
+    from remediate_ingredients_standards import IngredientRemediator
+    return quiet(IngredientRemediator(str(merged_file), registry).remediate_all)
+
+
+def ids_of(records, field='name'):
+    return {record['ingredient_id']: record.get(field) for record in records}
+
+
+class Checks:
+    def __init__(self):
+        self.failed = 0
+
+    def __call__(self, ok, message):
+        print(f"{'✓' if ok else '✗'} {message}")
+        self.failed += not ok
+
+
+def rerun(run, data_dir, registry_file):
+    """Run with the registry in ``registry_file`` and save it back, as the scripts do."""
+    registry = IdRegistry.load(registry_file)
+    records = run(data_dir, registry)
+    registry.save()
+    return records
+
+
+def check_merge(check, label, run, data_dir, shipped_file, field, variant_name):
+    """The rerun and source-edit checks of one merge."""
+    registry_file = data_dir / registry_path_for(shipped_file).name
+    shutil.copy2(registry_path_for(shipped_file), registry_file)
+    first = rerun(run, data_dir, registry_file)
+    with open(shipped_file, 'r', encoding='utf-8') as f:
+        shipped = json.load(f)
+    check([r['ingredient_id'] for r in first] == [r['ingredient_id'] for r in shipped],
+          f"{label}: ids of the shipped {shipped_file.name} reproduced")
+
+    second = rerun(run, data_dir, registry_file)
+    check([r['ingredient_id'] for r in second] == [r['ingredient_id'] for r in first],
+          f"{label}: rerun keeps all {len(first)} ids")
+
+    regional = data_dir / "new_regional.json"
+    with open(regional, 'r', encoding='utf-8') as f:
+        original = f.read()
+    records = json.loads(original)
+    template = next(r for r in records if r.get('name') == variant_name)
+    variant = copy.deepcopy(template)
+    variant['name'] = f"{variant_name} (local variety)"
+    with open(regional, 'w', encoding='utf-8') as f:
+        json.dump(records + [variant, dict(NEW_INGREDIENT)], f, indent=2, ensure_ascii=False)
+    try:
+        third = rerun(run, data_dir, registry_file)
+    finally:
+        regional.write_text(original, encoding='utf-8')
+    before, after = ids_of(first, field), ids_of(third, field)
+    moved = [i for i, value in before.items() if after.get(i) != value]
+    new = sorted(set(after) - set(before))
+    check(not moved, f"{label}: every earlier id names the same ingredient after the edit"
+                     + (f" (moved: {moved[:5]})" if moved else ""))
+    check(len(new) == len(third) - len(first),
+          f"{label}: {len(new)} new id(s) for {len(third) - len(first)} new ingredient(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--variant-of", default="Corn DDGS (hi-pro)",
+                        help="new_regional.json ingredient to add a merging variant of")
+    args = parser.parse_args()
+
+    check = Checks()
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        for name in SOURCES:
+            source = RAW_DIR / name
+            if source.is_dir():
+                shutil.copytree(source, data_dir / name)
+            else:
+                shutil.copy2(source, data_dir / name)
+        check_merge(check, "merge", run_merge, data_dir, RAW_DIR / MERGED, 'name', args.variant_of)
+        check_merge(check, "standardized merge", run_standardized_merge, data_dir, RAW_DIR / STANDARDIZED,
+                    'standardized_name', args.variant_of)
+
+        from remediate_ingredients_standards import ID_REGISTRY_FILE
+        registry_file = data_dir / ID_REGISTRY_FILE.name
+        first = rerun(run_remediation, RAW_DIR / MERGED, registry_file)
+        check([r['ingredient_id'] for r in first] == list(range(1, len(first) + 1)),
+              "remediation: first run numbers its output 1..N")
+        second = rerun(run_remediation, RAW_DIR / MERGED, registry_file)
+        check([r['ingredient_id'] for r in second] == [r['ingredient_id'] for r in first],
+              f"remediation: rerun keeps all {len(first)} ids")
+        check(ID_REGISTRY_FILE != registry_path_for(STANDARDIZED),
+              "remediation: numbered apart from the standardized merge's registry")
+
+    if check.failed:
+        print(f"\n✗ {check.failed} check(s) failed")
+        sys.exit(1)
+    print("\n✓ Ids are stable")
+
+
+if __name__ == "__main__":
+    main()
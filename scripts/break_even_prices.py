@@ -0,0 +1,83 @@
+"""
+Nutrient shadow prices and ingredient break-even prices
+Formulates the app's requirement tables (all of them, or one animal class
+and feed type) and writes, from one solve per ration:
+- the shadow price of every nutrient limit
+- for every ingredient, the price range over which the optimal blend keeps
+  its composition (for an unused ingredient, the price it must drop to
+  before it enters the blend)
+
+Usage:
+    python scripts/break_even_prices.py
+    python scripts/break_even_prices.py --animal 1 --feed-type grower
+"""
+
+import argparse
+import csv
+import io
+import math
+import sys
+
+from feed_pipeline.formulation import NUTRIENTS, IngredientMatrix, Ration
+from feed_pipeline.lp import OPTIMAL
+from feed_pipeline.paths import CACHE_DIR, RAW_DIR
+from feed_pipeline.requirements import DEFAULT_FEED_TYPE, load_requirements, requirements_for
+from feed_pipeline.sensitivity import sensitivity_batch
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shadow prices and break-even prices of least-cost rations")
+    parser.add_argument("--input", default=str(RAW_DIR / "ingredients_standardized.json"))
+    parser.add_argument("--animal", type=int, help="animal type id (default: every table)")
+    parser.add_argument("--feed-type", help="FeedType name, with --animal")
+    parser.add_argument("--workers", type=int, default=1, help="processes (0 = one per CPU)")
+    parser.add_argument("--output", default=str(CACHE_DIR / "break_even_prices.csv"))
+    parser.add_argument("--shadow-output", default=str(CACHE_DIR / "shadow_prices.csv"))
+    args = parser.parse_args()
+
+    tables = load_requirements()
+    if args.animal is not None:
+        requirements = requirements_for(tables, args.animal, args.feed_type or DEFAULT_FEED_TYPE)
+        if requirements is None:
+            print(f"ERROR: no requirements for animal type {args.animal}")
+            sys.exit(1)
+        rations = [Ration(args.animal, args.feed_type or DEFAULT_FEED_TYPE, requirements,
+                          label=f"{args.animal}/{args.feed_type or DEFAULT_FEED_TYPE}")]
+    else:
+        rations = [Ration(animal, feed_type, requirements, label=f"{animal}/{feed_type}")
+                   for (animal, feed_type), requirements in tables.items() if feed_type != DEFAULT_FEED_TYPE]
+
+    matrix = IngredientMatrix.from_file(args.input)
+    table = sensitivity_batch(matrix, rations, workers=args.workers or None)
+
+    print('=' * 80)
+    print('NUTRIENT SHADOW PRICES (cost/kg feed per unit increase of the binding limit)')
+    print('=' * 80)
+    print(f"{'ration':<18} {'cost':>8} " + ' '.join(f"{key[:10]:>10}" for key in NUTRIENTS))
+    for r, ration in enumerate(table.rations):
+        if table.status[r] != OPTIMAL:
+            print(f"{ration.label:<18} {table.status[r]}")
+            continue
+        shadow = table.shadow_row(r)
+        cells = ' '.join(f"{'':>10}" if math.isnan(shadow[key]) else f"{shadow[key]:>10.4g}" for key in NUTRIENTS)
+        print(f"{ration.label:<18} {table.costs[r]:>8.4f} {cells}")
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(args.shadow_output, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['ration', 'status', 'cost'] + list(NUTRIENTS))
+        for r, ration in enumerate(table.rations):
+            shadow = table.shadow_row(r)
+            writer.writerow([ration.label, table.status[r], '' if math.isnan(table.costs[r]) else f"{table.costs[r]:.6g}"]
+                            + ['' if math.isnan(shadow[key]) else f"{shadow[key]:.6g}" for key in NUTRIENTS])
+    names = [record.get('name') for record in matrix.records]
+    table.write_csv(args.output, matrix.prices, names)
+    print(f"\n✓ Shadow prices saved to: {args.shadow_output}")
+    print(f"✓ Break-even prices saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""
+Prebuilt app database
+Builds the SQLite file the app creates on first launch (schema from
+app_db.dart, ingredients, categories and animal types from the JSON assets),
+with all indexes and VACUUMed, so the app can copy it instead of parsing and
+inserting the JSON.
+
+Usage:
+    python scripts/build_app_db.py
+    python scripts/build_app_db.py --ingredients assets/raw/ingredients_standardized.json
+"""
+
+import argparse
+import io
+import json
+import sys
+
+from feed_pipeline.app_db import (
+    ANIMAL_TYPES_JSON, CATEGORIES_JSON, DB_FILE_NAME, INGREDIENTS_JSON, build_app_db, load_schema,
+)
+from feed_pipeline.paths import CACHE_DIR
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the app's SQLite database from the JSON assets")
+    parser.add_argument("--ingredients", default=str(INGREDIENTS_JSON))
+    parser.add_argument("--categories", default=str(CATEGORIES_JSON))
+    parser.add_argument("--animal-types", default=str(ANIMAL_TYPES_JSON))
+    parser.add_argument("--output", default=str(CACHE_DIR / DB_FILE_NAME))
+    args = parser.parse_args()
+
+    records = {}
+    for key in ('ingredients', 'categories', 'animal_types'):
+        with open(getattr(args, key), 'r', encoding='utf-8') as f:
+            records[key] = json.load(f)
+    schema = load_schema()
+    counts = build_app_db(args.output, schema=schema, **records)
+
+    print('=' * 80)
+    print(f'APP DATABASE (schema version {schema.version})')
+    print('=' * 80)
+    print(f"Tables: {len(schema.tables)}, indexes: {len(schema.indexes)}")
+    for table, count in counts.items():
+        print(f"  {table:<14} {count:>6} rows")
+    print(f"\n✓ Database saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
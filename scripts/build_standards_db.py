@@ -0,0 +1,63 @@
+"""
+Standards reference database
+Compiles scripts/standards.json (naming tables, nutrient ranges, remediation
+references and name corrections) into an indexed SQLite file, then answers
+lookups by ingredient name, standards code or nutrient from it.
+
+Usage:
+    python scripts/build_standards_db.py
+    python scripts/build_standards_db.py --name "Fish meal, 65% protein"
+    python scripts/build_standards_db.py --code 5-01-968 --nutrient lysine_total
+"""
+
+import argparse
+import io
+import sys
+import time
+
+from feed_pipeline.standards import STANDARDS_FILE
+from feed_pipeline.standards_db import DB_FILE, StandardsDB, build_standards_db, is_current
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the indexed standards reference database")
+    parser.add_argument("--source", default=str(STANDARDS_FILE))
+    parser.add_argument("--output", default=str(DB_FILE))
+    parser.add_argument("--force", action="store_true", help="rebuild even if the database is current")
+    parser.add_argument("--name", help="standards entries matching an ingredient name")
+    parser.add_argument("--code", help="standards entries with an NRC id or CVB/INRA/FAO code")
+    parser.add_argument("--nutrient", help="range rows for a nutrient param, e.g. lysine_total")
+    args = parser.parse_args()
+
+    if args.force or not is_current(args.output, args.source):
+        start = time.perf_counter()
+        counts = build_standards_db(args.output, args.source)
+        print(f"✓ Built {args.output} in {time.perf_counter() - start:.2f}s: "
+              + ', '.join(f"{count} {table}" for table, count in counts.items()))
+    else:
+        print(f"✓ {args.output} is up to date")
+
+    with StandardsDB(args.output) as db:
+        if args.name:
+            matches = db.match_name(args.name)
+            print(f"\n{args.name!r}: {len(matches)} match(es)")
+            for match in matches:
+                print(f"  {match.description}")
+        if args.code:
+            matches = db.by_code(args.code)
+            print(f"\n{args.code}: {len(matches)} entr{'y' if len(matches) == 1 else 'ies'}")
+            for match in matches:
+                print(f"  {match.description}")
+                print(f"    forms: {', '.join(db.entry(match).get('forms', []))}")
+        if args.nutrient:
+            rows = db.ranges(param=args.nutrient)
+            print(f"\n{args.nutrient}: {len(rows)} range(s)")
+            for row in rows:
+                print(f"  {row.range_table:<9} {row.ingredient:<20} {row.min:>8g}-{row.max:<8g} {row.source}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Dataset delta patches
+Compares two versions of the standardized catalog by ingredient id and
+writes a compact patch (added and removed records, changed fields per
+record), or applies one; an applied patch reproduces the new version byte
+for byte.
+
+Usage:
+    python scripts/dataset_patch.py diff old/ingredients_standardized.json assets/raw/ingredients_standardized.json
+    python scripts/dataset_patch.py apply old/ingredients_standardized.json build/pipeline/ingredients_standardized.patch.json --output new.json
+"""
+
+import argparse
+import gzip
+import io
+import sys
+from pathlib import Path
+
+from feed_pipeline.delta import PatchError, apply_patch, dump_patch, load_patch, make_patch, patch_summary
+from feed_pipeline.paths import CACHE_DIR
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def diff(args):
+    old_bytes, new_bytes = Path(args.old).read_bytes(), Path(args.new).read_bytes()
+    patch = make_patch(old_bytes, new_bytes, args.id_field)
+    encoded = dump_patch(patch)
+    if apply_patch(old_bytes, patch) != new_bytes:  # apply_patch checks the checksum; belt and braces
+        raise PatchError("patch does not reproduce the new version")
+    output = Path(args.output or CACHE_DIR / f"{Path(args.new).stem}.patch.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_bytes(encoded)
+
+    print('=' * 80)
+    print('DATASET PATCH')
+    print('=' * 80)
+    for key, value in patch_summary(patch).items():
+        print(f"  {key:<16} {value:>8}")
+    print(f"\nNew version: {len(new_bytes)} bytes; patch: {len(encoded)} bytes "
+          f"({len(gzip.compress(encoded))} gzipped)")
+    print(f"✓ Patch saved to: {output} (verified byte-identical on apply)")
+
+
+def apply(args):
+    result = apply_patch(Path(args.base).read_bytes(), load_patch(Path(args.patch).read_bytes()))
+    Path(args.output).write_bytes(result)
+    print(f"✓ Patched dataset saved to: {args.output}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or apply delta patches between catalog versions")
+    commands = parser.add_subparsers(dest='command', required=True)
+    make = commands.add_parser('diff', help="write the patch from OLD to NEW")
+    make.add_argument("old")
+    make.add_argument("new")
+    make.add_argument("--id-field", default="ingredient_id")
+    make.add_argument("--output", help="default: build/pipeline/<new>.patch.json")
+    make.set_defaults(run=diff)
+    use = commands.add_parser('apply', help="apply PATCH to BASE")
+    use.add_argument("base")
+    use.add_argument("patch")
+    use.add_argument("--output", required=True)
+    use.set_defaults(run=apply)
+    args = parser.parse_args()
+
+    try:
+        args.run(args)
+    except PatchError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
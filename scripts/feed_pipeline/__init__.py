@@ -0,0 +1,7 @@
+"""
+Shared building blocks for the ingredient data pipeline scripts.
+
+The scripts in ``scripts/`` stay runnable on their own
+(``python scripts/merge_ingredients.py``); this package holds the pieces
+they have in common so each script does not carry its own copy.
+"""
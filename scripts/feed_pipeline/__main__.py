@@ -0,0 +1,59 @@
+"""
+Entry point for the pipeline scripts: ``python -m feed_pipeline COMMAND [ARGS]``
+
+Each command is one of the scripts in ``scripts/``, imported only when it
+is run and called through its ``main()`` with the remaining arguments, so
+``python -m feed_pipeline validate_refined`` is the same as
+``python scripts/validate_refined.py``. Run from ``scripts/`` or with
+``PYTHONPATH=scripts``; without a command, the commands are listed.
+"""
+
+import importlib
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+COMMANDS = {
+    'merge_ingredients': "merge the source catalogs into ingredients_merged.json",
+    'merge_ingredients_standardized': "merge the source catalogs under standard names",
+    'standardize_ingredients_nrc': "cross-reference merged ingredients against the naming tables",
+    'remediate_ingredients_standards': "apply name corrections and separations",
+    'validate_all': "run every registered validation rule over a catalog",
+    'validate_ingredients': "structure checks of initial_ingredients_.json",
+    'validate_refined': "ingredient-specific nutrient ranges",
+    'validate_industry_standards': "nutrient ranges by name pattern",
+    'check_units': "proximate analysis values are percentages",
+    'profile_patterns': "per-pattern hit, miss and time counts of the name lookups",
+    'build_standards_db': "indexed SQLite standards reference database",
+    'build_region_bundles': "per-region catalog bundles",
+    'split_catalog': "core/detail catalog split",
+    'formulate_rations': "batch least-cost formulation",
+    'build_app_db': "SQLite database for the app",
+    'package_assets': "release packaging with the size budget gate",
+    'dataset_patch': "delta patches between catalog versions",
+    'run_pipeline': "run the pipeline stages, skipping up-to-date ones",
+}
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] in ('-h', '--help'):
+        print(__doc__.strip().splitlines()[0])
+        width = max(len(name) for name in COMMANDS)
+        for name, description in COMMANDS.items():
+            print(f"  {name:<{width}}  {description}")
+        return
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(f"✗ Unknown command: {command} (python -m feed_pipeline --help lists them)")
+        sys.exit(2)
+    if str(SCRIPTS_DIR) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS_DIR))
+    module = importlib.import_module(command)
+    sys.argv = [str(SCRIPTS_DIR / f"{command}.py")] + args
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,292 @@
+"""
+Prebuilt copy of the app's SQLite database.
+
+On a fresh install `AppDatabase._createAll` (lib/src/core/database/app_db.dart)
+creates the tables and `_populateTables` parses the JSON assets and inserts
+every ingredient, category and animal type. `build_app_db` produces the same
+database ahead of time:
+- the schema is read from the Dart source (each repository's
+  ``tableCreateQuery`` and the tables and indexes created in app_db.dart), so
+  there is no second copy of it here
+- ingredient rows follow ``Ingredient.fromJson(...).toJson()``, including the
+  legacy fallbacks (``id`` for ``ingredient_id``, energy and amino acid
+  columns taken from the nested objects) and ``favourite`` reset to 0; the
+  ``timestamp`` column default is taken at build time instead of install time
+- rows are loaded in one transaction, every index the migrations create is
+  built afterwards, and the file is VACUUMed
+- ``user_version`` is the app's ``_currentVersion``, so sqflite opens the
+  file without running ``onCreate`` or any migration
+"""
+
+import json
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from feed_pipeline.paths import RAW_DIR, REPO_ROOT
+
+APP_DB_DART = REPO_ROOT / "lib" / "src" / "core" / "database" / "app_db.dart"
+DB_FILE_NAME = 'feed_app_db'
+
+INGREDIENTS_JSON = RAW_DIR / "initial_ingredients_.json"
+CATEGORIES_JSON = RAW_DIR / "initial_categories.json"
+ANIMAL_TYPES_JSON = RAW_DIR / "initial_animal_types.json"
+
+# Keys written by the toJson of the nested models, in their order
+AMINO_ACID_KEYS = ('lysine', 'methionine', 'cystine', 'threonine', 'tryptophan', 'arginine',
+                   'isoleucine', 'leucine', 'valine', 'histidine', 'phenylalanine')
+ENERGY_KEYS = ('de_pig', 'me_pig', 'ne_pig', 'me_poultry', 'me_ruminant', 'me_rabbit', 'de_salmonids')
+ANTI_NUTRITIONAL_KEYS = ('glucosinolates_micromol_g', 'cyanogenic_glycosides_ppm', 'tannins_ppm',
+                         'phytic_acid_ppm', 'trypsin_inhibitor_tu_g')
+
+# Legacy energy column -> EnergyValues key it falls back to
+ENERGY_FALLBACKS = {
+    'me_growing_pig': 'me_pig',
+    'me_adult_pig': 'me_pig',
+    'me_poultry': 'me_poultry',
+    'me_ruminant': 'me_ruminant',
+    'me_rabbit': 'me_rabbit',
+    'de_salmonids': 'de_salmonids',
+}
+NESTED_KEYS = {
+    'amino_acids_total': AMINO_ACID_KEYS,
+    'amino_acids_sid': AMINO_ACID_KEYS,
+    'energy': ENERGY_KEYS,
+    'anti_nutritional_factors': ANTI_NUTRITIONAL_KEYS,
+}
+# Ingredient.fromJson reads these as strings and everything else as numbers
+TEXT_COLUMNS = ('name', 'standardized_name', 'standard_reference', 'separation_notes',
+                'created_by', 'notes', 'warning', 'regulatory_note', 'region')
+
+_LITERAL = re.compile(r"'''(.*?)'''|'((?:[^'\\\n]|\\.)*)'", re.S)
+_CONST = re.compile(r"static\s+const\s+(?:String\s+|int\s+)?(\w+)\s*=\s*")
+_CLASS = re.compile(r"^class\s+(\w+)", re.M)
+_IMPORT = re.compile(r"import\s+'package:\w+/(src/[^']+)'")
+_INTERPOLATION = re.compile(r"\$\{(\w+)\.(\w+)\}|\$\{(\w+)\}|\$(\w+)")
+_ESCAPE = re.compile(r"\\(.)")
+_COMMENT = re.compile(r"^\s*//[^\n]*", re.M)
+_EXECUTE_CONST = re.compile(r"db\.execute\(\s*(\w+)\.(\w+)\s*\)")
+_VERSION = re.compile(r"static\s+const\s+int\s+_currentVersion\s*=\s*(\d+)")
+_INDEX_NAME = re.compile(r"CREATE\s+INDEX\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.I)
+
+
+class AppSchema(NamedTuple):
+    """DDL of a fresh app database, in the order app_db.dart runs it."""
+    version: int
+    tables: List[str]
+    indexes: List[str]
+
+
+def _literals(source: str, start: int) -> Optional[str]:
+    """Adjacent Dart string literals from ``start`` joined into one raw string."""
+    parts = []
+    pos = start
+    while True:
+        while pos < len(source) and source[pos].isspace():
+            pos += 1
+        match = _LITERAL.match(source, pos)
+        if not match:
+            break
+        parts.append(match.group(1) if match.group(1) is not None else _ESCAPE.sub(r'\1', match.group(2)))
+        pos = match.end()
+    return ''.join(parts) if parts else None
+
+
+def _dart_constants(path: Path) -> Dict[str, str]:
+    """String constants of a Dart file (uninterpolated)."""
+    source = _COMMENT.sub('', path.read_text(encoding='utf-8'))
+    constants = {}
+    for match in _CONST.finditer(source):
+        value = _literals(source, match.end())
+        if value is not None:
+            constants[match.group(1)] = value
+    return constants
+
+
+class _DartScope:
+    """Resolves ``$name`` and ``${Class.name}`` against the constants of imported classes."""
+
+    def __init__(self, classes: Dict[str, Dict[str, str]]):
+        self.classes = classes
+
+    def interpolate(self, text: str, owner: Optional[str] = None) -> str:
+        def replace(match):
+            if match.group(1):
+                return self.constant(match.group(1), match.group(2))
+            return self.constant(owner, match.group(3) or match.group(4))
+        return _INTERPOLATION.sub(replace, text)
+
+    def constant(self, owner: Optional[str], name: str) -> str:
+        try:
+            value = self.classes[owner][name]
+        except KeyError:
+            raise ValueError(f"cannot resolve Dart constant {owner}.{name}") from None
+        return self.interpolate(value, owner)
+
+
+def load_schema(path: Union[str, Path] = APP_DB_DART) -> AppSchema:
+    """
+    Schema of a fresh install: the ``tableCreateQuery`` of each repository
+    executed by ``_createAll``, the tables it creates inline, and every
+    ``CREATE INDEX IF NOT EXISTS`` the migrations add (first definition wins).
+    """
+    path = Path(path)
+    source = _COMMENT.sub('', path.read_text(encoding='utf-8'))
+    classes = {}
+    for relative in _IMPORT.findall(source):
+        dart_file = REPO_ROOT / "lib" / relative
+        match = _CLASS.search(dart_file.read_text(encoding='utf-8')) if dart_file.exists() else None
+        if match:
+            classes[match.group(1)] = _dart_constants(dart_file)
+    scope = _DartScope(classes)
+
+    version_match = _VERSION.search(source)
+    if not version_match:
+        raise ValueError(f"{path}: _currentVersion not found")
+    create_all = source[source.index('Future<void> _createAll('):]
+    create_all = create_all[:create_all.index('_populateTables(db)')]
+
+    tables = []
+    statements = ([(m.start(), scope.constant(m.group(1), m.group(2))) for m in _EXECUTE_CONST.finditer(create_all)]
+                  + [(m.start(), scope.interpolate(m.group(1))) for m in _LITERAL.finditer(create_all)
+                     if m.group(1) and 'CREATE TABLE' in m.group(1)])
+    for _, statement in sorted(statements):
+        tables.append(' '.join(statement.split()))
+
+    indexes, seen = [], set()
+    for match in _LITERAL.finditer(source):
+        text = match.group(1)
+        name = _INDEX_NAME.search(text) if text else None
+        if name and name.group(1) not in seen:
+            seen.add(name.group(1))
+            indexes.append(' '.join(scope.interpolate(text).split()))
+    return AppSchema(int(version_match.group(1)), tables, indexes)
+
+
+def _as_num(value):
+    """``asNum`` of Ingredient.fromJson: numbers and numeric strings, else None."""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str) and value.strip():
+        try:
+            return float(value)  # double.tryParse comes first
+        except ValueError:
+            return None
+    return None
+
+
+def _nested(value, keys):
+    """A nested object as the app stores it: jsonEncode of the model's toJson."""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return None
+    if not isinstance(value, dict):
+        return None
+    return json.dumps({key: value.get(key) for key in keys}, separators=(',', ':'), ensure_ascii=False)
+
+
+def ingredient_row(record: dict) -> dict:
+    """Column values the app inserts for one record of the ingredient JSON."""
+    row = {}
+    for column, keys in NESTED_KEYS.items():
+        row[column] = _nested(record.get(column), keys) if record.get(column) is not None else None
+    energy = json.loads(row['energy']) if row['energy'] else {}
+    amino_acids = json.loads(row['amino_acids_total']) if row['amino_acids_total'] else {}
+
+    row['ingredient_id'] = _as_num(record['ingredient_id'] if record.get('ingredient_id') is not None
+                                   else record.get('id'))
+    for column in TEXT_COLUMNS:
+        row[column] = record.get(column)
+    for column in ('crude_protein', 'crude_fiber', 'crude_fat', 'calcium', 'price_kg', 'available_qty',
+                   'category_id', 'is_custom', 'created_date', 'ash', 'moisture', 'starch', 'bulk_density',
+                   'total_phosphorus', 'available_phosphorus', 'phytate_phosphorus', 'me_finishing_pig'):
+        row[column] = _as_num(record.get(column))
+    row['phosphorus'] = _coalesce(_as_num(record.get('phosphorus')), _as_num(record.get('total_phosphorus')))
+    for column in ('lysine', 'methionine'):
+        row[column] = _coalesce(_as_num(record.get(column)), amino_acids.get(column))
+    for column, key in ENERGY_FALLBACKS.items():
+        row[column] = _coalesce(_as_num(record.get(column)), energy.get(key))
+
+    standards_based = record.get('is_standards_based')
+    row['is_standards_based'] = int(standards_based) if isinstance(standards_based, bool) else _as_num(standards_based)
+    row['favourite'] = 0  # loadIngredientJson resets it
+
+    row['max_inclusion_pct'] = _as_num(record.get('max_inclusion_pct'))
+    limits = _coalesce(record.get('max_inclusion_json'), record.get('max_inclusion_pct'))
+    if isinstance(limits, str):
+        try:
+            limits = json.loads(limits)
+        except ValueError:
+            limits = None
+    row['max_inclusion_json'] = (json.dumps(limits, separators=(',', ':'), ensure_ascii=False)
+                                 if isinstance(limits, dict) else None)
+    return row
+
+
+def _coalesce(value, fallback):
+    return value if value is not None else fallback
+
+
+def _insert(conn: sqlite3.Connection, table: str, rows: List[dict]):
+    """
+    Batch insert of toJson maps. Like sqflite's ``insert``, a null value is
+    written as NULL (not the column default); only absent keys get defaults.
+    """
+    if not rows:
+        return
+    columns = list(rows[0])
+    conn.executemany(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                     [tuple(row[column] for column in columns) for row in rows])
+
+
+def _load_json(path: Path) -> list:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def build_app_db(out: Union[str, Path], ingredients: Iterable[dict] = None,
+                 categories: Iterable[dict] = None, animal_types: Iterable[dict] = None,
+                 schema: AppSchema = None) -> Dict[str, int]:
+    """
+    Write a ready-to-open app database to ``out`` (replaced if present).
+    Records default to the JSON assets the app would import. Returns the
+    row count of each table loaded.
+    """
+    out = Path(out)
+    schema = schema or load_schema()
+    ingredients = list(ingredients) if ingredients is not None else _load_json(INGREDIENTS_JSON)
+    categories = list(categories) if categories is not None else _load_json(CATEGORIES_JSON)
+    animal_types = list(animal_types) if animal_types is not None else _load_json(ANIMAL_TYPES_JSON)
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(out.name + '.tmp')
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('BEGIN')
+        for statement in schema.tables:
+            conn.execute(statement)
+        _insert(conn, 'category', [{'category': c.get('category'), 'category_id': _as_num(c.get('category_id'))}
+                                   for c in categories])
+        _insert(conn, 'animal_types', [{'type_id': _as_num(a.get('type_id')), 'type': a.get('type')}
+                                       for a in animal_types])
+        _insert(conn, 'ingredients', [ingredient_row(record) for record in ingredients])
+        for statement in schema.indexes:
+            conn.execute(statement)
+        conn.execute(f'PRAGMA user_version = {schema.version}')
+        conn.execute('COMMIT')
+        conn.execute('ANALYZE')
+        conn.execute('VACUUM')
+        counts = {table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+                  for table in ('ingredients', 'category', 'animal_types')}
+    finally:
+        conn.close()
+    tmp.replace(out)
+    return counts
@@ -0,0 +1,91 @@
+"""
+Per-region slices of the standardized ingredient catalog.
+
+Records carry a comma-separated ``region`` tag (add_regional_tags.py), e.g.
+``'Africa, Asia'`` or ``'Americas, Global'``. The app's region filter
+(`_applyRegionFilter` in ingredients_provider.dart) keeps a record for a
+selected region when its tag lists that region or ``Global``, or when it
+has no tag. `build_bundles` applies the same rule ahead of time and writes
+one compact JSON bundle per region the app offers, plus a ``Global`` bundle
+(global and untagged records only) for users without a region.
+
+The manifest maps each region to its bundle file, record count, size and
+SHA-256, and records the checksum of the catalog the bundles were cut from,
+so the app can load only the user's region at startup.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Union
+
+from feed_pipeline.paths import CACHE_DIR, atomic_write
+
+# Region options of RegionFilterBar (feed_ingredients_list.dart), 'All' aside
+REGIONS = ('Africa', 'Asia', 'Europe', 'Americas', 'Oceania')
+GLOBAL = 'Global'
+
+BUNDLE_DIR = CACHE_DIR / "bundles"
+MANIFEST_NAME = "bundles_manifest.json"
+MANIFEST_VERSION = 1
+
+
+def record_regions(record: Dict) -> Set[str]:
+    """Regions a record is tagged with; untagged records count as global."""
+    tag = record.get('region')
+    if not isinstance(tag, str) or not tag.strip():
+        return {GLOBAL}
+    return {part.strip() for part in tag.split(',') if part.strip()}
+
+
+def in_region(record: Dict, region: str) -> bool:
+    """The app's filter: tagged with ``region``, tagged global, or untagged."""
+    regions = record_regions(record)
+    return region in regions or GLOBAL in regions
+
+
+def bundle_name(region: str) -> str:
+    return f"ingredients_{region.lower()}.json"
+
+
+def _serialize(records: List[Dict]) -> bytes:
+    return json.dumps(records, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def build_bundles(json_path: Union[str, Path], out_dir: Optional[Union[str, Path]] = None,
+                  regions=REGIONS) -> Dict:
+    """
+    Write one bundle per region (and the Global bundle) plus the manifest
+    into ``out_dir``. Records keep their catalog order. Returns the manifest.
+    """
+    json_path = Path(json_path)
+    out_dir = Path(out_dir) if out_dir else BUNDLE_DIR
+    data = json_path.read_bytes()
+    records = json.loads(data)
+
+    unknown = sorted({region for record in records for region in record_regions(record)}
+                     - set(regions) - {GLOBAL})
+    out_dir.mkdir(parents=True, exist_ok=True)
+    bundles = {}
+    for region in tuple(regions) + (GLOBAL,):
+        subset = [record for record in records if in_region(record, region)]
+        encoded = _serialize(subset)
+        atomic_write(out_dir / bundle_name(region), encoded)
+        bundles[region] = {
+            'file': bundle_name(region),
+            'records': len(subset),
+            'bytes': len(encoded),
+            'sha256': hashlib.sha256(encoded).hexdigest(),
+        }
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'source': {'name': json_path.name, 'records': len(records), 'bytes': len(data),
+                   'sha256': hashlib.sha256(data).hexdigest()},
+        'default': GLOBAL,
+        'bundles': bundles,
+        # Tags outside the region list only reach users through the full catalog
+        'unbundled_regions': unknown,
+    }
+    atomic_write(out_dir / MANIFEST_NAME, json.dumps(manifest, indent=2, ensure_ascii=False).encode('utf-8'))
+    return manifest
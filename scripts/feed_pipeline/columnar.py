@@ -0,0 +1,287 @@
+"""
+Columnar, memory-mapped companion files for ingredient JSON catalogs.
+
+The validators and analysis scripts only need a handful of nutrient fields,
+but each one re-parsed the whole JSON into dicts. `build_store` writes the
+same data once as columns: one float64 column per numeric field, flattened
+``parent.child`` columns for the nested nutrient objects (``energy.me_pig``,
+``amino_acids_sid.lysine``, ...), and string columns indexing one shared
+string table. `ColumnStore` maps that file read-only, so opening it costs a
+header parse and a numeric column is a zero-copy ``memoryview`` of doubles.
+
+Missing and null values are NaN in numeric columns and None in string
+columns. Numeric strings in a column of numbers (``"12.5"`` next to
+``12.0``) are stored as numbers, as the app's ``asNum`` reads them; a
+column with any other text is a string column. Fields holding other
+objects or lists (anti-nutritional factors, notes lists) are not stored;
+read the JSON for those.
+
+File layout (`feed_pipeline.mapped_file`, all sections 8-byte aligned)::
+
+    b'FECOLS01' | u32 header length | JSON header | column data | string table
+"""
+
+import json
+import math
+import mmap
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+from feed_pipeline.json_stream import iter_records
+from feed_pipeline.mapped_file import read_header, section_offsets, write_mapped
+from feed_pipeline.paths import CACHE_DIR
+
+MAGIC = b'FECOLS01'
+FORMAT_VERSION = 2
+
+# Nested objects flattened into parent.child columns
+FLATTENED_FIELDS = ('amino_acids_total', 'amino_acids_sid', 'energy', 'max_inclusion_pct')
+
+NUMERIC = 'f8'
+STRING = 'str'
+_NULL_STRING = 0xFFFFFFFF
+
+
+def _flatten(record: Dict) -> Iterator[tuple]:
+    """(column name, scalar value) pairs stored for one record."""
+    for key, value in record.items():
+        if isinstance(value, dict):
+            if key in FLATTENED_FIELDS:
+                for sub_key, sub_value in value.items():
+                    if not isinstance(sub_value, (dict, list)):
+                        yield f"{key}.{sub_key}", sub_value
+        elif not isinstance(value, list):
+            yield key, value
+
+
+def _numbers(column: list) -> Optional[List[float]]:
+    """The column as floats (NaN where missing), or None for a text column."""
+    if not any(isinstance(value, str) for value in column):
+        return [math.nan if value is None else float(value) for value in column]
+    if not any(isinstance(value, (int, float)) for value in column):
+        return None  # nothing but strings: text, even if they look numeric
+    numbers = []
+    for value in column:
+        if value is None:
+            numbers.append(math.nan)
+            continue
+        try:
+            numbers.append(float(value))
+        except ValueError:
+            return None
+    return numbers
+
+
+def _source_stamp(json_path: Path) -> Dict:
+    stat = json_path.stat()
+    return {'name': json_path.name, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def store_path_for(json_path: Union[str, Path]) -> Path:
+    """Default companion location (build cache, never bundled as an asset)."""
+    return CACHE_DIR / f"{Path(json_path).name}.cols"
+
+
+def build_store(json_path: Union[str, Path], store_path: Optional[Union[str, Path]] = None) -> Path:
+    """
+    Write the columnar companion of a JSON array of ingredient records.
+
+    Streams the source, so memory is the columns themselves rather than
+    the parsed records and the file text.
+    """
+    json_path = Path(json_path)
+    store_path = Path(store_path) if store_path else store_path_for(json_path)
+
+    raw: Dict[str, list] = {}
+    rows = 0
+    for record in iter_records(json_path):
+        for name, value in _flatten(record):
+            column = raw.get(name)
+            if column is None:
+                column = raw[name] = []
+            if len(column) < rows:
+                column.extend([None] * (rows - len(column)))
+            column.append(value)
+        rows += 1
+
+    kinds: Dict[str, str] = {}
+    numeric: Dict[str, array] = {}
+    strings: Dict[str, array] = {}
+    table: Dict[str, int] = {}
+    for name, column in raw.items():
+        column.extend([None] * (rows - len(column)))
+        numbers = _numbers(column)
+        if numbers is None:
+            kinds[name] = STRING
+            strings[name] = array('I', (
+                _NULL_STRING if value is None else table.setdefault(str(value), len(table))
+                for value in column
+            ))
+        else:
+            kinds[name] = NUMERIC
+            numeric[name] = array('d', numbers)
+        raw[name] = None  # release as we go
+
+    blob = bytearray()
+    offsets = array('Q', [0])
+    for text in table:  # insertion order == index order
+        blob += text.encode('utf-8')
+        offsets.append(len(blob))
+
+    names = list(numeric) + list(strings)
+    sections = [column.tobytes() for column in list(numeric.values()) + list(strings.values())]
+    sections += [offsets.tobytes(), bytes(blob)]
+    positions = section_offsets(sections)
+    columns = {name: {'type': kinds[name], 'offset': position} for name, position in zip(names, positions)}
+    string_table = {'count': len(table), 'offsets': positions[-2], 'data': positions[-1]}
+
+    header = {
+        'version': FORMAT_VERSION,
+        'byteorder': sys.byteorder,
+        'rows': rows,
+        'source': _source_stamp(json_path),
+        'columns': columns,
+        'strings': string_table,
+    }
+    write_mapped(store_path, MAGIC, header, sections)
+    return store_path
+
+
+class StringColumn:
+    """Read-only sequence of the strings (or None) in one column."""
+
+    def __init__(self, indices: memoryview, store: 'ColumnStore'):
+        self._indices = indices
+        self._store = store
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, row: int) -> Optional[str]:
+        return self._store.string(self._indices[row])
+
+    def __iter__(self) -> Iterator[Optional[str]]:
+        string = self._store.string
+        return (string(index) for index in self._indices)
+
+
+class ColumnStore:
+    """A memory-mapped columnar file written by `build_store`."""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.header = read_header(self._mmap, MAGIC)
+        if self.header is None:
+            self.close()
+            raise ValueError(f"{self.path} is not a columnar ingredient store")
+        if self.header.get('version') != FORMAT_VERSION or self.header.get('byteorder') != sys.byteorder:
+            self.close()
+            raise ValueError(f"{self.path} was written by an incompatible version or platform")
+        self.rows: int = self.header['rows']
+        self._columns: Dict[str, Dict] = self.header['columns']
+        table = self.header['strings']
+        base = self.header['data_start']
+        count = table['count']
+        self._string_offsets = self._view[base + table['offsets']:
+                                          base + table['offsets'] + 8 * (count + 1)].cast('Q')
+        self._string_data = base + table['data']
+        self._string_cache: Dict[int, str] = {}
+
+    def __enter__(self) -> 'ColumnStore':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """
+        Release the mapping. Column views handed out earlier keep it alive
+        until they are garbage collected.
+        """
+        for name in ('_string_offsets', '_view'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                try:
+                    view.release()
+                except BufferError:  # still exported by a column view
+                    pass
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __len__(self) -> int:
+        return self.rows
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def kind(self, name: str) -> str:
+        """NUMERIC ('f8') or STRING ('str')."""
+        return self._columns[name]['type']
+
+    def column(self, name: str):
+        """
+        A numeric column as a zero-copy memoryview of doubles (NaN where the
+        record had no value), or a string column as a `StringColumn`.
+        """
+        info = self._columns[name]
+        start = self.header['data_start'] + info['offset']
+        if info['type'] == NUMERIC:
+            return self._view[start:start + 8 * self.rows].cast('d')
+        return StringColumn(self._view[start:start + 4 * self.rows].cast('I'), self)
+
+    def values(self, name: str, missing: float = 0.0) -> List[float]:
+        """A numeric column as a list, with NaN replaced by ``missing``
+        (like ``record.get(name, missing)`` on the JSON)."""
+        if name not in self._columns:
+            return [missing] * self.rows
+        if self.kind(name) != NUMERIC:
+            raise TypeError(f"{name} holds text in {self.path.name}, not numbers; read it with column()")
+        return [missing if math.isnan(v) else v for v in self.column(name)]
+
+    def string(self, index: int) -> Optional[str]:
+        """Entry ``index`` of the string table."""
+        if index == _NULL_STRING:
+            return None
+        text = self._string_cache.get(index)
+        if text is None:
+            start = self._string_data + self._string_offsets[index]
+            end = self._string_data + self._string_offsets[index + 1]
+            text = self._string_cache[index] = str(self._view[start:end], 'utf-8')
+        return text
+
+    def is_current(self, json_path: Union[str, Path]) -> bool:
+        """True if the store was built from the current version of ``json_path``."""
+        return self.header['source'] == _source_stamp(Path(json_path))
+
+
+def open_store(json_path: Union[str, Path], store_path: Optional[Union[str, Path]] = None,
+               rebuild: bool = True) -> ColumnStore:
+    """
+    Open the columnar companion of ``json_path``, (re)building it first if it
+    is missing or older than the JSON (unless ``rebuild`` is False).
+    """
+    json_path = Path(json_path)
+    store_path = Path(store_path) if store_path else store_path_for(json_path)
+    if store_path.exists():
+        try:
+            store = ColumnStore(store_path)
+        except ValueError:
+            store = None
+        if store is not None and (not rebuild or store.is_current(json_path)):
+            return store
+        if store is not None:
+            store.close()
+    if not rebuild:
+        raise FileNotFoundError(f"No columnar store for {json_path.name} at {store_path}")
+    return ColumnStore(build_store(json_path, store_path))
@@ -0,0 +1,113 @@
+"""
+Core/detail split of an ingredient catalog.
+
+List and picker screens only need the identity, category, price and
+proximate fields of an ingredient; the nested nutrient profiles, inclusion
+limits and long notes (DETAIL_FIELDS) are read when one ingredient is
+opened or formulated. `split_catalog` writes:
+- a core file: every record without its DETAIL_FIELDS, compact JSON array
+- a detail file: one compact JSON object of DETAIL_FIELDS per line, in
+  catalog order
+- an index: ingredient id -> [byte offset, length] in the detail file, with
+  the checksums of the source catalog and of the detail file
+
+`DetailFile` loads the index and reads one ingredient's detail with a
+single seek and read.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from feed_pipeline.paths import CACHE_DIR, atomic_write
+
+DETAIL_FIELDS = ('amino_acids_total', 'amino_acids_sid', 'energy', 'anti_nutritional_factors',
+                 'max_inclusion_pct', 'notes', 'regulatory_note')
+
+SPLIT_DIR = CACHE_DIR / "split"
+INDEX_VERSION = 1
+
+
+def split_paths(json_path: Union[str, Path], out_dir: Optional[Union[str, Path]] = None) -> Dict[str, Path]:
+    """Core, detail and index locations for a catalog."""
+    out_dir = Path(out_dir) if out_dir else SPLIT_DIR
+    stem = Path(json_path).stem
+    return {
+        'core': out_dir / f"{stem}.core.json",
+        'detail': out_dir / f"{stem}.detail.jsonl",
+        'index': out_dir / f"{stem}.detail.index.json",
+    }
+
+
+def split_catalog(json_path: Union[str, Path], out_dir: Optional[Union[str, Path]] = None,
+                  id_field: str = 'ingredient_id') -> Dict[str, Path]:
+    """Write the core file, detail file and detail index of a JSON catalog."""
+    json_path = Path(json_path)
+    paths = split_paths(json_path, out_dir)
+    data = json_path.read_bytes()
+    records = json.loads(data)
+
+    core, detail, offsets = [], bytearray(), {}
+    for record in records:
+        ingredient_id = record.get(id_field)
+        key = str(ingredient_id)
+        if key in offsets:
+            raise ValueError(f"{json_path.name}: duplicate {id_field} {ingredient_id}")
+        core.append({field: value for field, value in record.items() if field not in DETAIL_FIELDS})
+        line = json.dumps({field: record[field] for field in DETAIL_FIELDS if field in record},
+                          ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        offsets[key] = [len(detail), len(line)]
+        detail += line + b'\n'
+
+    index = {
+        'version': INDEX_VERSION,
+        'id_field': id_field,
+        'source': {'name': json_path.name, 'bytes': len(data), 'sha256': hashlib.sha256(data).hexdigest()},
+        'detail': {'name': paths['detail'].name, 'bytes': len(detail),
+                   'sha256': hashlib.sha256(detail).hexdigest()},
+        'fields': list(DETAIL_FIELDS),
+        'offsets': offsets,
+    }
+    paths['core'].parent.mkdir(parents=True, exist_ok=True)
+    atomic_write(paths['core'], json.dumps(core, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    atomic_write(paths['detail'], bytes(detail))
+    atomic_write(paths['index'], json.dumps(index, separators=(',', ':')).encode('utf-8'))
+    return paths
+
+
+class DetailFile:
+    """Random access to the detail records written by `split_catalog`."""
+
+    def __init__(self, index_path: Union[str, Path]):
+        index_path = Path(index_path)
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        if self.index.get('version') != INDEX_VERSION:
+            raise ValueError(f"{index_path} was written by an incompatible version")
+        self._offsets = self.index['offsets']
+        self._file = open(index_path.with_name(self.index['detail']['name']), 'rb')
+
+    def __enter__(self) -> 'DetailFile':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, ingredient_id) -> bool:
+        return str(ingredient_id) in self._offsets
+
+    def get(self, ingredient_id) -> Optional[Dict]:
+        """Detail fields of one ingredient, or None if the id is unknown."""
+        entry = self._offsets.get(str(ingredient_id))
+        if entry is None:
+            return None
+        offset, length = entry
+        self._file.seek(offset)
+        return json.loads(self._file.read(length))
@@ -0,0 +1,290 @@
+"""
+Content-addressed runner for the data pipeline stages.
+
+A pipeline (scripts/pipeline.json) declares stages: the script to run with
+its arguments, the files it reads (``inputs``, glob patterns allowed) and
+the files it writes (``outputs``). A stage depends on the stages whose
+outputs it reads, which makes the stages a DAG.
+
+A stage's key is a hash of its command, of its code (the script and the
+feed_pipeline modules it imports, transitively) and of its input files. A
+stage is skipped when its key matches the last successful run and its
+outputs still have the recorded hashes; otherwise it runs, and stages that
+depend on it are looked at again with the new outputs (an upstream rerun
+that writes the same bytes does not invalidate them). Stages whose
+dependencies are done run in parallel on a thread pool, each in its own
+process.
+
+File hashes are cached by (size, mtime) in the state file, so a no-change
+run only stats files.
+"""
+
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Union
+
+from feed_pipeline.paths import CACHE_DIR, REPO_ROOT, atomic_write
+
+PIPELINE_FILE = REPO_ROOT / "scripts" / "pipeline.json"
+STATE_FILE = CACHE_DIR / "pipeline_state.json"
+LOG_DIR = CACHE_DIR / "logs"
+STATE_VERSION = 1
+
+PACKAGE = 'feed_pipeline'
+
+RAN, CACHED, FAILED, BLOCKED, STALE = 'ran', 'cached', 'failed', 'blocked', 'stale'
+
+
+class Stage(NamedTuple):
+    name: str
+    run: List[str]          # script (repo-relative) and its arguments
+    inputs: List[str]       # repo-relative paths or glob patterns
+    outputs: List[str]      # repo-relative paths
+
+
+class StageResult(NamedTuple):
+    stage: str
+    status: str             # RAN, CACHED, FAILED, BLOCKED or STALE (dry run)
+    seconds: float = 0.0
+    message: str = ''
+
+
+def load_pipeline(path: Union[str, Path] = PIPELINE_FILE) -> Dict[str, Stage]:
+    """Stages of a pipeline file, in file order."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {
+        name: Stage(name, list(spec['run']), list(spec.get('inputs', [])), list(spec.get('outputs', [])))
+        for name, spec in data['stages'].items()
+    }
+
+
+def _expand(root: Path, pattern: str) -> List[Path]:
+    if any(char in pattern for char in '*?['):
+        return sorted(root.glob(pattern))
+    return [root / pattern]
+
+
+def dependencies(stages: Dict[str, Stage]) -> Dict[str, Set[str]]:
+    """Stage -> stages producing its inputs; ValueError on shared outputs or a cycle."""
+    producer = {}
+    for stage in stages.values():
+        for output in stage.outputs:
+            if output in producer:
+                raise ValueError(f"{output} is written by both {producer[output]} and {stage.name}")
+            producer[output] = stage.name
+    deps = {}
+    for stage in stages.values():
+        deps[stage.name] = set()
+        for pattern in stage.inputs:
+            if any(char in pattern for char in '*?['):
+                matched = {name for output, name in producer.items() if Path(output).match(pattern)}
+            else:
+                matched = {producer[pattern]} if pattern in producer else set()
+            deps[stage.name] |= matched - {stage.name}
+    topological_order(deps)
+    return deps
+
+
+def topological_order(deps: Dict[str, Set[str]]) -> List[str]:
+    order, done, visiting = [], set(), set()
+
+    def visit(name):
+        if name in done:
+            return
+        if name in visiting:
+            raise ValueError(f"pipeline has a cycle through {name}")
+        visiting.add(name)
+        for dep in sorted(deps[name]):
+            visit(dep)
+        visiting.discard(name)
+        done.add(name)
+        order.append(name)
+
+    for name in deps:
+        visit(name)
+    return order
+
+
+def module_closure(script: Path, package_dir: Path) -> List[Path]:
+    """``script`` and the package modules it imports, transitively."""
+    seen, pending = [], [script]
+    while pending:
+        path = pending.pop()
+        if path in seen or not path.exists():
+            continue
+        seen.append(path)
+        for node in ast.walk(ast.parse(path.read_bytes(), filename=str(path))):
+            if isinstance(node, ast.ImportFrom) and node.module:
+                if node.module == PACKAGE:
+                    pending.extend(package_dir / f"{alias.name}.py" for alias in node.names)
+                elif node.module.startswith(PACKAGE + '.'):
+                    pending.append(package_dir / f"{node.module.split('.', 1)[1]}.py")
+            elif isinstance(node, ast.Import):
+                pending.extend(package_dir / f"{alias.name.split('.', 1)[1]}.py"
+                               for alias in node.names if alias.name.startswith(PACKAGE + '.'))
+    return sorted(seen)
+
+
+class FileHashes:
+    """SHA-256 of files, cached by (size, mtime_ns)."""
+
+    def __init__(self, cache: Optional[Dict[str, list]] = None):
+        self.cache = dict(cache or {})
+
+    def get(self, path: Path) -> Optional[str]:
+        """Hash of ``path``, or None if it does not exist."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        key = str(path)
+        cached = self.cache.get(key)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        self.cache[key] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return self.cache[key][2]
+
+
+class Pipeline:
+    """Runs the stages of a pipeline file, skipping the ones whose outputs are current."""
+
+    def __init__(self, stages: Dict[str, Stage], root: Path = REPO_ROOT, state_file: Path = STATE_FILE,
+                 log_dir: Path = LOG_DIR):
+        self.stages = stages
+        self.deps = dependencies(stages)
+        self.root = Path(root)
+        self.state_file = Path(state_file)
+        self.log_dir = Path(log_dir)
+        state = self._load_state()
+        self.done = state.get('stages', {})
+        self.hashes = FileHashes(state.get('files'))
+        self._closures: Dict[Path, List[Path]] = {}
+
+    def _load_state(self) -> Dict:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return state if state.get('version') == STATE_VERSION else {}
+
+    def _save_state(self):
+        state = {'version': STATE_VERSION, 'stages': self.done, 'files': self.hashes.cache}
+        atomic_write(self.state_file, json.dumps(state).encode('utf-8'))
+
+    def _code(self, stage: Stage) -> List[Path]:
+        script = self.root / stage.run[0]
+        if script not in self._closures:
+            self._closures[script] = module_closure(script, self.root / "scripts" / PACKAGE)
+        return self._closures[script]
+
+    def key(self, stage: Stage) -> str:
+        """Hash of the command, code and inputs of a stage."""
+        digest = hashlib.sha256(json.dumps(stage.run).encode('utf-8'))
+        for label, paths in (('code', self._code(stage)),
+                             ('input', [path for pattern in stage.inputs for path in _expand(self.root, pattern)])):
+            for path in paths:
+                name = path.relative_to(self.root).as_posix() if path.is_relative_to(self.root) else str(path)
+                digest.update(f"\0{label}\0{name}\0{self.hashes.get(path)}".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _outputs(self, stage: Stage) -> Dict[str, Optional[str]]:
+        return {output: self.hashes.get(self.root / output) for output in stage.outputs}
+
+    def is_current(self, stage: Stage, key: str) -> bool:
+        previous = self.done.get(stage.name)
+        return previous is not None and previous['key'] == key and previous['outputs'] == self._outputs(stage)
+
+    def _execute(self, stage: Stage) -> StageResult:
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        start = time.perf_counter()
+        with open(self.log_dir / f"{stage.name}.log", 'wb') as log:
+            completed = subprocess.run([sys.executable] + stage.run, cwd=self.root, stdout=log,
+                                       stderr=subprocess.STDOUT, env=dict(os.environ, PYTHONIOENCODING='utf-8'))
+        seconds = time.perf_counter() - start
+        if completed.returncode != 0:
+            return StageResult(stage.name, FAILED, seconds, f"exit status {completed.returncode}")
+        return StageResult(stage.name, RAN, seconds)
+
+    def selected(self, targets: Optional[Sequence[str]] = None) -> List[str]:
+        """``targets`` and everything they depend on, in topological order (all stages by default)."""
+        order = topological_order(self.deps)
+        if not targets:
+            return order
+        unknown = [name for name in targets if name not in self.stages]
+        if unknown:
+            raise ValueError(f"unknown stage(s): {', '.join(unknown)}")
+        needed, pending = set(), list(targets)
+        while pending:
+            name = pending.pop()
+            if name not in needed:
+                needed.add(name)
+                pending.extend(self.deps[name])
+        return [name for name in order if name in needed]
+
+    def run(self, targets: Optional[Sequence[str]] = None, workers: int = 1, force: bool = False,
+            dry_run: bool = False, report=None) -> List[StageResult]:
+        """
+        Bring the selected stages up to date; returns one result per stage in
+        completion order. ``report`` is called with each result as it comes in.
+        """
+        names = self.selected(targets)
+        remaining = {name: self.deps[name] & set(names) for name in names}
+        results: Dict[str, StageResult] = {}
+        pending = {}
+
+        def finish(result: StageResult):
+            results[result.stage] = result
+            if report is not None:
+                report(result)
+
+        with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+            while remaining or pending:
+                for name in [name for name, deps in remaining.items() if deps <= results.keys()]:
+                    del remaining[name]
+                    stage = self.stages[name]
+                    if any(results[dep].status in (FAILED, BLOCKED) for dep in self.deps[name] if dep in results):
+                        finish(StageResult(name, BLOCKED, message='an upstream stage failed'))
+                        continue
+                    if dry_run and any(results[dep].status == STALE for dep in self.deps[name] if dep in results):
+                        finish(StageResult(name, STALE, message='after upstream stages'))
+                        continue
+                    key = self.key(stage)
+                    if not force and self.is_current(stage, key):
+                        finish(StageResult(name, CACHED))
+                    elif dry_run:
+                        finish(StageResult(name, STALE))
+                    else:
+                        pending[pool.submit(self._execute, stage)] = (stage, key)
+                if not pending:
+                    continue
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, key = pending.pop(future)
+                    result = future.result()
+                    if result.status == RAN:
+                        outputs = self._outputs(stage)
+                        missing = [output for output, digest in outputs.items() if digest is None]
+                        if missing:
+                            result = result._replace(status=FAILED, message=f"did not write {', '.join(missing)}")
+                        else:
+                            self.done[stage.name] = {'key': key, 'outputs': outputs}
+                    if result.status == FAILED:
+                        self.done.pop(stage.name, None)
+                    self._save_state()
+                    finish(result)
+        if not dry_run:
+            self._save_state()
+        return list(results.values())
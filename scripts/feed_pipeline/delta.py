@@ -0,0 +1,235 @@
+"""
+Delta patches between two versions of an ingredient catalog.
+
+`make_patch` matches records by identity (``ingredient_id``) and compares
+hashes of each record's exact bytes in the file, so a diff is one parse
+and one pass over each version plus dict lookups. The patch holds:
+- ``removed``: ids of records that are gone
+- ``added``: ``[index, record]`` for new records, at their index in the new
+  version
+- ``changed``: per record, the fields whose value changed or appeared
+  (``set``), the fields that disappeared (``unset``) and, only when the key
+  order differs from what applying those gives, the new key order (``keys``)
+- ``order``: the full id order, only when records were also reordered
+- the SHA-256 of both versions
+
+`apply_patch` checks the base checksum, copies the bytes of untouched records
+and serializes the patched and added ones the way
+merge_ingredients_standardized.py writes the catalog (``serialize``), then
+checks the result against the target checksum, so an applied patch is
+byte-identical to the new version or fails loudly.
+"""
+
+import hashlib
+import json
+from typing import Dict, List, Tuple, Union
+
+PATCH_VERSION = 1
+
+# Layout of the serialized catalog around its records
+_OPEN = b'[\n  '
+_SEPARATOR = b',\n  '
+_CLOSE = b'\n]'
+_BOUNDARY = b'\n  },\n  {'
+
+
+class PatchError(ValueError):
+    """A patch that does not apply to the given base, or produces the wrong result."""
+
+
+def serialize(records: List[Dict]) -> bytes:
+    """The catalog's on-disk text (same as merge_ingredients_standardized.serialize)."""
+    return json.dumps(records, indent=2, ensure_ascii=False).encode('utf-8')
+
+
+def _record_text(record: Dict) -> bytes:
+    """One record as it appears inside the serialized array."""
+    return json.dumps(record, indent=2, ensure_ascii=False).replace('\n', '\n  ').encode('utf-8')
+
+
+def _join(spans: List[bytes]) -> bytes:
+    return _OPEN + _SEPARATOR.join(spans) + _CLOSE if spans else b'[]'
+
+
+def _text(value) -> str:
+    """Exact serialization of a field value (1 and 1.0 differ, unlike ``==``)."""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'))
+
+
+def _index(records: List[Dict], id_field: str, label: str) -> Dict:
+    position = {}
+    for i, record in enumerate(records):
+        key = record.get(id_field) if isinstance(record, dict) else None
+        if key is None or key in position:
+            raise PatchError(f"{label}: missing or duplicate {id_field} {key!r} at record {i}")
+        position[key] = i
+    return position
+
+
+def _spans(data: bytes) -> List[bytes]:
+    """
+    Exact bytes of each record of a canonical catalog. JSON strings cannot
+    hold a raw newline, so with ``indent=2`` the record boundaries are the
+    only places where a line starts with ``  }`` followed by ``,`` and ``  {``.
+    """
+    if data == b'[]':
+        return []
+    if not (data.startswith(_OPEN + b'{') and data.endswith(b'}' + _CLOSE)):
+        return None
+    parts = data[len(_OPEN):-len(_CLOSE)].split(_BOUNDARY)
+    return [(b'' if i == 0 else b'{') + part + (b'' if i == len(parts) - 1 else b'\n  }')
+            for i, part in enumerate(parts)]
+
+
+def _load(version: Union[bytes, List[Dict]], label: str) -> Tuple[List[Dict], List[bytes]]:
+    """(records, exact bytes of each record) of a catalog given as file bytes or records."""
+    if isinstance(version, (bytes, bytearray)):
+        version = bytes(version)
+        records = json.loads(version)
+        spans = _spans(version)
+        if spans is None or len(spans) != len(records):
+            raise PatchError(f"{label} is not in the catalog's canonical layout (indent=2, UTF-8)")
+        return records, spans
+    return version, [_record_text(record) for record in version]
+
+
+def make_patch(old: Union[bytes, List[Dict]], new: Union[bytes, List[Dict]],
+               id_field: str = 'ingredient_id') -> Dict:
+    """Patch turning ``old`` into ``new`` (file bytes or record lists)."""
+    old, old_spans = _load(old, 'base')
+    new, new_spans = _load(new, 'target')
+    old_position = _index(old, id_field, 'base')
+    new_position = _index(new, id_field, 'target')
+
+    removed = [record[id_field] for record in old if record[id_field] not in new_position]
+    added, changed = [], []
+    for i, record in enumerate(new):
+        key = record[id_field]
+        if key not in old_position:
+            added.append([i, record])
+        elif _hash(old_spans[old_position[key]]) != _hash(new_spans[i]):
+            changed.append(_changes(old[old_position[key]], record, key))
+        else:
+            continue
+        # apply_patch re-serializes patched records; they must come out as in the file
+        if _record_text(record) != new_spans[i]:
+            raise PatchError(f"target record {key!r} is not in the catalog's canonical layout")
+
+    patch = {
+        'version': PATCH_VERSION,
+        'id_field': id_field,
+        'base': {'records': len(old), 'sha256': _digest(old_spans)},
+        'target': {'records': len(new), 'sha256': _digest(new_spans)},
+        'removed': removed,
+        'added': added,
+        'changed': changed,
+    }
+    if [key for key, _ in _reorder([(r[id_field], None) for r in old], patch)] != [r[id_field] for r in new]:
+        patch['order'] = [record[id_field] for record in new]
+    return patch
+
+
+def _hash(span: bytes) -> bytes:
+    return hashlib.blake2b(span, digest_size=16).digest()
+
+
+def _digest(spans: List[bytes]) -> str:
+    """SHA-256 of the serialized catalog, without building it."""
+    if not spans:
+        return hashlib.sha256(b'[]').hexdigest()
+    digest = hashlib.sha256(_OPEN)
+    for i, span in enumerate(spans):
+        if i:
+            digest.update(_SEPARATOR)
+        digest.update(span)
+    digest.update(_CLOSE)
+    return digest.hexdigest()
+
+
+def _changes(before: Dict, record: Dict, key) -> Dict:
+    """Changed entry: new or changed fields, removed fields, and the key order if needed."""
+    entry = {'id': key}
+    updates = {field: value for field, value in record.items()
+               if field not in before or _text(before[field]) != _text(value)}
+    unset = [field for field in before if field not in record]
+    if updates:
+        entry['set'] = updates
+    if unset:
+        entry['unset'] = unset
+    rebuilt = [field for field in before if field in record] + [field for field in record if field not in before]
+    if rebuilt != list(record):
+        entry['keys'] = list(record)
+    return entry
+
+
+def _reorder(items: List[Tuple], patch: Dict) -> List[Tuple]:
+    """(id, ...) items of the base minus removed, with added records placed at their indices (one pass)."""
+    removed = set(patch['removed'])
+    kept = iter([item for item in items if item[0] not in removed])
+    added = {index: (record[patch['id_field']], record) for index, record in patch['added']}
+    result = []
+    for i in range(len(items) - len(removed) + len(added)):
+        item = added.get(i)
+        if item is None:
+            item = next(kept, None)
+            if item is None:
+                raise PatchError(f"added record index {i} is out of range")
+        result.append(item)
+    return result
+
+
+def apply_patch(base: Union[bytes, List[Dict]], patch: Dict) -> bytes:
+    """
+    Bytes of the target version; raises PatchError on a checksum mismatch.
+    Untouched records are copied byte for byte, only patched and added
+    records are serialized.
+    """
+    if patch.get('version') != PATCH_VERSION:
+        raise PatchError("unsupported patch version")
+    records, spans = _load(base, 'base')
+    if _digest(spans) != patch['base']['sha256']:
+        raise PatchError("patch was made for a different base version")
+    id_field = patch['id_field']
+    position = _index(records, id_field, 'base')
+
+    items = [(record[id_field], span) for record, span in zip(records, spans)]
+    for entry in patch['changed']:
+        i = position.get(entry['id'])
+        if i is None:
+            raise PatchError(f"changed record {entry['id']!r} is not in the base")
+        record = {field: value for field, value in records[i].items() if field not in entry.get('unset', ())}
+        record.update(entry.get('set', {}))
+        if 'keys' in entry:
+            record = {field: record[field] for field in entry['keys']}
+        items[i] = (entry['id'], _record_text(record))
+
+    items = [(key, value if isinstance(value, bytes) else _record_text(value))
+             for key, value in _reorder(items, patch)]
+    if 'order' in patch:
+        by_id = dict(items)
+        items = [(key, by_id[key]) for key in patch['order']]
+    spans = [span for _, span in items]
+    if _digest(spans) != patch['target']['sha256']:
+        raise PatchError("patched dataset does not match the target checksum")
+    return _join(spans)
+
+
+def patch_summary(patch: Dict) -> Dict[str, int]:
+    return {
+        'added': len(patch['added']),
+        'removed': len(patch['removed']),
+        'changed': len(patch['changed']),
+        'fields_changed': sum(len(entry.get('set', {})) + len(entry.get('unset', ())) for entry in patch['changed']),
+        'reordered': int('order' in patch),
+    }
+
+
+def load_patch(data: Union[bytes, str]) -> Dict:
+    patch = json.loads(data)
+    if not isinstance(patch, dict) or patch.get('version') != PATCH_VERSION:
+        raise PatchError("not a dataset patch of a supported version")
+    return patch
+
+
+def dump_patch(patch: Dict) -> bytes:
+    return json.dumps(patch, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
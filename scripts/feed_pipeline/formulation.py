@@ -0,0 +1,297 @@
+"""
+Batch least-cost formulation over the standardized ingredient catalog.
+
+Mirrors the app's FeedFormulatorEngine (feed_formulator_engine.dart) so the
+pipeline can formulate thousands of rations against a new dataset and check
+the diets still make sense before it ships:
+- nutrient coefficients per animal class (`nutrient_value`: the energy field
+  for the species, amino acids and minerals converted from g/kg to %)
+- max inclusion caps per animal class and feed type from
+  ``max_inclusion_pct``, premix-like ingredients capped at 3% when uncapped
+- nutrient minimums raised by the safety margin (1.02)
+
+`IngredientMatrix` is built once per catalog; each `Ration` picks an animal
+class, feed type and requirements (plus optional prices and ingredient
+subset) and `formulate_batch` solves them in order, optionally on a process
+pool. Infeasible rations are reported, not relaxed; the app's relaxation
+and slack-filling heuristics are out of scope here.
+
+`price_scenarios` re-solves one ration under many price vectors. Prices
+only change the objective, so the previous optimal basis stays feasible and
+each scenario restarts the simplex from it (a warm start), usually a few
+pivots away. Results come back as a `ScenarioTable` of flat arrays.
+"""
+
+import csv
+import math
+from array import array
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from feed_pipeline.json_stream import iter_records
+from feed_pipeline.lp import INF, OPTIMAL, BoundedSimplex, LinearProgram, default_solver, solve
+from feed_pipeline.parallel import chunked, map_chunks
+
+NUTRIENTS = ('energy', 'protein', 'lysine', 'methionine', 'calcium', 'phosphorus')
+
+# animal_type_id -> energy fields in order of preference (_energyValue)
+ENERGY_FIELDS = {
+    1: ('me_growing_pig', 'me_adult_pig', 'me_finishing_pig'),
+    2: ('me_poultry',),
+    3: ('me_rabbit',),
+    4: ('me_ruminant',), 5: ('me_ruminant',), 6: ('me_ruminant',), 7: ('me_ruminant',),
+    8: ('de_salmonids',), 9: ('de_salmonids',),
+}
+
+# animal_type_id -> max_inclusion_pct key prefix (_getInclusionKey)
+INCLUSION_PREFIXES = {
+    1: 'pig', 2: 'poultry', 3: 'rabbit',
+    4: 'ruminant_dairy', 5: 'ruminant_beef', 6: 'ruminant_sheep', 7: 'ruminant_goat',
+    8: 'fish', 9: 'fish',
+}
+FEED_TYPE_KEYS = {
+    'prestarter': 'starter', 'broiler': 'starter',
+    'tilapia': 'freshwater', 'catfish': 'freshwater',
+}
+
+PREMIX_KEYWORDS = ('premix', 'pre-mix', 'mineral', 'vitamin', 'supplement', 'trace',
+                   'micronutrient', 'salt', 'sodium chloride')
+PREMIX_CAP_PCT = 3.0
+
+SAFETY_MARGIN = 1.02
+
+
+def _number(value) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def energy_value(record: Dict, animal_type_id: int) -> float:
+    """Energy (kcal/kg) of an ingredient for an animal class; MJ values are converted."""
+    value = 0.0
+    for field in ENERGY_FIELDS.get(animal_type_id, ()):
+        number = _number(record.get(field))
+        if number is not None:
+            value = number
+            break
+    if 0 < value < 100:  # likely MJ
+        value *= 239
+    return value
+
+
+def nutrient_value(record: Dict, key: str, animal_type_id: int) -> float:
+    """Coefficient of one ingredient in a nutrient constraint, in the requirement's unit."""
+    if key == 'energy':
+        return energy_value(record, animal_type_id)
+    if key == 'protein':
+        return _number(record.get('crude_protein')) or 0.0
+    if key == 'phosphorus':
+        for field in ('total_phosphorus', 'phosphorus', 'available_phosphorus'):
+            number = _number(record.get(field))
+            if number is not None:
+                return number / 10
+        return 0.0
+    return (_number(record.get(key)) or 0.0) / 10  # g/kg -> %
+
+
+def inclusion_key(animal_type_id: int, feed_type: str) -> Optional[str]:
+    prefix = INCLUSION_PREFIXES.get(animal_type_id)
+    if prefix is None:
+        return None
+    feed_type = feed_type.lower()
+    return f"{prefix}_{FEED_TYPE_KEYS.get(feed_type, feed_type)}"
+
+
+def max_inclusion_pct(record: Dict, animal_type_id: int, feed_type: Optional[str]) -> Optional[float]:
+    """
+    Inclusion cap (%) of an ingredient, or None for no cap. As in the app, a
+    cap of 0 or less is ignored.
+    """
+    caps = record.get('max_inclusion_pct')
+    cap = None
+    if isinstance(caps, dict):
+        if feed_type is not None:
+            cap = _number(caps.get(inclusion_key(animal_type_id, feed_type)))
+    else:
+        cap = _number(caps)
+    if cap is None and any(keyword in str(record.get('name') or '').lower() for keyword in PREMIX_KEYWORDS):
+        cap = PREMIX_CAP_PCT
+    return cap
+
+
+class Ration(NamedTuple):
+    """One formulation request."""
+    animal_type_id: int
+    feed_type: str
+    requirements: Dict[str, Tuple[Optional[float], Optional[float]]]  # nutrient -> (min, max)
+    prices: Optional[Dict[object, float]] = None       # ingredient id -> price/kg (catalog price otherwise)
+    ingredient_ids: Optional[Sequence[object]] = None  # restrict to these ingredients
+    label: str = ''
+
+
+def constrained_nutrients(ration: Ration) -> List[str]:
+    """Nutrients with a limit in ``ration``: rows 1.. of its program (row 0 is the 100% row)."""
+    return [key for key in NUTRIENTS if ration.requirements.get(key, (None, None)) != (None, None)]
+
+
+class FormulationResult(NamedTuple):
+    ration: Ration
+    status: str
+    cost: float                          # per kg of feed
+    inclusions: Dict[object, float]      # ingredient id -> % of the ration (non-zero only)
+    nutrients: Dict[str, float]          # nutrient -> level in the ration
+
+
+class IngredientMatrix:
+    """Nutrient coefficients, prices and caps of a catalog, per animal class."""
+
+    def __init__(self, records: Iterable[Dict], id_field: str = 'ingredient_id'):
+        self.records = list(records)
+        self.ids = [record.get(id_field) for record in self.records]
+        self.prices = [_number(record.get('price_kg')) for record in self.records]
+        known = [price for price in self.prices if price is not None]
+        default_price = sum(known) / len(known) if known else 0.0  # app: average price when missing
+        self.prices = [default_price if price is None else price for price in self.prices]
+        self._position = {ingredient_id: j for j, ingredient_id in enumerate(self.ids)}
+        self._nutrients: Dict[int, List[List[float]]] = {}
+        self._caps: Dict[Tuple[int, str], List[float]] = {}
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], id_field: str = 'ingredient_id') -> 'IngredientMatrix':
+        return cls(iter_records(path), id_field)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def nutrient_rows(self, animal_type_id: int) -> List[List[float]]:
+        """One row of coefficients per entry of NUTRIENTS."""
+        rows = self._nutrients.get(animal_type_id)
+        if rows is None:
+            rows = self._nutrients[animal_type_id] = [
+                [nutrient_value(record, key, animal_type_id) for record in self.records]
+                for key in NUTRIENTS
+            ]
+        return rows
+
+    def caps(self, animal_type_id: int, feed_type: str) -> List[float]:
+        """Upper bound of each ingredient as a fraction of the ration (INF when uncapped)."""
+        key = (animal_type_id, feed_type)
+        caps = self._caps.get(key)
+        if caps is None:
+            caps = self._caps[key] = []
+            for record in self.records:
+                cap = max_inclusion_pct(record, animal_type_id, feed_type)
+                caps.append(cap / 100 if cap is not None and cap > 0 else INF)
+        return caps
+
+    def columns(self, ration: Ration) -> List[int]:
+        if ration.ingredient_ids is None:
+            return list(range(len(self)))
+        return [self._position[ingredient_id] for ingredient_id in ration.ingredient_ids]
+
+    def program(self, ration: Ration, safety_margin: float = SAFETY_MARGIN) -> Tuple[LinearProgram, List[int]]:
+        """The ration's linear program over fractions of the ration, and its ingredient columns."""
+        columns = self.columns(ration)
+        prices = ration.prices or {}
+        cost = [prices.get(self.ids[j], self.prices[j]) for j in columns]
+        all_caps = self.caps(ration.animal_type_id, ration.feed_type)
+        nutrient_rows = self.nutrient_rows(ration.animal_type_id)
+
+        rows, row_lo, row_hi = [[1.0] * len(columns)], [1.0], [1.0]
+        for key in constrained_nutrients(ration):
+            low, high = ration.requirements[key]
+            row = nutrient_rows[NUTRIENTS.index(key)]
+            rows.append([row[j] for j in columns])
+            row_lo.append(low * safety_margin if low is not None else -INF)
+            row_hi.append(high if high is not None else INF)
+        lp = LinearProgram(cost, rows, row_lo, row_hi, [0.0] * len(columns), [all_caps[j] for j in columns])
+        return lp, columns
+
+    def formulate(self, ration: Ration, solver: Optional[str] = None,
+                  safety_margin: float = SAFETY_MARGIN) -> FormulationResult:
+        lp, columns = self.program(ration, safety_margin)
+        solution = solve(lp, solver)
+        if solution.status != OPTIMAL:
+            return FormulationResult(ration, solution.status, INF, {}, {})
+        inclusions = {self.ids[j]: x * 100 for j, x in zip(columns, solution.x) if x > 1e-9}
+        nutrient_rows = self.nutrient_rows(ration.animal_type_id)
+        nutrients = {key: sum(row[j] * x for j, x in zip(columns, solution.x))
+                     for key, row in zip(NUTRIENTS, nutrient_rows)}
+        return FormulationResult(ration, OPTIMAL, solution.objective, inclusions, nutrients)
+
+
+def _formulate_chunk(matrix: IngredientMatrix, solver: str, safety_margin: float,
+                     chunk) -> List[FormulationResult]:
+    _, rations = chunk
+    return [matrix.formulate(ration, solver, safety_margin) for ration in rations]
+
+
+def formulate_batch(matrix: IngredientMatrix, rations: Iterable[Ration], solver: Optional[str] = None,
+                    safety_margin: float = SAFETY_MARGIN, workers: int = 1,
+                    chunk_size: int = 200) -> Iterator[FormulationResult]:
+    """Results for ``rations`` in order, solved on ``workers`` processes (None: one per CPU)."""
+    work = partial(_formulate_chunk, matrix, solver or default_solver(), safety_margin)
+    for results in map_chunks(work, chunked(rations, chunk_size), workers):
+        yield from results
+
+
+class ScenarioTable(NamedTuple):
+    """Price scenarios of one ration: scenario x ingredient inclusions and costs."""
+    ration: Ration
+    ingredient_ids: List[object]  # columns of `inclusions`
+    status: List[str]             # per scenario
+    costs: array                  # 'd', per scenario (NaN unless optimal)
+    inclusions: array             # 'd', scenario-major, % of the ration
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def row(self, scenario: int) -> array:
+        """Inclusions (%) of one scenario, in `ingredient_ids` order."""
+        width = len(self.ingredient_ids)
+        return self.inclusions[scenario * width:(scenario + 1) * width]
+
+    def write_csv(self, path: Union[str, Path]):
+        """One line per scenario: status, cost, then one column per ingredient."""
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['scenario', 'status', 'cost'] + list(self.ingredient_ids))
+            for scenario, (status, cost) in enumerate(zip(self.status, self.costs)):
+                writer.writerow([scenario, status, '' if math.isnan(cost) else f"{cost:.6g}"]
+                                + [f"{value:.6g}" for value in self.row(scenario)])
+
+
+def _scenario_chunk(matrix: IngredientMatrix, ration: Ration, safety_margin: float, chunk) -> Tuple:
+    """(status, costs, inclusions) for a (start, price vectors) chunk, warm-starting each solve."""
+    _, price_vectors = chunk
+    lp, columns = matrix.program(ration, safety_margin)
+    simplex = BoundedSimplex(lp)
+    status, costs, inclusions = [], array('d'), array('d')
+    for prices in price_vectors:
+        solution = simplex.reoptimize([prices[j] for j in columns])
+        status.append(solution.status)
+        if solution.status == OPTIMAL:
+            costs.append(solution.objective)
+            inclusions.extend(x * 100 for x in solution.x)
+        else:
+            costs.append(math.nan)
+            inclusions.extend([0.0] * len(columns))
+    return status, costs, inclusions
+
+
+def price_scenarios(matrix: IngredientMatrix, ration: Ration, price_vectors: Iterable[Sequence[float]],
+                    safety_margin: float = SAFETY_MARGIN, workers: int = 1,
+                    chunk_size: int = 2000) -> ScenarioTable:
+    """
+    Formulate ``ration`` once per price vector (prices per kg in catalog
+    order, ``matrix.ids``; ``ration.prices`` is ignored). Each worker
+    warm-starts every scenario of its chunk from the previous optimum.
+    """
+    columns = matrix.columns(ration)
+    status, costs, inclusions = [], array('d'), array('d')
+    work = partial(_scenario_chunk, matrix, ration, safety_margin)
+    for chunk_status, chunk_costs, chunk_inclusions in map_chunks(work, chunked(price_vectors, chunk_size), workers):
+        status.extend(chunk_status)
+        costs.extend(chunk_costs)
+        inclusions.extend(chunk_inclusions)
+    return ScenarioTable(ration, [matrix.ids[j] for j in columns], status, costs, inclusions)
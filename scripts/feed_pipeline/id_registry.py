@@ -0,0 +1,144 @@
+"""
+Stable ingredient ids across pipeline runs.
+
+The merge and remediation scripts used to number their output 1..N on every
+run, so one inserted record shifted every later id and the app could not
+upsert by id. An `IdRegistry` maps identity keys to the id they were given
+once:
+- a key is built from identity values (e.g. a source record's standardized
+  name and name), lower-cased with whitespace collapsed; output records
+  whose source records share a key (e.g. two grades under one name) are
+  told apart by their occurrence in output order (``#2``, ``#3``, ...)
+- an output record is identified by the keys of all the source records
+  merged into it, not by its own (merged) name, so a new record merging into
+  an ingredient does not change the ingredient's id: the record takes the id
+  of its first member with a known key, and every member key then points at
+  that id
+- new records get the next unused id; ids of records that disappear are kept
+  under ``retired`` (a returning record gets its id back) and are never
+  handed out again
+- the first run without a registry file seeds it from the current output,
+  so the ids already shipped are kept
+
+Registries live in scripts/id_registry/ and are meant to be committed with
+the outputs they number.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Union
+
+from feed_pipeline.paths import REPO_ROOT, atomic_write
+
+REGISTRY_DIR = REPO_ROOT / "scripts" / "id_registry"
+REGISTRY_VERSION = 2
+
+# Identity fields of a source record of ingredients_standardized.json
+CATALOG_ID_FIELDS = ('standardized_name', 'name')
+
+
+def registry_path_for(output_file: Union[str, Path]) -> Path:
+    """Registry location of an output file (one registry per output)."""
+    return REGISTRY_DIR / f"{Path(output_file).stem}.ids.json"
+
+
+def _part(value) -> str:
+    return ' '.join(str(value).lower().split()) if value is not None else ''
+
+
+def field_values(records: Iterable[Dict], fields: Sequence[str]) -> List[tuple]:
+    """Identity values of each record."""
+    return [tuple(record.get(field) for field in fields) for record in records]
+
+
+def identity_keys(groups: Iterable[Iterable[Sequence]]) -> List[List[str]]:
+    """
+    Distinct identity keys of each group of identity values (the source
+    records of one output record); a key an earlier group already has gets
+    an occurrence suffix.
+    """
+    seen: Dict[str, int] = {}
+    result = []
+    for rows in groups:
+        keys = []
+        for key in dict.fromkeys('|'.join(_part(value) for value in row) for row in rows):
+            seen[key] = seen.get(key, 0) + 1
+            keys.append(key if seen[key] == 1 else f"{key}#{seen[key]}")
+        result.append(keys)
+    return result
+
+
+class IdRegistry:
+    """Identity key -> id of the current and retired records, plus the next id to hand out."""
+
+    def __init__(self, ids: Optional[Dict[str, int]] = None, next_id: Optional[int] = None,
+                 path: Optional[Path] = None, retired: Optional[Dict[str, int]] = None):
+        self.ids = dict(ids or {})
+        self.retired = dict(retired or {})
+        self.next_id = next_id if next_id is not None else max(
+            [*self.ids.values(), *self.retired.values()], default=0) + 1
+        self.path = path
+
+    @classmethod
+    def load(cls, path: Union[str, Path], fields: Sequence[str] = (), seed_file: Optional[Union[str, Path]] = None,
+             id_field: str = 'ingredient_id') -> 'IdRegistry':
+        """
+        Read a registry. Without one, seed it from the ``fields`` of
+        ``seed_file`` (the current output) when that exists, else start
+        empty (the first run numbers the output 1..N). A version 1 registry
+        (keys of output records, no retired ids) is read as it is.
+        """
+        path = Path(path)
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') not in (1, REGISTRY_VERSION):
+                raise ValueError(f"{path} was written by an incompatible version")
+            return cls(data['ids'], data['next_id'], path, data.get('retired'))
+        registry = cls(path=path)
+        if seed_file is not None and Path(seed_file).exists():
+            with open(seed_file, 'r', encoding='utf-8') as f:
+                records = json.load(f)
+            used = set()
+            for (key,), record in zip(identity_keys([row] for row in field_values(records, fields)), records):
+                if isinstance(record.get(id_field), int) and record[id_field] not in used:
+                    registry.ids[key] = record[id_field]
+                    used.add(record[id_field])
+            registry.next_id = max(registry.ids.values(), default=0) + 1
+        return registry
+
+    def assign(self, records: List[Dict], members: Sequence[Sequence[str]],
+               id_field: str = 'ingredient_id') -> Dict[str, int]:
+        """
+        Set ``id_field`` on every record. ``members[i]`` holds the identity
+        keys of the source records merged into ``records[i]`` (see
+        `identity_keys`), founding record first. Returns how many ids this run kept (or restored), handed out
+        and retired.
+        """
+        known = {**self.retired, **self.ids}
+        live = set(self.ids.values())
+        ids: Dict[str, int] = {}
+        taken = set()
+        kept = new = 0
+        for record, keys in zip(records, members):
+            record_id = next((known[key] for key in keys if key in known and known[key] not in taken), None)
+            if record_id is None:
+                record_id = self.next_id
+                self.next_id += 1
+                new += 1
+            else:
+                kept += 1
+            taken.add(record_id)
+            for key in keys:
+                ids[key] = record_id
+            record[id_field] = record_id
+        self.retired = {key: old_id for key, old_id in known.items() if key not in ids and old_id not in taken}
+        self.ids = ids
+        return {'kept': kept, 'new': new, 'retired': len(live - taken)}
+
+    def save(self, path: Optional[Union[str, Path]] = None):
+        path = Path(path) if path else self.path
+        data = {'version': REGISTRY_VERSION, 'next_id': self.next_id,
+                'ids': dict(sorted(self.ids.items(), key=lambda item: (item[1], item[0]))),
+                'retired': dict(sorted(self.retired.items(), key=lambda item: (item[1], item[0])))}
+        atomic_write(path, (json.dumps(data, indent=2, ensure_ascii=False) + '\n').encode('utf-8'))
@@ -0,0 +1,177 @@
+"""
+Content fingerprints and merge manifests for incremental merge runs.
+
+Both merge scripts cluster records in source order and then fold each
+cluster's members into one output record. A cluster's output only depends
+on its members' content and order, so a run can reuse every cluster whose
+member fingerprints are unchanged and fold only the clusters touched by
+added, changed or removed records.
+
+The manifest written after each run records, per source record, its
+fingerprint, clustering key and cluster, plus each cluster's output record.
+It is tied to the merger's source code: if the code changes, the manifest is
+ignored and the next run is a full rebuild.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+MANIFEST_VERSION = 1
+
+
+def canonical_json(value) -> bytes:
+    """Stable serialization used for hashing (key order independent)."""
+    return json.dumps(value, sort_keys=True, ensure_ascii=False,
+                      separators=(',', ':')).encode('utf-8')
+
+
+def record_fingerprint(record: Dict, source: str) -> str:
+    """Content hash of one source record, including where it came from."""
+    digest = hashlib.sha256(source.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(canonical_json(record))
+    return digest.hexdigest()
+
+
+def code_fingerprint(paths: Iterable[Path]) -> str:
+    """Hash of the source files whose logic determines the merge output."""
+    digest = hashlib.sha256()
+    for path in sorted(Path(p) for p in paths):
+        digest.update(path.name.encode('utf-8'))
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+class MergeManifest:
+    """Per-record fingerprints, clustering keys and per-cluster outputs."""
+
+    def __init__(self, code: str, hashes: Sequence[str], keys: Sequence,
+                 clusters: Sequence[Sequence[int]], outputs: Sequence[Dict]):
+        self.code = code
+        self.hashes = list(hashes)
+        self.keys = list(keys)
+        self.clusters = [list(members) for members in clusters]
+        self.outputs = list(outputs)
+
+    @classmethod
+    def load(cls, path: Path, code: str) -> Optional['MergeManifest']:
+        """Read a manifest; None if missing, unreadable or from other code."""
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('version') != MANIFEST_VERSION or data.get('code') != code:
+            return None
+        records = data['records']
+        return cls(
+            code,
+            [r['hash'] for r in records],
+            [r['key'] for r in records],
+            [c['members'] for c in data['clusters']],
+            [c['record'] for c in data['clusters']],
+        )
+
+    def save(self, path: Path):
+        cluster_of = {}
+        for cluster, members in enumerate(self.clusters):
+            for member in members:
+                cluster_of[member] = cluster
+        data = {
+            'version': MANIFEST_VERSION,
+            'code': self.code,
+            'records': [
+                {'hash': h, 'key': k, 'cluster': cluster_of.get(i)}
+                for i, (h, k) in enumerate(zip(self.hashes, self.keys))
+            ],
+            'clusters': [
+                {'members': members, 'record': record}
+                for members, record in zip(self.clusters, self.outputs)
+            ],
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+
+    def key_for(self) -> Dict[str, object]:
+        """Clustering key by record fingerprint (reused for unchanged records)."""
+        return dict(zip(self.hashes, self.keys))
+
+    def reusable_outputs(self) -> Dict[Tuple[str, ...], Dict]:
+        """Cluster output by the ordered fingerprints of its members."""
+        return {
+            tuple(self.hashes[i] for i in members): record
+            for members, record in zip(self.clusters, self.outputs)
+        }
+
+    def previous_founders(self, hashes: Sequence[str]) -> List[Optional[int]]:
+        """
+        Where each current record was clustered in this run, for mergers
+        that cluster in order against cluster founders.
+
+        Records are matched to this run by fingerprint, keeping their
+        relative order. For a matched record whose cluster founder is matched
+        too, gives the founder's current position (its own position if it
+        founded the cluster); None for new or changed records and for
+        records whose founder is gone or moved.
+        """
+        cluster_of = {}
+        for members in self.clusters:
+            for member in members:
+                cluster_of[member] = members[0]
+        unmatched: Dict[str, List[int]] = {}
+        for pos in reversed(range(len(self.hashes))):
+            unmatched.setdefault(self.hashes[pos], []).append(pos)
+        current: Dict[int, int] = {}
+        last = -1
+        for pos, digest in enumerate(hashes):
+            candidates = unmatched.get(digest)
+            while candidates and candidates[-1] <= last:
+                candidates.pop()
+            if candidates:
+                last = candidates.pop()
+                current[last] = pos
+        founders: List[Optional[int]] = [None] * len(hashes)
+        for old_pos, pos in current.items():
+            founder = cluster_of.get(old_pos)
+            if founder in current:
+                founders[pos] = current[founder]
+        return founders
+
+    def partitions(self, bucket_of: Callable[[Any], Any]) -> Dict[Any, Tuple[Tuple[str, ...], List[Tuple[List[int], Dict]]]]:
+        """
+        Previous run split into independent buckets, for mergers that only
+        ever merge records whose keys fall in the same bucket.
+
+        Maps bucket -> (ordered member fingerprints, [(member positions
+        within the bucket, cluster output), ...]). A bucket whose fingerprint
+        sequence is unchanged can take its clusters over as they are.
+        """
+        positions: Dict[Any, List[int]] = {}
+        for pos, key in enumerate(self.keys):
+            positions.setdefault(bucket_of(key), []).append(pos)
+        local = {}
+        for members in positions.values():
+            local.update((pos, i) for i, pos in enumerate(members))
+        result = {
+            bucket: (tuple(self.hashes[pos] for pos in members), [])
+            for bucket, members in positions.items()
+        }
+        for members, record in zip(self.clusters, self.outputs):
+            bucket = bucket_of(self.keys[members[0]])
+            result[bucket][1].append(([local[pos] for pos in members], record))
+        return result
+
+
+def diff_counts(old: Optional[MergeManifest], hashes: List[str]) -> Dict[str, int]:
+    """Added / removed / unchanged record counts against the previous run."""
+    if old is None:
+        return {'added': len(hashes), 'removed': 0, 'unchanged': 0}
+    before, after = set(old.hashes), set(hashes)
+    return {
+        'added': len(after - before),
+        'removed': len(before - after),
+        'unchanged': len(after & before),
+    }
@@ -0,0 +1,186 @@
+"""
+Opt-in timing, memory and counter instrumentation for the pipeline scripts.
+
+Off by default. While off, `span` hands back one shared no-op context,
+`count` returns after a single check and `timed` functions call straight
+through, so the hooks can stay in hot paths. `start` switches recording on
+(the scripts do it for ``--trace FILE``):
+- ``span(name)``: a timed phase (load, clustering, merging, report, ...),
+  with the tracemalloc peak reached inside it when memory tracing is on;
+  spans nest
+- ``count(name, n)``: event counters (candidate comparisons, regex
+  evaluations, reused clusters, ...)
+- ``@timed(name)``: total time and call count of a function called many
+  times (``normalize_ingredient``, ``find_duplicate``, ...), aggregated
+  rather than recorded per call
+
+`finish` writes the spans as Chrome trace events (chrome://tracing,
+Perfetto) with counters and aggregated timings attached, and returns a
+one-line summary. Only the calling process is recorded; work done on a
+process pool (``--workers``) shows up as the span around it.
+"""
+
+import contextlib
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+_NULL_SPAN = contextlib.nullcontext()
+_active: Optional['Recorder'] = None
+
+
+class Recorder:
+    """Spans, counters and function timings of one run."""
+
+    def __init__(self, memory: bool = True):
+        import tracemalloc  # only when recording: it pulls in pickle and tokenize
+        self._tracemalloc = tracemalloc
+        self.memory = memory
+        self.start = time.perf_counter()
+        self.events: List[Dict] = []
+        self.counters: Counter = Counter()
+        self.timings: Dict[str, List[float]] = {}   # name -> [calls, seconds]
+        self._peaks: List[int] = []                 # running peak of each open span
+        self._started_tracemalloc = memory and not tracemalloc.is_tracing()
+        if self._started_tracemalloc:
+            tracemalloc.start()
+
+    def _us(self, seconds: float) -> float:
+        return round((seconds - self.start) * 1e6, 1)
+
+    @contextlib.contextmanager
+    def span(self, name: str, args: Dict):
+        if self.memory:
+            self._enter_memory()
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            if self.memory:
+                args = dict(args, peak_mb=round(self._exit_memory() / 2 ** 20, 2))
+            self.events.append({'name': name, 'cat': 'stage', 'ph': 'X', 'ts': self._us(begin),
+                                'dur': round((end - begin) * 1e6, 1), 'pid': os.getpid(),
+                                'tid': threading.get_ident(), 'args': args})
+
+    def _enter_memory(self):
+        # The enclosing span keeps the peak reached so far; the new span starts from now
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], self._tracemalloc.get_traced_memory()[1])
+        self._tracemalloc.reset_peak()
+        self._peaks.append(self._tracemalloc.get_traced_memory()[0])
+
+    def _exit_memory(self) -> int:
+        peak = max(self._peaks.pop(), self._tracemalloc.get_traced_memory()[1])
+        if self._peaks:
+            self._peaks[-1] = max(self._peaks[-1], peak)
+        self._tracemalloc.reset_peak()
+        return peak
+
+    def add_time(self, name: str, seconds: float):
+        entry = self.timings.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def trace(self) -> Dict:
+        """Chrome trace-event document of the run."""
+        end = self._us(time.perf_counter())
+        pid = os.getpid()
+        events = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'args': {'name': Path(sys.argv[0]).name}}]
+        events.extend(sorted(self.events, key=lambda event: event['ts']))
+        if self.counters:
+            events.append({'name': 'counters', 'ph': 'C', 'ts': end, 'pid': pid, 'args': dict(self.counters)})
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {
+                'counters': dict(self.counters),
+                'timings': {name: {'calls': calls, 'seconds': round(seconds, 6)}
+                            for name, (calls, seconds) in self.timings.items()},
+                'peak_mb': round(self._tracemalloc.get_traced_memory()[1] / 2 ** 20, 2) if self.memory else None,
+            },
+        }
+
+    def summary(self) -> str:
+        total = time.perf_counter() - self.start
+        top = [event for event in self.events if not any(
+            other is not event and other['ts'] <= event['ts'] and
+            event['ts'] + event['dur'] <= other['ts'] + other['dur'] for other in self.events)]
+        parts = [f"{total:.2f}s"]
+        if top:
+            parts.append(', '.join(f"{event['name']} {event['dur'] / 1e6:.2f}s" for event in top))
+        if self.memory:
+            peaks = [event['args']['peak_mb'] for event in self.events]
+            parts.append(f"peak {max(peaks, default=self._tracemalloc.get_traced_memory()[1] / 2 ** 20):.1f} MB")
+        if self.timings:
+            parts.append(', '.join(f"{name} {calls}×{seconds:.2f}s"
+                                   for name, (calls, seconds) in self.timings.items()))
+        if self.counters:
+            parts.append(', '.join(f"{name}={value}" for name, value in self.counters.items()))
+        return "⏱ " + ' | '.join(parts)
+
+
+def enabled() -> bool:
+    return _active is not None
+
+
+def start(memory: bool = True) -> Recorder:
+    """Switch recording on (tracemalloc too unless ``memory`` is False)."""
+    global _active
+    _active = Recorder(memory)
+    return _active
+
+
+def span(name: str, **args):
+    """Context manager timing one phase; a no-op while recording is off."""
+    if _active is None:
+        return _NULL_SPAN
+    return _active.span(name, args)
+
+
+def count(name: str, n: int = 1):
+    if _active is not None:
+        _active.counters[name] += n
+
+
+def timed(name: Optional[str] = None) -> Callable:
+    """Decorator adding a function's calls and time to the run's timings."""
+    def decorate(fn: Callable) -> Callable:
+        label = name or fn.__name__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            recorder = _active
+            if recorder is None:
+                return fn(*args, **kwargs)
+            begin = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                recorder.add_time(label, time.perf_counter() - begin)
+        return wrapper
+    return decorate
+
+
+def finish(path: Optional[Union[str, Path]] = None) -> str:
+    """Stop recording; write the Chrome trace to ``path`` if given and return the summary line."""
+    global _active
+    recorder, _active = _active, None
+    if recorder is None:
+        return ''
+    line = recorder.summary()
+    if path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(recorder.trace(), f)
+        line += f" → {path}"
+    if recorder._started_tracemalloc:
+        recorder._tracemalloc.stop()
+    return line
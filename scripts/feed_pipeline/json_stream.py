@@ -0,0 +1,208 @@
+"""
+Streaming reader for ingredient catalogs stored as one top-level JSON array.
+
+`iter_records` yields the array's elements one at a time while reading the
+file in fixed-size chunks, so memory stays bounded by the largest record
+instead of the whole file (``json.load`` keeps the full text plus every
+parsed object alive at once). Records are decoded with the C scanner behind
+``json.JSONDecoder.raw_decode``; the slower bracket scanner only runs to find
+where a malformed record ends, so one bad record can be reported (with its
+byte offset) and skipped instead of losing the whole file.
+
+A file holding a single top-level object yields that object, matching what
+the merge scripts accepted before.
+"""
+
+import codecs
+import json
+import re
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Union
+
+CHUNK_SIZE = 1 << 20
+MAX_RECORD = 64 << 20  # characters; guards against unbalanced brackets
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_STRUCTURE = re.compile(r'["\[\]{}]')
+_STRING_END = re.compile(r'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_SCALAR_END = re.compile(r'[,\]\s]')
+_NUMBER_TAIL = re.compile(r'[0-9eE+\-.]*')
+
+
+class RecordError(ValueError):
+    """A record (or the array around it) that could not be decoded."""
+
+    def __init__(self, path, index: int, offset: int, msg: str):
+        super().__init__(f"{Path(path).name}: record {index} at byte {offset}: {msg}")
+        self.path = str(path)
+        self.index = index
+        self.offset = offset
+        self.msg = msg
+
+
+class _Buffer:
+    """Decoded text window over a binary file, tracking byte offsets."""
+
+    def __init__(self, f, chunk_size: int):
+        self._file = f
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+        self.text = ''
+        self.pos = 0
+        self.base = 0  # byte offset of text[0]
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; False once the file is exhausted."""
+        if self.eof:
+            return False
+        data = self._file.read(self._chunk_size)
+        if not data:
+            self.eof = True
+            self.text += self._decoder.decode(b'', final=True)
+            return False
+        if self.pos > self._chunk_size:
+            self.base += len(self.text[:self.pos].encode('utf-8'))
+            self.text = self.text[self.pos:]
+            self.pos = 0
+        self.text += self._decoder.decode(data)
+        return True
+
+    def offset(self, pos: Optional[int] = None) -> int:
+        """Byte offset of text position ``pos`` (default: current)."""
+        pos = self.pos if pos is None else pos
+        return self.base + len(self.text[:pos].encode('utf-8'))
+
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.text, self.pos).end()
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                return ''
+
+    def value_end(self, limit: int) -> Optional[int]:
+        """
+        End position of the JSON value starting at ``pos`` judged by
+        brackets and strings alone (no validation), reading more input as
+        needed. None if the file ends, or the value grows past ``limit``
+        characters, first.
+        """
+        resume, depth = 0, 0
+        while True:
+            end, resume, depth = _scan_value(self.text, self.pos, resume, depth)
+            if end is not None:
+                return end
+            if resume > limit or not self.fill():
+                return None
+
+
+def _scan_value(text: str, start: int, resume: int, depth: int):
+    """
+    Scan the value at ``start`` for its bracket-balanced end.
+
+    Returns (end, resume, depth); end is None when the text runs out, and
+    scanning continues from ``start + resume`` at ``depth`` once more text
+    has been appended.
+    """
+    if text[start] not in '[{"':
+        found = _SCALAR_END.search(text, start)
+        return (found.start() if found else None), 0, 0
+    pos = start + resume
+    while True:
+        found = _STRUCTURE.search(text, pos)
+        if not found:
+            return None, len(text) - start, depth
+        ch = found.group()
+        if ch == '"':
+            string = _STRING_END.match(text, found.end())
+            if not string:
+                return None, found.start() - start, depth
+            pos = string.end()
+            if depth == 0:
+                return pos, 0, 0
+            continue
+        pos = found.end()
+        depth += 1 if ch in '[{' else -1
+        if depth == 0:
+            return pos, 0, 0
+
+
+def iter_records(path: Union[str, Path], errors: Optional[List[RecordError]] = None,
+                 chunk_size: int = CHUNK_SIZE, max_record: int = MAX_RECORD) -> Iterator[Any]:
+    """
+    Yield the elements of the top-level JSON array in ``path``.
+
+    A malformed element is appended to ``errors`` as a RecordError and
+    skipped; without an ``errors`` list it is raised. Damage that leaves no
+    way to find the next element (unbalanced brackets, missing commas, a
+    record longer than ``max_record`` characters) always raises, after every
+    element before it has been yielded.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'rb') as f:
+        buf = _Buffer(f, chunk_size)
+        first = buf.peek()
+        if first == '{':
+            end = buf.value_end(max_record)
+            if end is None:
+                raise RecordError(path, 0, buf.offset(), "unterminated object")
+            try:
+                record = decoder.decode(buf.text[buf.pos:end])
+            except json.JSONDecodeError as e:
+                raise RecordError(path, 0, buf.offset(),
+                                  f"{e.msg} (byte {buf.offset(buf.pos + e.pos)})") from None
+            yield record
+            return
+        if first != '[':
+            raise RecordError(path, 0, buf.offset(), "expected a JSON array")
+        buf.pos += 1
+        if buf.peek() == ']':
+            return
+
+        index = 0
+        while True:
+            if not buf.peek():
+                raise RecordError(path, index, buf.offset(), "unterminated array")
+            try:
+                record, end = decoder.raw_decode(buf.text, buf.pos)
+                if _NUMBER_TAIL.fullmatch(buf.text, end) and buf.fill():
+                    continue  # a number may continue in the next chunk
+                valid = True
+            except ValueError:
+                # Either the record runs past the buffered text or it is
+                # malformed: find its extent, then decode it as a whole.
+                end = buf.value_end(max_record)
+                if end is None:
+                    raise RecordError(path, index, buf.offset(), "unterminated record") from None
+                try:
+                    record = decoder.decode(buf.text[buf.pos:end])
+                    valid = True
+                except json.JSONDecodeError as e:
+                    error = RecordError(path, index, buf.offset(),
+                                        f"{e.msg} (byte {buf.offset(buf.pos + e.pos)})")
+                    if errors is None:
+                        raise error from None
+                    errors.append(error)
+                    valid = False
+            if valid:
+                yield record
+            buf.pos = end
+            index += 1
+
+            separator = buf.peek()
+            if separator == ',':
+                buf.pos += 1
+            elif separator == ']':
+                buf.pos += 1
+                if buf.peek():
+                    raise RecordError(path, index, buf.offset(), "data after the top-level array")
+                return
+            else:
+                raise RecordError(path, index, buf.offset(), "expected ',' or ']' between records")
+
+
+def load_records(path: Union[str, Path], errors: Optional[List[RecordError]] = None) -> List[Any]:
+    """All records of ``path`` as a list (streamed, skipping bad records)."""
+    return list(iter_records(path, errors))
@@ -0,0 +1,320 @@
+"""
+Small dense linear programs for least-cost formulation.
+
+A `LinearProgram` is::
+
+    minimize    cost . x
+    subject to  row_lo[i] <= rows[i] . x <= row_hi[i]
+                lo[j] <= x[j] <= hi[j]
+
+Ration problems have a few hundred bounded variables (ingredients) and a
+handful of rows (the 100% row plus one per nutrient), so `solve_simplex`
+keeps every range row as one equality with a bounded slack and every bound
+as a bound rather than a constraint row: the tableau stays a few rows deep
+whatever the number of ingredients. It is pure Python; when SciPy is
+installed `solve_highs` hands the same problem to HiGHS. `solve` picks
+HiGHS when available.
+"""
+
+import math
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence
+
+try:
+    from scipy.optimize import linprog
+except ImportError:  # optional dependency
+    linprog = None
+
+INF = math.inf
+EPSILON = 1e-9
+FEASIBILITY_TOLERANCE = 1e-7
+
+OPTIMAL, INFEASIBLE, UNBOUNDED, ITERATION_LIMIT = 'optimal', 'infeasible', 'unbounded', 'iteration_limit'
+
+
+class LinearProgram(NamedTuple):
+    cost: Sequence[float]
+    rows: Sequence[Sequence[float]]
+    row_lo: Sequence[float]   # -INF for no lower limit
+    row_hi: Sequence[float]   # INF for no upper limit
+    lo: Sequence[float]       # finite
+    hi: Sequence[float]       # INF for no upper bound
+
+
+class LPSolution(NamedTuple):
+    status: str
+    x: List[float]            # empty unless optimal
+    objective: float
+
+
+class Sensitivity(NamedTuple):
+    """Duals and cost ranges of an optimal basis."""
+    row_duals: List[float]    # per row: objective change per unit increase of its binding limit (0 if slack)
+    cost_lo: List[float]      # per variable: the basis stays optimal for costs in [cost_lo, cost_hi]
+    cost_hi: List[float]
+
+
+def _failed(status: str) -> LPSolution:
+    return LPSolution(status, [], INF)
+
+
+class BoundedSimplex:
+    """
+    Two-phase primal simplex with bounded variables.
+
+    Row i becomes ``rows[i] . x - s_i = 0`` with ``row_lo[i] <= s_i <= row_hi[i]``;
+    nonbasic variables sit at either bound and may flip between them without
+    a pivot. Phase 1 starts from one artificial per row.
+
+    The tableau outlives a solve: only the cost changes between price
+    scenarios, so the last optimal basis stays feasible and `reoptimize`
+    restarts phase 2 from it (a warm start) instead of from scratch.
+    """
+
+    def __init__(self, lp: LinearProgram, max_iterations: int = 5000):
+        self.lp = lp
+        self.max_iterations = max_iterations
+        # Rows without limits never bind; drop them
+        limited = [i for i in range(len(lp.rows)) if lp.row_lo[i] != -INF or lp.row_hi[i] != INF]
+        rows = [lp.rows[i] for i in limited]
+        n, m = len(lp.cost), len(rows)
+        self.n, self.m = n, m
+        self.row_index = limited
+        # Columns: structural, slack, artificial, each shifted to lower bound 0.
+        # A row with only an upper limit gets slack -s so its lower bound is finite.
+        slack_sign, lo, hi = [], list(lp.lo), list(lp.hi)
+        for i in limited:
+            if lp.row_lo[i] != -INF:
+                slack_sign.append(-1.0)
+                lo.append(lp.row_lo[i])
+                hi.append(lp.row_hi[i])
+            else:
+                slack_sign.append(1.0)
+                lo.append(-lp.row_hi[i])
+                hi.append(INF)
+        self.slack_sign = slack_sign
+        self.upper = [h - l for h, l in zip(hi, lo)] + [INF] * m
+
+        self.tableau: List[List[float]] = []
+        self.values: List[float] = []  # of the basic variables
+        for i, row in enumerate(rows):
+            # Residual with every shifted variable at 0: -(row . lo) - slack_sign * slack_lo
+            residual = -sum(a * l for a, l in zip(row, lp.lo)) - slack_sign[i] * lo[n + i]
+            sign = 1.0 if residual >= 0 else -1.0
+            line = [sign * a for a in row] + [0.0] * (2 * m)
+            line[n + i] = sign * slack_sign[i]
+            line[n + m + i] = 1.0
+            self.tableau.append(line)
+            self.values.append(sign * residual)
+        self.basis = list(range(n + m, n + 2 * m))
+        self.at_upper = [False] * (n + 2 * m)
+        self.feasible: Optional[bool] = None  # unknown until phase 1 has run
+        self.iterations = 0
+        self._cost: Optional[List[float]] = None  # objective and reduced costs of the last optimum
+        self._reduced: Optional[List[float]] = None
+
+    def _reduced_costs(self, cost: Sequence[float]) -> List[float]:
+        d = list(cost)
+        for line, b in zip(self.tableau, self.basis):
+            cb = cost[b]
+            if cb:
+                d = [dj - cb * a for dj, a in zip(d, line)]
+        return d
+
+    def _iterate(self, d: List[float]) -> str:
+        tableau, values, basis, at_upper, upper = self.tableau, self.values, self.basis, self.at_upper, self.upper
+        allowed = self.n + self.m  # artificials never enter
+        iterations = 0
+        degenerate = 0
+        while True:
+            # Entering variable: Dantzig's rule, Bland's after a run of degenerate pivots
+            enter, best = -1, EPSILON
+            bland = degenerate > 50
+            for j in range(allowed):
+                dj = d[j]
+                gain = dj if at_upper[j] else -dj
+                if gain > best:
+                    enter, best = j, gain
+                    if bland:
+                        break
+            if enter < 0:
+                return OPTIMAL
+            iterations += 1
+            self.iterations += 1
+            if iterations > self.max_iterations:
+                return ITERATION_LIMIT
+            direction = -1.0 if at_upper[enter] else 1.0
+
+            # Ratio test, including the entering variable's own bound flip
+            step, leave, leave_to_upper = upper[enter], -1, False
+            for i, line in enumerate(tableau):
+                alpha = direction * line[enter]
+                if alpha > EPSILON:
+                    ratio = values[i] / alpha
+                    if ratio < step - EPSILON or (leave < 0 and ratio < step):
+                        step, leave, leave_to_upper = ratio, i, False
+                elif alpha < -EPSILON and upper[basis[i]] != INF:
+                    ratio = (upper[basis[i]] - values[i]) / -alpha
+                    if ratio < step - EPSILON or (leave < 0 and ratio < step):
+                        step, leave, leave_to_upper = ratio, i, True
+            if step == INF:
+                return UNBOUNDED
+            step = max(step, 0.0)
+            degenerate = degenerate + 1 if step <= EPSILON else 0
+
+            for i, line in enumerate(tableau):
+                values[i] -= step * direction * line[enter]
+            if leave < 0:
+                at_upper[enter] = not at_upper[enter]
+                continue
+
+            pivot_line = tableau[leave]
+            pivot = pivot_line[enter]
+            pivot_line = tableau[leave] = [a / pivot for a in pivot_line]
+            for i, line in enumerate(tableau):
+                factor = line[enter]
+                if i != leave and factor:
+                    tableau[i] = [a - factor * p for a, p in zip(line, pivot_line)]
+            factor = d[enter]
+            d[:] = [dj - factor * p for dj, p in zip(d, pivot_line)]
+
+            leaving = basis[leave]
+            at_upper[leaving] = leave_to_upper
+            values[leave] = upper[enter] - step if at_upper[enter] else step
+            at_upper[enter] = False
+            basis[leave] = enter
+
+    def _phase_one(self) -> str:
+        """Drive the artificials to zero; afterwards they stay fixed at 0."""
+        n, m = self.n, self.m
+        status = self._iterate(self._reduced_costs([0.0] * (n + m) + [1.0] * m))
+        if status != OPTIMAL:
+            self.feasible = False
+            return status
+        infeasibility = sum(v for v, b in zip(self.values, self.basis) if b >= n + m)
+        self.feasible = infeasibility <= FEASIBILITY_TOLERANCE
+        self.upper[n + m:] = [0.0] * m
+        return OPTIMAL if self.feasible else INFEASIBLE
+
+    def solution(self) -> List[float]:
+        """Current value of every structural variable."""
+        shifted = [self.upper[j] if self.at_upper[j] else 0.0 for j in range(self.n)]
+        for v, b in zip(self.values, self.basis):
+            if b < self.n:
+                shifted[b] = v
+        return [l + v for l, v in zip(self.lp.lo, shifted)]
+
+    def reoptimize(self, cost: Optional[Sequence[float]] = None) -> LPSolution:
+        """
+        Minimize ``cost`` (the program's own by default) starting from the
+        current basis; runs phase 1 first if it has not run yet.
+        """
+        if self.feasible is None:
+            status = self._phase_one()
+            if status != OPTIMAL:
+                return _failed(status)
+        elif not self.feasible:
+            return _failed(INFEASIBLE)
+        cost = list(self.lp.cost if cost is None else cost)
+        self._cost = self._reduced = None
+        reduced = self._reduced_costs(cost + [0.0] * (2 * self.m))
+        status = self._iterate(reduced)
+        if status != OPTIMAL:
+            return _failed(status)
+        self._cost, self._reduced = cost, reduced
+        x = self.solution()
+        return LPSolution(OPTIMAL, x, sum(c * v for c, v in zip(cost, x)))
+
+    def sensitivity(self) -> Sensitivity:
+        """
+        Row duals and cost ranging at the last optimum, read off the final
+        tableau (no re-solves).
+
+        A row's dual is the reduced cost of its slack, signed as the change
+        in objective per unit increase of whichever limit binds. A variable
+        off the optimal basis keeps its bound while its cost stays on the
+        right side of ``cost - reduced cost``; for a basic variable the range
+        is how far its cost can move before some nonbasic reduced cost
+        changes sign.
+        """
+        if self._reduced is None:
+            raise ValueError("sensitivity needs an optimal solve first")
+        n, m, d = self.n, self.m, self._reduced
+        basic_row = {b: i for i, b in enumerate(self.basis)}
+
+        row_duals = [0.0] * len(self.lp.rows)
+        for i, row in enumerate(self.row_index):
+            column = n + i
+            if column in basic_row:
+                continue
+            # Slack -s of an upper-only row: raising the limit lowers its lower bound
+            row_duals[row] = -d[column] if self.slack_sign[i] > 0 else d[column]
+
+        movable = [k for k in range(n + m) if k not in basic_row and self.upper[k] > 0]
+        cost_lo, cost_hi = [], []
+        for j in range(n):
+            c = self._cost[j]
+            if j not in basic_row:
+                if self.upper[j] == 0:  # fixed: any cost
+                    cost_lo.append(-INF)
+                    cost_hi.append(INF)
+                elif self.at_upper[j]:
+                    cost_lo.append(-INF)
+                    cost_hi.append(c - d[j])
+                else:
+                    cost_lo.append(c - d[j])
+                    cost_hi.append(INF)
+                continue
+            # Raising c_j by delta changes nonbasic reduced costs by -delta * T[r][k]
+            line = self.tableau[basic_row[j]]
+            low, high = -INF, INF
+            for k in movable:
+                alpha = line[k]
+                if -EPSILON < alpha < EPSILON:
+                    continue
+                limit = d[k] / alpha
+                # at lower d_k - delta*alpha must stay >= 0, at upper <= 0
+                if (alpha > 0) != self.at_upper[k]:
+                    high = min(high, limit)
+                else:
+                    low = max(low, limit)
+            cost_lo.append(c + low)
+            cost_hi.append(c + high)
+        return Sensitivity(row_duals, cost_lo, cost_hi)
+
+
+def solve_simplex(lp: LinearProgram, max_iterations: int = 5000) -> LPSolution:
+    """Cold solve with `BoundedSimplex`."""
+    return BoundedSimplex(lp, max_iterations).reoptimize()
+
+
+def solve_highs(lp: LinearProgram) -> LPSolution:
+    """Solve with SciPy's HiGHS interface (requires scipy)."""
+    if linprog is None:
+        raise RuntimeError("scipy is not installed; use solve_simplex")
+    a_ub, b_ub = [], []
+    for row, row_lo, row_hi in zip(lp.rows, lp.row_lo, lp.row_hi):
+        if row_hi != INF:
+            a_ub.append(list(row))
+            b_ub.append(row_hi)
+        if row_lo != -INF:
+            a_ub.append([-a for a in row])
+            b_ub.append(-row_lo)
+    bounds = [(l, None if h == INF else h) for l, h in zip(lp.lo, lp.hi)]
+    result = linprog(lp.cost, A_ub=a_ub or None, b_ub=b_ub or None, bounds=bounds, method='highs')
+    if result.status == 0:
+        return LPSolution(OPTIMAL, list(result.x), float(result.fun))
+    return _failed({1: ITERATION_LIMIT, 2: INFEASIBLE, 3: UNBOUNDED}.get(result.status, INFEASIBLE))
+
+
+SOLVERS: Dict[str, Callable[[LinearProgram], LPSolution]] = {
+    'simplex': solve_simplex,
+    'highs': solve_highs,
+}
+
+
+def default_solver() -> str:
+    return 'highs' if linprog is not None else 'simplex'
+
+
+def solve(lp: LinearProgram, solver: Optional[str] = None) -> LPSolution:
+    return SOLVERS[solver or default_solver()](lp)
@@ -0,0 +1,64 @@
+"""
+File layout shared by the memory-mapped build caches (the FECOLS01 column
+stores of `feed_pipeline.columnar` and the FENMAT01 nutrient matrices of
+`feed_pipeline.nutrient_matrix`)::
+
+    8-byte magic | u32 header length | JSON header | sections
+
+Sections start at the header's ``data_start``, each at an 8-byte aligned
+offset from it, so a reader can cast them to arrays in place. The header
+records those offsets, so the writer lays sections out relative to the data
+start first and places the data start once the header is sized, with 64
+bytes of slack for the ``data_start`` field itself.
+"""
+
+import json
+import struct
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Union
+
+from feed_pipeline.paths import atomic_write
+
+_LENGTH = struct.Struct('<I')
+_SLACK = 64
+
+
+def align(n: int) -> int:
+    return (n + 7) & ~7
+
+
+def section_offsets(sections: Sequence[bytes]) -> List[int]:
+    """Offset of each section from the data start, in order."""
+    offsets, position = [], 0
+    for section in sections:
+        offsets.append(position)
+        position = align(position + len(section))
+    return offsets
+
+
+def write_mapped(path: Union[str, Path], magic: bytes, header: Dict, sections: Sequence[bytes]):
+    """
+    Write ``header`` (its ``data_start`` filled in) and ``sections``, at
+    their `section_offsets`, to ``path``.
+    """
+    encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    data_start = align(len(magic) + _LENGTH.size + len(encoded) + _SLACK)
+    header['data_start'] = data_start
+    encoded = json.dumps(header, separators=(',', ':')).encode('utf-8')
+    if len(magic) + _LENGTH.size + len(encoded) > data_start:
+        raise ValueError(f"{Path(path).name}: header outgrew its reserved space")
+
+    out = bytearray(magic + _LENGTH.pack(len(encoded)) + encoded)
+    for offset, section in zip(section_offsets(sections), sections):
+        out += b'\0' * (data_start + offset - len(out))
+        out += section
+    atomic_write(path, out)
+
+
+def read_header(buffer, magic: bytes) -> Optional[Dict]:
+    """Header of a file mapped into ``buffer``, or None if it lacks ``magic``."""
+    if buffer[:len(magic)] != magic:
+        return None
+    (length,) = _LENGTH.unpack_from(buffer, len(magic))
+    start = len(magic) + _LENGTH.size
+    return json.loads(buffer[start:start + length])
@@ -0,0 +1,190 @@
+"""
+Candidate index for fuzzy ingredient-name deduplication.
+
+`IngredientMerger.find_duplicate` accepts a match when
+``SequenceMatcher(None, new, existing).ratio() >= threshold``. Running that
+alignment against every merged record is O(n²). This index only hands the
+exact check the records that can still reach the threshold, so it never
+changes a merge decision:
+
+- ``ratio = 2*M / T`` (``T`` = combined length), so a match needs
+  ``M >= threshold * T / 2`` matched characters and the lengths must satisfy
+  ``2 * min(len) / T >= threshold``.
+- Matched characters are shared characters, so (as in `quick_ratio`) the
+  names must share at least ``ceil(threshold * T / 2)`` characters, counted
+  with multiplicity. Put the other way round, the new name may lack at most
+  ``len - ceil(threshold * T / 2)`` of its characters in the other name.
+
+The index is length-banded: one bitmask (a Python int, one bit per indexed
+name) per name length and one per occurrence-numbered character (``('a', 2)``
+is "has a second 'a'"). A lookup counts, for every indexed name at once, how
+many of the new name's characters it lacks: a bit-sliced counter that
+saturates just above the largest allowance, updated with a few bitwise
+operations per character. Names within the allowance for their length are
+the candidates; they are checked in merged-list order with the exact
+`ratio`, so the first accepted key is the record a linear scan would have
+returned.
+
+Complexity: a lookup does a fixed number of bitwise operations per character
+of the new name and a candidate set bounded by the names that pass the
+character bound, which stays below one per lookup on the synthetic catalogs
+of scripts/benchmarks/bench_name_index.py (about 0.3 at 1k records, 0.5 at
+100k). Each bitwise operation runs in C over one bit per indexed name, so a
+deduplication of those catalogs grows 10-13x per 10x records from 1k to 10k
+records and 15-20x from 10k to 100k, where the passes over the bitmasks start
+to dominate. Posting lists keyed on rare prefix grams cannot be bounded
+without missing matches here: names built from the same small vocabulary
+share their rare grams, and capping the lists changed merge decisions.
+"""
+
+import math
+from collections import defaultdict
+from difflib import SequenceMatcher
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_EPS = 1e-9
+
+
+@lru_cache(maxsize=None)
+def _partner_lengths(threshold: float, length: int) -> range:
+    """Name lengths that can reach ``threshold`` against ``length``."""
+    shortest = max(1, math.ceil(length * threshold / (2 - threshold) - _EPS))
+    longest = math.floor(length * (2 - threshold) / threshold + _EPS)
+    return range(shortest, longest + 1)
+
+
+@lru_cache(maxsize=None)
+def _shared_chars(threshold: float, len1: int, len2: int) -> int:
+    """Characters two names of these lengths must share to match."""
+    return math.ceil(threshold * (len1 + len2) / 2 - _EPS)
+
+
+class NameCandidateIndex:
+    """Length and character bitmasks over normalized names."""
+
+    def __init__(self, threshold: float = 0.85):
+        self.threshold = threshold
+        self._holders: Dict[Tuple[str, int], int] = defaultdict(int)  # character -> names having it
+        self._lengths: Dict[int, int] = defaultdict(int)  # length -> names of that length
+        self._keys: List[Optional[int]] = []  # bit -> key (None once removed)
+        self._bits: Dict[int, int] = {}  # key -> bit
+        self._matchers: Dict[int, SequenceMatcher] = {}
+        self._resolved: Dict[str, int] = {}  # names already looked up -> first match
+        self._last = -1  # largest key added
+        self.comparisons = 0
+
+    def __len__(self) -> int:
+        return len(self._matchers)
+
+    @staticmethod
+    def _numbered(tokens: Sequence[str]) -> List[Tuple[str, int]]:
+        """Tokens numbered by occurrence, so repeats stay distinct."""
+        seen: Dict[str, int] = {}
+        numbered = []
+        for token in tokens:
+            count = seen.get(token, 0) + 1
+            seen[token] = count
+            numbered.append((token, count))
+        return numbered
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+
+    def add(self, key: int, normalized_name: str):
+        """Index a record under ``key`` (its position in the merged list)."""
+        if not normalized_name:
+            return
+        if key < self._last:
+            # An earlier key can now be the first match of a looked-up name
+            self._resolved.clear()
+        self._last = max(self._last, key)
+        bit = 1 << len(self._keys)
+        self._keys.append(key)
+        self._bits[key] = bit
+        self._matchers[key] = SequenceMatcher(None, "", normalized_name)
+        for char in self._numbered(normalized_name):
+            self._holders[char] |= bit
+        self._lengths[len(normalized_name)] |= bit
+
+    def remove(self, key: int):
+        """Drop a record, e.g. before re-adding it under a new name."""
+        matcher = self._matchers.pop(key, None)
+        if matcher is None:
+            return
+        bit = self._bits.pop(key)
+        self._keys[bit.bit_length() - 1] = None
+        self._resolved.clear()
+        for char in self._numbered(matcher.b):
+            self._holders[char] &= ~bit
+        self._lengths[len(matcher.b)] &= ~bit
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def candidates(self, normalized_name: str) -> List[int]:
+        """Keys that could reach the threshold, in ascending order."""
+        if not normalized_name:
+            return []
+        length = len(normalized_name)
+        # Names by how many of our characters they may lack
+        allowed: Dict[int, int] = defaultdict(int)
+        for other in _partner_lengths(self.threshold, length):
+            names = self._lengths.get(other)
+            if names:
+                allowed[length - _shared_chars(self.threshold, length, other)] |= names
+        if not allowed:
+            return []
+        everyone = 0
+        for names in allowed.values():
+            everyone |= names
+
+        # Missing-character count per name, bit-sliced; `over` saturates
+        width = (max(allowed) + 1).bit_length()
+        planes = [0] * width
+        over = 0
+        for char in self._numbered(normalized_name):
+            carry = everyone & ~self._holders.get(char, 0)
+            for p in range(width):
+                if not carry:
+                    break
+                planes[p], carry = planes[p] ^ carry, planes[p] & carry
+            over |= carry
+
+        found = 0
+        for most, names in allowed.items():
+            # names whose count is below most + 1, compared from the top plane
+            limit = most + 1
+            below, equal = 0, names & ~over
+            for p in reversed(range(width)):
+                if limit >> p & 1:
+                    below |= equal & ~planes[p]
+                    equal &= planes[p]
+                else:
+                    equal &= ~planes[p]
+            found |= below
+
+        keys = []
+        while found:
+            low = found & -found
+            keys.append(self._keys[low.bit_length() - 1])
+            found ^= low
+        keys.sort()
+        return keys
+
+    def find(self, normalized_name: str) -> Optional[int]:
+        """First key whose name matches at ``threshold``, or None."""
+        if not normalized_name:
+            return None
+        if normalized_name in self._resolved:
+            return self._resolved[normalized_name]
+        for key in self.candidates(normalized_name):
+            self.comparisons += 1
+            matcher = self._matchers[key]
+            matcher.set_seq1(normalized_name)
+            if matcher.ratio() >= self.threshold:
+                self._resolved[normalized_name] = key
+                return key
+        return None
@@ -0,0 +1,75 @@
+"""
+Hash buckets for standards-based duplicate lookup.
+
+`StandardizedIngredientMerger.find_duplicate` only merges records whose
+``standardized_name`` is identical and whose nutrient profiles are within
+``nutrient_thresholds``. Instead of walking the whole merged list, records
+are bucketed by standardized name and each bucket keeps one column per
+threshold nutrient, so a lookup is a dict hit plus one column-wise pass over
+that bucket.
+"""
+
+from typing import Dict, List, Optional
+
+from feed_pipeline import instrument
+
+
+def _nutrient(record: Dict, nutrient: str) -> float:
+    """Nutrient value as `should_separate_by_nutrients` reads it."""
+    return record.get(nutrient, 0) or 0
+
+
+class StandardNameBuckets:
+    """Merged-list positions grouped by standardized name."""
+
+    def __init__(self, thresholds: Dict[str, float]):
+        self.thresholds = thresholds
+        self._keys: Dict[str, List[int]] = {}
+        self._columns: Dict[str, Dict[str, List[float]]] = {}
+        self._slots: Dict[int, tuple] = {}  # key -> (name, row in bucket)
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def add(self, key: int, record: Dict):
+        """Register a newly appended merged record."""
+        name = record.get('standardized_name', '')
+        keys = self._keys.setdefault(name, [])
+        columns = self._columns.setdefault(name, {n: [] for n in self.thresholds})
+        self._slots[key] = (name, len(keys))
+        keys.append(key)
+        for nutrient, column in columns.items():
+            column.append(_nutrient(record, nutrient))
+
+    def update(self, key: int, record: Dict):
+        """Refresh a bucket row after the record at ``key`` was merged into."""
+        name, row = self._slots[key]
+        if record.get('standardized_name', '') != name:
+            raise ValueError(f"standardized_name of record {key} changed during merge")
+        for nutrient, column in self._columns[name].items():
+            column[row] = _nutrient(record, nutrient)
+
+    def find(self, record: Dict) -> Optional[int]:
+        """
+        First key with the same standardized name that is not kept separate
+        by the nutrient thresholds, or None.
+        """
+        name = record.get('standardized_name', '')
+        keys = self._keys.get(name)
+        if not keys:
+            return None
+
+        instrument.count("candidate_comparisons", len(keys))
+        separate = [False] * len(keys)
+        for nutrient, threshold in self.thresholds.items():
+            val = _nutrient(record, nutrient)
+            for row, other in enumerate(self._columns[name][nutrient]):
+                # Same rule as should_separate_by_nutrients: ignore pairs
+                # that are both zero or average to zero.
+                if (val + other) and abs(val - other) > threshold:
+                    separate[row] = True
+
+        for key, apart in zip(keys, separate):
+            if not apart:
+                return key
+        return None
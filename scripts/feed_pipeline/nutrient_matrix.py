@@ -0,0 +1,199 @@
+"""
+Dense float32 nutrient matrix of an ingredient catalog, for the formulator.
+
+The formulator (FeedFormulatorEngine in the app, `IngredientMatrix` here)
+derives the same numbers from every parsed ingredient on every run: price,
+nutrient coefficients in the requirement's unit, the species energy field
+(`_energyValue`) and the inclusion cap per animal class and feed type.
+`build_matrix` writes them once:
+- values: row-major ingredient x VALUE_COLUMNS float32 matrix (price, the
+  five fixed nutrients, one energy column per species)
+- bounds: row-major ingredient x inclusion key float32 matrix of upper
+  bounds as a fraction of the ration (inf when uncapped), plus a
+  ``default`` column for feed types without a key of their own
+
+The header carries the ingredient ids (row index), the column names, which
+energy column each animal class uses, and the size and SHA-256 of the JSON
+the matrix was built from, so a reader can tell whether the two belong
+together. `NutrientMatrix` maps the file read-only and plugs into
+`IngredientMatrix.program`, so rations can be solved without the JSON.
+
+File layout (`feed_pipeline.mapped_file`, sections 8-byte aligned,
+little-endian)::
+
+    b'FENMAT01' | u32 header length | JSON header | values | bounds
+"""
+
+import hashlib
+import json
+import mmap
+import sys
+from array import array
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from feed_pipeline.formulation import (
+    ENERGY_FIELDS, NUTRIENTS, IngredientMatrix, energy_value, inclusion_key, max_inclusion_pct, nutrient_value,
+)
+from feed_pipeline.lp import INF
+from feed_pipeline.mapped_file import read_header, section_offsets, write_mapped
+from feed_pipeline.paths import CACHE_DIR
+
+MAGIC = b'FENMAT01'
+FORMAT_VERSION = 1
+
+DEFAULT_BOUND = 'default'
+
+# One energy column per distinct ENERGY_FIELDS entry, named after its first field
+ENERGY_COLUMNS = {animal_type_id: f"energy.{fields[0]}" for animal_type_id, fields in ENERGY_FIELDS.items()}
+VALUE_COLUMNS = (('price',) + tuple(key for key in NUTRIENTS if key != 'energy')
+                 + tuple(dict.fromkeys(ENERGY_COLUMNS.values())))
+
+
+def _float32(values) -> bytes:
+    column = array('f', values)
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column.tobytes()
+
+
+def _source_stamp(name: str, data: bytes) -> Dict:
+    return {'name': name, 'size': len(data), 'sha256': hashlib.sha256(data).hexdigest()}
+
+
+def matrix_path_for(json_path: Union[str, Path]) -> Path:
+    """Default location of the matrix built from ``json_path`` (build cache)."""
+    return CACHE_DIR / f"{Path(json_path).name}.f32"
+
+
+def build_matrix(json_path: Union[str, Path], matrix_path: Optional[Union[str, Path]] = None,
+                 id_field: str = 'ingredient_id') -> Path:
+    """
+    Write the float32 matrix of a JSON ingredient catalog. The checksum is
+    taken over the exact bytes parsed, so the matrix cannot describe any
+    other version of the file.
+    """
+    json_path = Path(json_path)
+    matrix_path = Path(matrix_path) if matrix_path else matrix_path_for(json_path)
+    data = json_path.read_bytes()
+    source = IngredientMatrix(json.loads(data), id_field)
+
+    species = {column: animal_type_id for animal_type_id, column in reversed(ENERGY_COLUMNS.items())}
+    values = []
+    for j, record in enumerate(source.records):
+        values.append(source.prices[j])
+        values.extend(nutrient_value(record, key, 0) for key in NUTRIENTS if key != 'energy')
+        values.extend(energy_value(record, species[column]) for column in VALUE_COLUMNS if column in species)
+
+    keys = sorted({key for record in source.records if isinstance(record.get('max_inclusion_pct'), dict)
+                   for key in record['max_inclusion_pct']})
+    bounds = []
+    for record in source.records:
+        caps = record.get('max_inclusion_pct')
+        for key in keys + [DEFAULT_BOUND]:
+            # the cap max_inclusion_pct resolves for this key (premix fallback included)
+            scalar = {'name': record.get('name'), 'max_inclusion_pct': caps.get(key) if isinstance(caps, dict) else caps}
+            cap = max_inclusion_pct(scalar, 0, None)
+            bounds.append(cap / 100 if cap is not None and cap > 0 else INF)
+
+    sections = {'values': _float32(values), 'bounds': _float32(bounds)}
+    layout = dict(zip(sections, section_offsets(list(sections.values()))))
+
+    header = {
+        'version': FORMAT_VERSION,
+        'byteorder': 'little',
+        'dtype': 'float32',
+        'rows': len(source),
+        'ids': source.ids,
+        'columns': list(VALUE_COLUMNS),
+        'energy': {str(animal_type_id): column for animal_type_id, column in ENERGY_COLUMNS.items()},
+        'bounds': keys + [DEFAULT_BOUND],
+        'sections': layout,
+        'source': _source_stamp(json_path.name, data),
+    }
+    write_mapped(matrix_path, MAGIC, header, list(sections.values()))
+    return matrix_path
+
+
+class NutrientMatrix(IngredientMatrix):
+    """
+    A memory-mapped matrix written by `build_matrix`, usable wherever an
+    `IngredientMatrix` is (``program``, ``formulate``, the batch solvers).
+    ``records`` is empty: names and other fields stay in the JSON.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        if sys.byteorder != 'little':
+            raise ValueError(f"{self.path}: float32 matrices are read on little-endian hosts only")
+        with open(self.path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.header = read_header(self._mmap, MAGIC)
+        if self.header is None:
+            self._mmap.close()
+            raise ValueError(f"{self.path} is not a nutrient matrix")
+        if self.header.get('version') != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{self.path} was written by an incompatible version")
+        rows = self.header['rows']
+        base = self.header['data_start']
+        view = memoryview(self._mmap)
+        offset = base + self.header['sections']['values']
+        self.values = view[offset:offset + 4 * rows * len(self.header['columns'])].cast('f')
+        offset = base + self.header['sections']['bounds']
+        self.bounds = view[offset:offset + 4 * rows * len(self.header['bounds'])].cast('f')
+
+        self.records = []
+        self.ids = self.header['ids']
+        self.prices = self.column('price')
+        self._position = {ingredient_id: j for j, ingredient_id in enumerate(self.ids)}
+        self._nutrients: Dict[int, List[List[float]]] = {}
+        self._caps: Dict[tuple, List[float]] = {}
+
+    def __getstate__(self):
+        return self.path
+
+    def __setstate__(self, path):
+        self.__init__(path)
+
+    def __len__(self) -> int:
+        return self.header['rows']
+
+    def column(self, name: str) -> List[float]:
+        """One value column (see VALUE_COLUMNS) as floats, in row order."""
+        width = len(self.header['columns'])
+        return self.values[self.header['columns'].index(name)::width].tolist()
+
+    def nutrient_rows(self, animal_type_id: int) -> List[List[float]]:
+        rows = self._nutrients.get(animal_type_id)
+        if rows is None:
+            energy = self.header['energy'].get(str(animal_type_id))
+            rows = self._nutrients[animal_type_id] = [
+                (self.column(energy) if energy else [0.0] * len(self)) if key == 'energy' else self.column(key)
+                for key in NUTRIENTS
+            ]
+        return rows
+
+    def caps(self, animal_type_id: int, feed_type: str) -> List[float]:
+        key = (animal_type_id, feed_type)
+        caps = self._caps.get(key)
+        if caps is None:
+            names = self.header['bounds']
+            name = inclusion_key(animal_type_id, feed_type)
+            index = names.index(name) if name in names else names.index(DEFAULT_BOUND)
+            caps = self._caps[key] = self.bounds[index::len(names)].tolist()
+        return caps
+
+    def matches(self, json_path: Union[str, Path]) -> bool:
+        """True if the matrix was built from the current bytes of ``json_path``."""
+        source = self.header['source']
+        path = Path(json_path)
+        if path.stat().st_size != source['size']:
+            return False
+        return hashlib.sha256(path.read_bytes()).hexdigest() == source['sha256']
+
+    def close(self):
+        """Release the mapping (columns handed out are copies and stay valid)."""
+        for view in (self.values, self.bounds):
+            view.release()
+        self._mmap.close()
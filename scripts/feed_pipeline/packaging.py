@@ -0,0 +1,174 @@
+"""
+Release packaging of the JSON assets.
+
+The catalogs under assets/raw are written with ``indent=2`` so they diff
+well in review; that is also what ships. `package_asset` writes the release
+variants of one asset instead:
+- ``<stem>.min.json``: minified, with null values dropped (and nested
+  objects left empty by that, such as an all-null ``anti_nutritional_factors``);
+  the app's fromJson reads a missing key as null
+- ``<stem>.keyed.json``: key-dictionary encoding of the same records, one
+  schema header and an array of values per record (`encode_keyed`)
+- gzip and, when the optional ``zstandard`` module is installed, zstd
+  copies of both
+
+`check_budgets` compares every variant with the byte budgets configured in
+scripts/asset_budgets.json.
+"""
+
+import gzip
+import json
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Union
+
+from feed_pipeline.paths import CACHE_DIR, REPO_ROOT, atomic_write
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+RELEASE_DIR = CACHE_DIR / "release"
+BUDGETS_FILE = REPO_ROOT / "scripts" / "asset_budgets.json"
+
+KEYED_FORMAT = 'keyed'
+KEYED_VERSION = 1
+
+MINIFIED = 'min.json'
+KEYED = 'keyed.json'
+COMPRESSIONS = ('gz', 'zst')
+
+
+class PackagedFile(NamedTuple):
+    asset: str      # source file name
+    variant: str    # 'min.json', 'keyed.json.gz', ...
+    path: Path
+    size: int
+
+
+def drop_nulls(value):
+    """``value`` without null entries in its objects, and without objects that become empty."""
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            item = drop_nulls(item)
+            if item is None or (isinstance(item, dict) and not item):
+                continue
+            result[key] = item
+        return result
+    if isinstance(value, list):
+        return [drop_nulls(item) for item in value]
+    return value
+
+
+def _trim(values: list) -> list:
+    while values and values[-1] is None:
+        values.pop()
+    return values
+
+
+def encode_keyed(records: List[Dict]) -> Dict:
+    """
+    Key-dictionary encoding of null-free records: ``fields`` lists every
+    top-level key (first-seen order) and each row holds the values in that
+    order, null for absent keys, trailing nulls trimmed. Fields whose values
+    are all objects are encoded the same way against ``nested[field]``.
+    """
+    fields: Dict[str, None] = {}
+    for record in records:
+        fields.update(dict.fromkeys(record))
+    nested = {}
+    for field in fields:
+        values = [record[field] for record in records if field in record]
+        if values and all(isinstance(value, dict) for value in values):
+            keys: Dict[str, None] = {}
+            for value in values:
+                keys.update(dict.fromkeys(value))
+            nested[field] = list(keys)
+
+    rows = []
+    for record in records:
+        row = []
+        for field in fields:
+            value = record.get(field)
+            if field in nested and value is not None:
+                value = _trim([value.get(key) for key in nested[field]])
+            row.append(value)
+        rows.append(_trim(row))
+    return {'format': KEYED_FORMAT, 'version': KEYED_VERSION, 'fields': list(fields),
+            'nested': nested, 'rows': rows}
+
+
+def decode_keyed(document: Dict) -> List[Dict]:
+    """Records of an `encode_keyed` document (null-free, as encoded)."""
+    if document.get('format') != KEYED_FORMAT or document.get('version') != KEYED_VERSION:
+        raise ValueError("not a keyed asset of a supported version")
+    fields, nested = document['fields'], document['nested']
+    records = []
+    for row in document['rows']:
+        record = {}
+        for field, value in zip(fields, row):
+            if value is None:
+                continue
+            if field in nested:
+                value = {key: item for key, item in zip(nested[field], value) if item is not None}
+            record[field] = value
+        records.append(record)
+    return records
+
+
+def _minify(document) -> bytes:
+    return json.dumps(document, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _write(path: Path, data: bytes) -> int:
+    atomic_write(path, data)
+    return len(data)
+
+
+def compressors(names=COMPRESSIONS) -> Dict[str, object]:
+    """Available compressors among ``names`` (zstd needs the zstandard module)."""
+    available = {'gz': lambda data: gzip.compress(data, compresslevel=9, mtime=0)}
+    if zstandard is not None:
+        available['zst'] = zstandard.ZstdCompressor(level=19).compress
+    return {name: available[name] for name in names if name in available}
+
+
+def package_asset(json_path: Union[str, Path], out_dir: Optional[Union[str, Path]] = None,
+                  compress=COMPRESSIONS, keyed: bool = True) -> List[PackagedFile]:
+    """Write the release variants of one JSON asset; returns them in write order."""
+    json_path = Path(json_path)
+    out_dir = Path(out_dir) if out_dir else RELEASE_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    with open(json_path, 'r', encoding='utf-8') as f:
+        document = drop_nulls(json.load(f))
+
+    encodings = {MINIFIED: _minify(document)}
+    if keyed and isinstance(document, list) and all(isinstance(record, dict) for record in document):
+        encodings[KEYED] = _minify(encode_keyed(document))
+    packed = []
+    for variant, data in encodings.items():
+        path = out_dir / f"{json_path.stem}.{variant}"
+        packed.append(PackagedFile(json_path.name, variant, path, _write(path, data)))
+        for suffix, compressor in compressors(compress).items():
+            compressed = path.with_name(f"{path.name}.{suffix}")
+            packed.append(PackagedFile(json_path.name, f"{variant}.{suffix}", compressed,
+                                       _write(compressed, compressor(data))))
+    return packed
+
+
+def load_budgets(path: Union[str, Path] = BUDGETS_FILE) -> Dict[str, Dict[str, int]]:
+    """``{asset name: {variant: max bytes}}``; variant ``'*'`` applies to every variant."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return {asset: budgets for asset, budgets in json.load(f).items() if not asset.startswith('_')}
+
+
+def budget_for(budgets: Dict[str, Dict[str, int]], packed: PackagedFile) -> Optional[int]:
+    limits = budgets.get(packed.asset, {})
+    return limits.get(packed.variant, limits.get('*'))
+
+
+def check_budgets(packed: List[PackagedFile], budgets: Dict[str, Dict[str, int]]) -> List[PackagedFile]:
+    """The packaged files larger than their budget."""
+    return [item for item in packed
+            if budget_for(budgets, item) is not None and item.size > budget_for(budgets, item)]
@@ -0,0 +1,58 @@
+"""
+Chunked process-pool helpers for CPU-bound per-record checks.
+
+`map_chunks` runs a function over chunks of records on a
+``ProcessPoolExecutor`` and yields the results in chunk order, so callers
+that concatenate them get the same output for any worker count. At most
+two chunks per worker are in flight, which keeps memory bounded when the
+records are streamed. With one worker everything runs in-process.
+
+The function must be picklable (defined at module level, or a
+``functools.partial`` of one). ``concurrent.futures`` is only imported
+when a pool is used: it pulls in multiprocessing, which would otherwise
+dominate the import time of every script using this module.
+"""
+
+import os
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+DEFAULT_CHUNK_SIZE = 2000
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def chunked(items: Iterable[T], size: int = DEFAULT_CHUNK_SIZE) -> Iterator[Tuple[int, List[T]]]:
+    """(start index, items) chunks of at most ``size`` items."""
+    iterator = iter(items)
+    start = 0
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield start, chunk
+        start += len(chunk)
+
+
+def map_chunks(fn: Callable[[T], R], chunks: Iterable[T], workers: Optional[int] = 1) -> Iterator[R]:
+    """``fn(chunk)`` for every chunk, in order, on up to ``workers`` processes."""
+    workers = workers or default_workers()
+    if workers <= 1:
+        for chunk in chunks:
+            yield fn(chunk)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(pool.submit(fn, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
@@ -0,0 +1,29 @@
+"""
+Well-known locations used by the pipeline scripts, and `atomic_write` for
+the files they produce.
+"""
+
+import os
+from pathlib import Path
+from typing import Union
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+RAW_DIR = REPO_ROOT / "assets" / "raw"
+DOC_DIR = REPO_ROOT / "doc"
+
+# Build caches (manifests, intermediate artefacts). Lives under build/ so it
+# is never bundled with the app's assets/raw/ directory.
+CACHE_DIR = REPO_ROOT / "build" / "pipeline"
+
+
+def atomic_write(path: Union[str, Path], data: bytes):
+    """
+    Replace ``path`` with ``data`` in one step: written to a temporary file
+    next to it first, so readers (and a failed run) never leave a partial
+    file behind. Creates the parent directory.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
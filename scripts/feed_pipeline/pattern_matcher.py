@@ -0,0 +1,196 @@
+"""
+Multi-pattern matching for the standards tables.
+
+Name lookups used to test every variant of every standards entry (or run
+one regex per pattern family) against each ingredient name. `PatternSet`
+compiles all entries once into a single Aho-Corasick automaton, so one pass
+over a name reports every entry whose keywords occur in it.
+
+Entries are either literal variants (match when any variant is a substring)
+or regexes. For a regex, the literal words it requires are extracted and fed
+to the automaton; the regex itself only runs to confirm an entry whose
+keywords were all seen. Patterns whose literals cannot be extracted are
+always confirmed by regex, so results never differ from a plain
+``re.search``. Matches come back in insertion order, i.e. the priority order
+of the original loops. While `feed_pipeline.pattern_profile` is on, each
+entry's evaluations, hits and time are recorded under the set's name.
+"""
+
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+from feed_pipeline import instrument, pattern_profile
+
+_SIMPLE_REGEX = re.compile(r'^\(?([^()\[\]{}?+^$\\]*?)\)?$')
+
+
+def required_literals(pattern: str) -> Optional[List[List[str]]]:
+    """
+    Literal words a simple regex needs, as alternatives of all-required words.
+
+    ``r'fish.*meal'`` -> ``[['fish', 'meal']]``,
+    ``r'(canola|rapeseed)'`` -> ``[['canola'], ['rapeseed']]``.
+    Returns None when the pattern uses syntax beyond ``|``, ``.*`` and ``\\b``.
+    """
+    stripped = pattern.replace(r'\b', '')
+    found = _SIMPLE_REGEX.match(stripped)
+    if not found:
+        return None
+    alternatives = []
+    for branch in found.group(1).split('|'):
+        words = branch.split('.*')
+        if not all(words) or any('.' in w or '*' in w for w in words):
+            return None
+        alternatives.append(words)
+    return alternatives
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton reporting which keywords occur in a text."""
+
+    def __init__(self, keywords: Iterable[str] = ()):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[str]] = [set()]
+        self._built = False
+        for keyword in keywords:
+            self.add(keyword)
+
+    def add(self, keyword: str):
+        if not keyword:
+            raise ValueError("empty keyword")
+        state = 0
+        for ch in keyword:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            state = nxt
+        self._out[state].add(keyword)
+        self._built = False
+
+    def _build(self):
+        queue = list(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+        self._built = True
+
+    def search(self, text: str) -> Set[str]:
+        """Every keyword occurring anywhere in ``text`` (one pass)."""
+        if not self._built:
+            self._build()
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[str] = set()
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+class PatternSet:
+    """Ordered entries (literal variants or regexes) matched in one pass."""
+
+    def __init__(self, name: str = 'patterns'):
+        self.name = name  # table name in pattern profiles
+        self._payloads: List[Any] = []
+        self._labels: List[str] = []
+        self._regexes: List[Optional[re.Pattern]] = []
+        # Per entry: alternatives, each a tuple of keywords that must all occur
+        self._alternatives: List[List[Sequence[str]]] = []
+        self._always: List[int] = []  # entries checked on every text
+        self._by_keyword: Dict[str, Set[int]] = {}
+        self._automaton = KeywordAutomaton()
+
+    def __len__(self) -> int:
+        return len(self._payloads)
+
+    def _register(self, payload: Any, label: str, regex, alternatives) -> int:
+        entry = len(self._payloads)
+        self._payloads.append(payload)
+        self._labels.append(label)
+        self._regexes.append(regex)
+        self._alternatives.append(alternatives or [])
+        if alternatives is None:
+            self._always.append(entry)
+            return entry
+        for words in alternatives:
+            for word in words:
+                if word not in self._by_keyword:
+                    self._automaton.add(word)
+                self._by_keyword.setdefault(word, set()).add(entry)
+        return entry
+
+    def add_literals(self, payload: Any, variants: Iterable[str], label: Optional[str] = None) -> int:
+        """Entry matching when any variant is a substring of the text."""
+        variants = list(variants)
+        label = label or '|'.join(variants)
+        if '' in variants:  # the empty string is a substring of anything
+            return self._register(payload, label, None, None)
+        return self._register(payload, label, None, [(v,) for v in variants])
+
+    def add_regex(self, payload: Any, pattern: str, label: Optional[str] = None) -> int:
+        """Entry matching when ``re.search(pattern, text)`` does."""
+        return self._register(payload, label or pattern, re.compile(pattern), required_literals(pattern))
+
+    def _candidates(self, text: str):
+        """Keywords seen in ``text`` and the entries they make worth confirming, in order."""
+        seen = self._automaton.search(text)
+        candidates = set(self._always)
+        for word in seen:
+            candidates |= self._by_keyword[word]
+        return seen, sorted(candidates)
+
+    def _confirm(self, entry: int, text: str, seen: Set[str]) -> bool:
+        alternatives = self._alternatives[entry]
+        if alternatives and not any(all(w in seen for w in words) for words in alternatives):
+            return False
+        regex = self._regexes[entry]
+        if regex is not None:
+            instrument.count("regex_evaluations")
+            return regex.search(text) is not None
+        return True
+
+    def matches(self, text: str) -> List[Any]:
+        """Payloads of every matching entry, in insertion (priority) order."""
+        profile = pattern_profile.active()
+        if profile is not None:
+            return self._profiled_matches(text, profile)
+        seen, candidates = self._candidates(text)
+        return [self._payloads[entry] for entry in candidates if self._confirm(entry, text, seen)]
+
+    def _profiled_matches(self, text: str, profile) -> List[Any]:
+        begin = time.perf_counter()
+        seen, candidates = self._candidates(text)
+        profile.lookup(self.name, self._labels, time.perf_counter() - begin)
+        matched = []
+        for entry in candidates:
+            begin = time.perf_counter()
+            hit = self._confirm(entry, text, seen)
+            profile.record(self.name, self._labels[entry], hit, time.perf_counter() - begin)
+            if hit:
+                matched.append(self._payloads[entry])
+        return matched
+
+    def first(self, text: str) -> Optional[Any]:
+        """Highest-priority matching payload, or None."""
+        found = self.matches(text)
+        return found[0] if found else None
@@ -0,0 +1,151 @@
+"""
+Opt-in per-pattern profiling of the name and tag lookups.
+
+Standard names, separation checks and regional tags are decided by tables
+of patterns tried against each ingredient name. While a `PatternProfile` is
+active (`start`), every lookup records, per table and per pattern:
+- ``lookups``: names looked up in the table
+- ``evaluations``: times the pattern was actually tested; `PatternSet`
+  skips patterns whose keywords are absent and first-match loops stop at
+  the first hit, so this can be well below ``lookups``
+- ``hits`` and ``misses`` (evaluations that did not match)
+- ``seconds``: cumulative time spent testing the pattern (the keyword scan
+  of a `PatternSet` is charged to its table)
+
+`report` lists the most expensive patterns and those that never matched.
+While off, the hooks cost a single check, like `feed_pipeline.instrument`.
+Only the calling process is profiled.
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+_active: Optional['PatternProfile'] = None
+
+
+class PatternStats(NamedTuple):
+    table: str
+    pattern: str
+    lookups: int
+    evaluations: int
+    hits: int
+    misses: int
+    seconds: float
+
+
+class PatternProfile:
+    """Hit, miss and timing counts of every pattern seen in one run."""
+
+    def __init__(self):
+        self.tables: Dict[str, List] = {}                 # table -> [lookups, scan seconds]
+        self.patterns: Dict[str, Dict[str, List]] = {}    # table -> pattern -> [evaluations, hits, seconds]
+
+    def lookup(self, table: str, patterns: Iterable[str] = (), seconds: float = 0.0):
+        """Count one lookup in ``table``; ``patterns`` are registered the first time."""
+        entry = self.tables.get(table)
+        if entry is None:
+            entry = self.tables[table] = [0, 0.0]
+            known = self.patterns.setdefault(table, {})
+            for pattern in patterns:
+                known.setdefault(pattern, [0, 0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    def record(self, table: str, pattern: str, hit: bool, seconds: float):
+        entry = self.patterns.setdefault(table, {}).setdefault(pattern, [0, 0, 0.0])
+        entry[0] += 1
+        entry[1] += bool(hit)
+        entry[2] += seconds
+
+    def rows(self) -> List[PatternStats]:
+        return [
+            PatternStats(table, pattern, self.tables.get(table, [0])[0], evaluations, hits,
+                         evaluations - hits, seconds)
+            for table, patterns in self.patterns.items()
+            for pattern, (evaluations, hits, seconds) in patterns.items()
+        ]
+
+    def to_dict(self) -> Dict:
+        return {
+            'tables': {table: {'lookups': lookups, 'scan_seconds': round(seconds, 6)}
+                       for table, (lookups, seconds) in self.tables.items()},
+            'patterns': [dict(row._asdict(), seconds=round(row.seconds, 6))
+                         for row in sorted(self.rows(), key=lambda row: -row.seconds)],
+        }
+
+    def report(self, top: int = 15) -> str:
+        """Per-table totals, the ``top`` most expensive patterns and the never-matching ones."""
+        rows = self.rows()
+        lines = [f"{'table':<24} {'lookups':>9} {'patterns':>9} {'hits':>9} {'seconds':>9}"]
+        for table, (lookups, scan) in self.tables.items():
+            table_rows = [row for row in rows if row.table == table]
+            seconds = scan + sum(row.seconds for row in table_rows)
+            lines.append(f"{table:<24} {lookups:>9} {len(table_rows):>9} "
+                         f"{sum(row.hits for row in table_rows):>9} {seconds:>9.4f}")
+
+        lines.append("\nMost expensive patterns (cumulative evaluation time):")
+        lines.append(f"  {'seconds':>9} {'evals':>8} {'hits':>8} {'hit %':>6}  table: pattern")
+        for row in sorted(rows, key=lambda row: -row.seconds)[:top]:
+            rate = f"{100 * row.hits / row.evaluations:.0f}" if row.evaluations else '-'
+            lines.append(f"  {row.seconds:>9.4f} {row.evaluations:>8} {row.hits:>8} {rate:>6}  "
+                         f"{row.table}: {row.pattern}")
+
+        never = [row for row in rows if not row.hits]
+        lines.append(f"\nNever matched ({len(never)} of {len(rows)} patterns):")
+        for row in sorted(never, key=lambda row: (row.table, -row.seconds, row.pattern)):
+            lines.append(f"  {row.table}: {row.pattern}  "
+                         f"({row.evaluations} evaluations, {row.seconds:.4f}s)")
+        return '\n'.join(lines)
+
+
+def active() -> Optional[PatternProfile]:
+    return _active
+
+
+def start() -> PatternProfile:
+    """Switch pattern profiling on (in this process)."""
+    global _active
+    _active = PatternProfile()
+    return _active
+
+
+def finish(path: Optional[Union[str, Path]] = None) -> Optional[PatternProfile]:
+    """Stop profiling; write the counts as JSON to ``path`` if given and return them."""
+    global _active
+    profile, _active = _active, None
+    if profile is not None and path:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(profile.to_dict(), f, indent=2, ensure_ascii=False)
+            f.write('\n')
+    return profile
+
+
+def lookup(table: str, patterns: Iterable[str] = ()):
+    """Count a lookup in ``table`` (for tables tried with `search` or `contains`)."""
+    if _active is not None:
+        _active.lookup(table, patterns)
+
+
+def search(table: str, pattern: str, text: str) -> Optional[re.Match]:
+    """``re.search(pattern, text)``, profiled as ``pattern`` of ``table``."""
+    if _active is None:
+        return re.search(pattern, text)
+    begin = time.perf_counter()
+    found = re.search(pattern, text)
+    _active.record(table, pattern, found is not None, time.perf_counter() - begin)
+    return found
+
+
+def contains(table: str, text: str, *keywords: str) -> bool:
+    """Whether every keyword is a substring of ``text``, profiled as one rule of ``table``."""
+    if _active is None:
+        return all(keyword in text for keyword in keywords)
+    begin = time.perf_counter()
+    hit = all(keyword in text for keyword in keywords)
+    _active.record(table, ' & '.join(keywords), hit, time.perf_counter() - begin)
+    return hit
@@ -0,0 +1,264 @@
+"""
+Table-driven nutrient range validation.
+
+Standards tables map an ingredient (by id or by name pattern) to expected
+ranges, ``{param: (min, max, source)}``. `rules_from_standards` turns such a
+table into `RangeRule` rows, and `evaluate` checks every rule column-wise
+against a `ColumnStore`: each rule reads its nutrient column once and tests
+all the rows it selects, so the cost is one pass per rule instead of one
+Python branch per ingredient and nutrient. Adding a nutrient to a table is a
+data change; `column_for` maps its param name to the stored column.
+
+The result is a flat findings table (one `Finding` per rule and matched
+ingredient, in report order) with status, tolerance-adjusted range,
+deviation and severity.
+"""
+
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+# Status of a value against a tolerance-adjusted range
+OK, LOW, HIGH = 'OK', 'LOW', 'HIGH'
+
+# Severity of a finding
+PASS, MINOR, MAJOR = 'OK', 'MINOR', 'MAJOR'
+
+ENERGY_PREFIXES = ('me_', 'ne_', 'de_')
+
+
+class RangeRule(NamedTuple):
+    """Expected range of one param for the ingredients selected by ``key``."""
+    key: Any          # ingredient id, or name pattern (case-insensitive substring)
+    param: str        # standards param name, e.g. 'lysine_total', 'me_pig'
+    min: float
+    max: float
+    source: str
+    tolerance: float  # fraction of the range width allowed on either side
+
+    @property
+    def column(self) -> str:
+        return column_for(self.param)
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        """Range widened by the tolerance."""
+        slack = (self.max - self.min) * self.tolerance
+        return self.min - slack, self.max + slack
+
+
+class Finding(NamedTuple):
+    """Outcome of one rule for one ingredient."""
+    row: int
+    ingredient_id: Any
+    name: str
+    rule: RangeRule
+    value: float
+    status: str       # OK / LOW / HIGH
+    deviation: float  # % beyond the adjusted bound (0 when OK)
+    severity: str     # OK / MINOR / MAJOR
+
+    @property
+    def adj_min(self) -> float:
+        return self.rule.bounds[0]
+
+    @property
+    def adj_max(self) -> float:
+        return self.rule.bounds[1]
+
+
+def column_for(param: str) -> str:
+    """Column holding a standards param (``lysine_total`` -> ``amino_acids_total.lysine``)."""
+    if param.endswith('_total'):
+        return f"amino_acids_total.{param[:-len('_total')]}"
+    if param.endswith('_sid'):
+        return f"amino_acids_sid.{param[:-len('_sid')]}"
+    if param.startswith(ENERGY_PREFIXES):
+        return f"energy.{param}"
+    return param
+
+
+def unit_for(param: str) -> str:
+    """Display unit of a standards param."""
+    if param.endswith(('_total', '_sid')):
+        return 'g/kg'
+    if param.startswith(ENERGY_PREFIXES):
+        return 'kcal/kg'
+    return '%'
+
+
+def rules_from_standards(standards: Dict[Any, Dict[str, Any]], tolerance: float,
+                         params: Optional[Sequence[str]] = None) -> List[RangeRule]:
+    """
+    Rules for a ``{key: {param: (min, max, source)}}`` standards table.
+    Non-range entries (such as 'name') are ignored; ``params`` restricts the
+    params checked and fixes their order.
+    """
+    rules = []
+    for key, ranges in standards.items():
+        names = params if params is not None else list(ranges)
+        for param in names:
+            spec = ranges.get(param)
+            if isinstance(spec, tuple) and len(spec) == 3:
+                min_val, max_val, source = spec
+                rules.append(RangeRule(key, param, min_val, max_val, source, tolerance))
+    return rules
+
+
+def judge(rule: RangeRule, value: float, major_deviation: float = 15.0) -> Tuple[str, float, str]:
+    """(status, deviation %, severity) of ``value`` against ``rule``."""
+    adj_min, adj_max = rule.bounds
+    if value < adj_min:
+        status, deviation = LOW, (adj_min - value) / adj_min * 100
+    elif value > adj_max:
+        status, deviation = HIGH, (value - adj_max) / adj_max * 100
+    else:
+        return OK, 0, PASS
+    return status, deviation, MAJOR if deviation > major_deviation else MINOR
+
+
+def _rows_by_id(store, keys: Iterable[Any], id_column: str) -> Dict[Any, int]:
+    """First row holding each wanted id."""
+    wanted = set(keys)
+    rows = {}
+    for row, value in enumerate(store.column(id_column)):
+        if value == value and value in wanted and value not in rows:
+            rows[value] = row
+    return rows
+
+
+def _rows_by_pattern(store, keys: Sequence[str]) -> Dict[str, List[int]]:
+    """Rows whose name contains each pattern, each row going to its first pattern."""
+    patterns = [(key, key.lower()) for key in keys]
+    rows: Dict[str, List[int]] = {key: [] for key in keys}
+    for row, name in enumerate(store.column('name')):
+        lowered = (name if name is not None else 'Unknown').lower()
+        for key, pattern in patterns:
+            if pattern in lowered:
+                rows[key].append(row)
+                break
+    return rows
+
+
+def evaluate(store, rules: Sequence[RangeRule], select: str = 'id', id_column: str = 'id',
+             major_deviation: float = 15.0, missing: float = 0.0) -> List[Finding]:
+    """
+    Check ``rules`` against every ingredient they select in ``store``.
+
+    ``select`` is 'id' (rule keys are ingredient ids; the first row with the
+    id is checked, findings ordered by key) or 'name' (keys are name
+    patterns, each ingredient checked against the first pattern it contains,
+    findings ordered by row). Missing values count as ``missing``. A finding
+    outside the adjusted range is MAJOR when its deviation exceeds
+    ``major_deviation`` percent, otherwise MINOR.
+    """
+    keys = list(dict.fromkeys(rule.key for rule in rules))
+    if select == 'id':
+        first_rows = _rows_by_id(store, keys, id_column)
+        rows_for = {key: [first_rows[key]] if key in first_rows else [] for key in keys}
+        group_of = {key: position for position, key in enumerate(keys)}
+    elif select == 'name':
+        rows_for = _rows_by_pattern(store, keys)
+        group_of = None
+    else:
+        raise ValueError(f"unknown rule selection {select!r}")
+
+    ids = store.column(id_column)
+    names = store.column('name')
+    columns: Dict[str, List[float]] = {}
+    ordered = []
+    for position, rule in enumerate(rules):
+        rows = rows_for[rule.key]
+        if not rows:
+            continue
+        if rule.column not in columns:
+            columns[rule.column] = store.values(rule.column, missing)
+        values = columns[rule.column]
+        for row in rows:
+            value = values[row]
+            status, deviation, severity = judge(rule, value, major_deviation)
+            ingredient_id = ids[row]
+            if ingredient_id != ingredient_id:  # NaN: no id
+                ingredient_id = None
+            elif ingredient_id == int(ingredient_id):
+                ingredient_id = int(ingredient_id)
+            name = names[row]
+            finding = Finding(row, ingredient_id, name if name is not None else 'Unknown',
+                              rule, value, status, deviation, severity)
+            group = group_of[rule.key] if group_of is not None else row
+            ordered.append(((group, position), finding))
+    ordered.sort(key=lambda item: item[0])
+    return [finding for _, finding in ordered]
+
+
+def group_findings(findings: Iterable[Finding]) -> List[Tuple[Finding, List[Finding]]]:
+    """Findings grouped per ingredient row, keeping report order."""
+    groups: List[Tuple[Finding, List[Finding]]] = []
+    for finding in findings:
+        if groups and groups[-1][0].row == finding.row:
+            groups[-1][1].append(finding)
+        else:
+            groups.append((finding, [finding]))
+    return groups
+
+
+class RecordChecker:
+    """
+    The rules of `evaluate` applied one record at a time, for callers that
+    stream records (the validation runner's single pass). Selection and
+    results match `evaluate`, except findings come back per record.
+    """
+
+    def __init__(self, rules: Sequence[RangeRule], select: str = 'id', id_field: str = 'id',
+                 major_deviation: float = 15.0, missing: float = 0.0):
+        if select not in ('id', 'name'):
+            raise ValueError(f"unknown rule selection {select!r}")
+        self.select = select
+        self.id_field = id_field
+        self.major_deviation = major_deviation
+        self.missing = missing
+        self._rules: Dict[Any, List[RangeRule]] = {}
+        for rule in rules:
+            self._rules.setdefault(rule.key, []).append(rule)
+        self._patterns = [(key, str(key).lower()) for key in self._rules]
+        self._seen_ids = set()
+
+    @property
+    def keys(self):
+        """Rule keys (ids or name patterns)."""
+        return self._rules.keys()
+
+    def _value(self, record: Dict, column: str) -> float:
+        parent, _, child = column.partition('.')
+        value = record.get(parent)
+        if child:
+            value = value.get(child) if isinstance(value, dict) else None
+        if value is None or isinstance(value, (str, dict, list)):
+            return self.missing
+        return float(value)
+
+    def _key_for(self, record: Dict, name: str):
+        if self.select == 'id':
+            ingredient_id = record.get(self.id_field)
+            if ingredient_id in self._rules and ingredient_id not in self._seen_ids:
+                self._seen_ids.add(ingredient_id)
+                return ingredient_id
+            return None
+        lowered = name.lower()
+        for key, pattern in self._patterns:
+            if pattern in lowered:
+                return key
+        return None
+
+    def check(self, row: int, record: Dict) -> List[Finding]:
+        """Findings (including OK ones) for one record."""
+        name = record.get('name')
+        name = name if name is not None else 'Unknown'
+        key = self._key_for(record, name)
+        if key is None:
+            return []
+        findings = []
+        for rule in self._rules[key]:
+            value = self._value(record, rule.column)
+            status, deviation, severity = judge(rule, value, self.major_deviation)
+            findings.append(Finding(row, record.get(self.id_field), name, rule, value,
+                                    status, deviation, severity))
+        return findings
@@ -0,0 +1,39 @@
+"""
+Reference nutrient ranges used by the validators.
+
+Both tables map an ingredient to ``{param: (min, max, source)}`` ranges (see
+`feed_pipeline.range_rules` for how params map to columns):
+- INDUSTRY_STANDARDS: keyed by name pattern; an ingredient is checked
+  against the first pattern its name contains. INDUSTRY_TOLERANCE (15% of
+  the range width either side) and only the INDUSTRY_PARAMS are checked
+- REFINED_STANDARDS: keyed by ingredient id in initial_ingredients_.json,
+  with REFINED_TOLERANCE (10%); beyond REFINED_MAJOR_DEVIATION percent of
+  the widened range is major
+
+The tables live in scripts/standards.json (``ranges``) and are read through
+`feed_pipeline.standards_db` the first time one of these names is accessed,
+so importing this module does not load them. Only range params are kept
+(the refined table's ``name`` entries are not).
+"""
+
+from feed_pipeline.standards_db import shared_db
+
+_ATTRIBUTES = {
+    'INDUSTRY_STANDARDS': ('industry', 'standards'),
+    'INDUSTRY_TOLERANCE': ('industry', 'tolerance'),
+    'INDUSTRY_PARAMS': ('industry', 'params'),
+    'REFINED_STANDARDS': ('refined', 'standards'),
+    'REFINED_TOLERANCE': ('refined', 'tolerance'),
+    'REFINED_MAJOR_DEVIATION': ('refined', 'major_deviation'),
+}
+
+
+def __getattr__(name):
+    if name not in _ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    table, field = _ATTRIBUTES[name]
+    return getattr(shared_db().range_table(table), field)
+
+
+def __dir__():
+    return sorted(list(globals()) + list(_ATTRIBUTES))
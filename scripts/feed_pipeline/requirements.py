@@ -0,0 +1,88 @@
+"""
+Nutrient requirements of the app's formulator, read from its Dart source.
+
+`NutrientRequirements.getDefaults` in
+lib/src/features/feed_formulator/model/nutrient_requirements.dart is the
+single source of the requirement tables; `load_requirements` reads the
+``_build(animalTypeId, type, energyMin: ..., ...)`` calls from it instead of
+keeping a second copy here, and applies the same minimum range widths as
+``_build``.
+"""
+
+import re
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+from feed_pipeline.paths import REPO_ROOT
+
+REQUIREMENTS_DART = (REPO_ROOT / "lib" / "src" / "features" / "feed_formulator"
+                     / "model" / "nutrient_requirements.dart")
+
+# NutrientKey order in formulator_constraint.dart and the _build argument prefix of each
+NUTRIENT_ARGS = {
+    'energy': 'energy',
+    'protein': 'cp',
+    'lysine': 'lysine',
+    'methionine': 'met',
+    'calcium': 'ca',
+    'phosphorus': 'p',
+}
+
+# Minimum range widths enforced by _build (kcal for energy, % otherwise)
+MIN_ENERGY_WIDTH = 200.0
+MIN_PCT_WIDTH = 0.40
+
+# Feed type used for the `default:` branch of an animal's switch
+DEFAULT_FEED_TYPE = 'default'
+
+Requirements = Dict[str, Tuple[float, float]]  # nutrient key -> (min, max)
+
+_TOKEN = re.compile(
+    r"case\s+FeedType\.(?P<case>\w+)\s*:"
+    r"|(?P<default>default)\s*:"
+    r"|_build\(\s*(?P<animal>\d+)\s*,\s*type\s*,(?P<args>[^)]*)\)"
+)
+_ARG = re.compile(r"(\w+)\s*:\s*(-?\d+(?:\.\d+)?)")
+_COMMENT = re.compile(r"//[^\n]*")
+
+
+def _widen(low: float, high: float, min_width: float) -> Tuple[float, float]:
+    gap = high - low
+    if gap >= min_width:
+        return low, high
+    expand = (min_width - gap) / 2
+    return low - expand, high + expand
+
+
+def load_requirements(path: Union[str, Path] = REQUIREMENTS_DART) -> Dict[Tuple[int, str], Requirements]:
+    """
+    ``{(animal_type_id, feed_type): {nutrient: (min, max)}}`` for every
+    requirement table in the Dart source. ``feed_type`` is the FeedType enum
+    name (``'grower'``, ``'preStarter'``) or DEFAULT_FEED_TYPE.
+    """
+    text = _COMMENT.sub('', Path(path).read_text(encoding='utf-8'))
+    tables: Dict[Tuple[int, str], Requirements] = {}
+    labels = []
+    for match in _TOKEN.finditer(text):
+        if match.group('case'):
+            labels.append(match.group('case'))
+            continue
+        if match.group('default'):
+            labels.append(DEFAULT_FEED_TYPE)
+            continue
+        args = {name: float(value) for name, value in _ARG.findall(match.group('args'))}
+        requirements = {}
+        for key, prefix in NUTRIENT_ARGS.items():
+            width = MIN_ENERGY_WIDTH if key == 'energy' else MIN_PCT_WIDTH
+            requirements[key] = _widen(args[f'{prefix}Min'], args[f'{prefix}Max'], width)
+        animal = int(match.group('animal'))
+        for label in labels:
+            tables.setdefault((animal, label), requirements)
+        labels = []
+    return tables
+
+
+def requirements_for(tables: Dict[Tuple[int, str], Requirements], animal_type_id: int,
+                     feed_type: str) -> Optional[Requirements]:
+    """Requirements the app uses for an animal and feed type (its default branch if unlisted)."""
+    return tables.get((animal_type_id, feed_type)) or tables.get((animal_type_id, DEFAULT_FEED_TYPE))
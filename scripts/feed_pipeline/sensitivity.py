@@ -0,0 +1,121 @@
+"""
+Batch sensitivity analysis of least-cost rations.
+
+For every ration of a batch, `sensitivity_batch` solves once and reads from
+the final simplex tableau (the way dual_extractor.dart does for one
+formulation in the app):
+- the shadow price of each nutrient limit: change in cost per kg of feed
+  per unit increase of the binding limit (kcal/kg for energy, percentage
+  points otherwise; 0 when the limit does not bind)
+- the price range of each ingredient over which the optimal blend keeps
+  its composition: an ingredient out of the blend stays out while its price
+  is above ``price_lo`` (its break-even price), one at its cap stays there
+  while its price is below ``price_hi``, and an ingredient in the blend
+  keeps its role between the two. At a degenerate optimum a range can
+  close at the current price; the blend may still survive a move past it
+  with a different basis
+
+Results are flat ``array('d')`` tables (ration-major), so a break-even table
+for the whole catalog costs one solve per ration, not one per price point.
+"""
+
+import csv
+import math
+from array import array
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Union
+
+from feed_pipeline.formulation import (
+    NUTRIENTS, SAFETY_MARGIN, IngredientMatrix, Ration, constrained_nutrients,
+)
+from feed_pipeline.lp import INF, OPTIMAL, BoundedSimplex
+from feed_pipeline.parallel import chunked, map_chunks
+
+NAN = math.nan
+
+
+class SensitivityTable(NamedTuple):
+    """Shadow prices (ration x nutrient) and price ranges (ration x ingredient)."""
+    rations: List[Ration]
+    ingredient_ids: List[object]  # catalog order
+    status: List[str]
+    costs: array                  # per ration, NaN unless optimal
+    shadow_prices: array          # ration x NUTRIENTS, NaN for nutrients without limits
+    inclusions: array             # ration x ingredient, %, NaN where not offered
+    price_lo: array               # ration x ingredient, -inf/inf where unbounded
+    price_hi: array
+
+    def __len__(self) -> int:
+        return len(self.rations)
+
+    def shadow_row(self, ration: int) -> Dict[str, float]:
+        width = len(NUTRIENTS)
+        return dict(zip(NUTRIENTS, self.shadow_prices[ration * width:(ration + 1) * width]))
+
+    def _cells(self, column: array, ration: int) -> array:
+        width = len(self.ingredient_ids)
+        return column[ration * width:(ration + 1) * width]
+
+    def write_csv(self, path: Union[str, Path], prices: List[float], names: Optional[List[str]] = None):
+        """
+        Break-even table, one line per offered ingredient and optimal ration:
+        current price, inclusion, and the price range keeping the blend.
+        """
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['ration', 'ingredient_id', 'name', 'price', 'inclusion_pct', 'price_lo', 'price_hi'])
+            for r, ration in enumerate(self.rations):
+                if self.status[r] != OPTIMAL:
+                    continue
+                cells = zip(self.ingredient_ids, self._cells(self.inclusions, r),
+                            self._cells(self.price_lo, r), self._cells(self.price_hi, r))
+                for j, (ingredient_id, inclusion, low, high) in enumerate(cells):
+                    if math.isnan(inclusion):
+                        continue
+                    price = ration.prices.get(ingredient_id, prices[j]) if ration.prices else prices[j]
+                    writer.writerow([ration.label, ingredient_id, names[j] if names else '', f"{price:.6g}",
+                                     f"{inclusion:.6g}", '' if low == -INF else f"{low:.6g}",
+                                     '' if high == INF else f"{high:.6g}"])
+
+
+def _sensitivity_chunk(matrix: IngredientMatrix, safety_margin: float, chunk) -> List[tuple]:
+    """(status, cost, shadow prices, {column: (inclusion, low, high)}) per ration of a chunk."""
+    _, rations = chunk
+    results = []
+    for ration in rations:
+        lp, columns = matrix.program(ration, safety_margin)
+        simplex = BoundedSimplex(lp)
+        solution = simplex.reoptimize()
+        if solution.status != OPTIMAL:
+            results.append((solution.status, NAN, {}, {}))
+            continue
+        sensitivity = simplex.sensitivity()
+        shadow = dict(zip(constrained_nutrients(ration), sensitivity.row_duals[1:]))
+        ranges = {j: (x * 100, low, high) for j, x, low, high
+                  in zip(columns, solution.x, sensitivity.cost_lo, sensitivity.cost_hi)}
+        results.append((OPTIMAL, solution.objective, shadow, ranges))
+    return results
+
+
+def sensitivity_batch(matrix: IngredientMatrix, rations: Iterable[Ration],
+                      safety_margin: float = SAFETY_MARGIN, workers: int = 1,
+                      chunk_size: int = 200) -> SensitivityTable:
+    """Solve every ration once and collect its shadow prices and price ranges."""
+    rations = list(rations)
+    width = len(matrix)
+    status, costs = [], array('d')
+    shadow_prices, inclusions, price_lo, price_hi = array('d'), array('d'), array('d'), array('d')
+    work = partial(_sensitivity_chunk, matrix, safety_margin)
+    for results in map_chunks(work, chunked(rations, chunk_size), workers):
+        for ration_status, cost, shadow, ranges in results:
+            status.append(ration_status)
+            costs.append(cost)
+            shadow_prices.extend(shadow.get(key, NAN) for key in NUTRIENTS)
+            row_inclusion, row_lo, row_hi = array('d', [NAN]) * width, array('d', [NAN]) * width, array('d', [NAN]) * width
+            for j, (inclusion, low, high) in ranges.items():
+                row_inclusion[j], row_lo[j], row_hi[j] = inclusion, low, high
+            inclusions.extend(row_inclusion)
+            price_lo.extend(row_lo)
+            price_hi.extend(row_hi)
+    return SensitivityTable(rations, list(matrix.ids), status, costs, shadow_prices, inclusions, price_lo, price_hi)
@@ -0,0 +1,140 @@
+"""
+Standards reference data, loaded lazily.
+
+The naming tables (NRC 2012, CVB, INRA, FAO), the ASABE processing specs,
+the nutrient range tables of the validators and the remediation rules
+(name corrections, separations, references) live in scripts/standards.json
+instead of Python literals, so importing a script or feed_pipeline module
+costs nothing until a command actually asks for a table.
+
+The first `load` parses the JSON into its working form (int ids, range
+tuples, `Separation` rules) and pickles it to build/pipeline/; later loads
+read the pickle while the JSON's size and mtime are unchanged. The result
+is memoized per process, so every accessor after the first is a dict hit.
+"""
+
+import json
+import operator
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from feed_pipeline.paths import CACHE_DIR, REPO_ROOT, atomic_write
+
+STANDARDS_FILE = REPO_ROOT / "scripts" / "standards.json"
+CACHE_FILE = CACHE_DIR / "standards.pickle"
+CACHE_VERSION = 1
+
+_OPERATORS = {'lt': operator.lt, 'le': operator.le, 'gt': operator.gt, 'ge': operator.ge}
+
+_loaded: Dict[Path, Dict] = {}
+
+
+class NamingTable(NamedTuple):
+    """One standards body's names, searched in file order."""
+    label: str                      # e.g. 'NRC 2012'
+    id_label: str                   # 'ID' or 'Code' in match descriptions
+    id_field: str                   # entry field holding the id, e.g. 'nrc_id'
+    entries: Dict[str, Dict]
+
+
+class RangeTable(NamedTuple):
+    """A validator's ``{ingredient: {param: (min, max, source)}}`` table and its settings."""
+    standards: Dict[Any, Dict]
+    tolerance: float
+    params: Optional[Tuple[str, ...]] = None
+    major_deviation: Optional[float] = None
+
+
+class Separation(NamedTuple):
+    """One form a merged ingredient is split into, and when a record is that form."""
+    name: str
+    when: Dict[str, Any]            # {'always': bool} or {'field': ..., 'lt'/'le'/'gt'/'ge': value}
+    notes: str
+
+    def applies(self, ing: Dict) -> bool:
+        if 'always' in self.when:
+            return bool(self.when['always'])
+        value = ing.get(self.when['field'], 0)
+        return all(compare(value, self.when[name]) for name, compare in _OPERATORS.items() if name in self.when)
+
+
+def _ranges(table: Dict) -> Dict[str, Tuple]:
+    return {param: tuple(bounds) if isinstance(bounds, list) else bounds for param, bounds in table.items()}
+
+
+def compile_standards(data: Dict) -> Dict:
+    """Working form of a standards.json document."""
+    ranges = data.get('ranges', {})
+    industry, refined = ranges.get('industry', {}), ranges.get('refined', {})
+    remediation = data.get('remediation', {})
+    return {
+        'naming': [NamingTable(table['label'], table['id_label'], table['id_field'], table['entries'])
+                   for table in data.get('naming', [])],
+        'processing': data.get('processing', {}),
+        'industry': RangeTable({name: _ranges(table) for name, table in industry.get('standards', {}).items()},
+                               industry.get('tolerance', 0.0), tuple(industry.get('params', ())) or None),
+        'refined': RangeTable({int(key): _ranges(table) for key, table in refined.get('standards', {}).items()},
+                              refined.get('tolerance', 0.0), None, refined.get('major_deviation')),
+        'name_corrections': {int(key): tuple(names)
+                             for key, names in remediation.get('name_corrections', {}).items()},
+        'separations': {int(key): [Separation(rule['name'], rule['when'], rule.get('notes', '')) for rule in rules]
+                        for key, rules in remediation.get('separations', {}).items()},
+        'references': remediation.get('references', {}),
+    }
+
+
+def load(path: Union[str, Path] = STANDARDS_FILE, cache_file: Optional[Path] = CACHE_FILE) -> Dict:
+    """Compiled standards of ``path`` (memoized; pickled to ``cache_file`` between runs)."""
+    path = Path(path)
+    if path in _loaded:
+        return _loaded[path]
+    import pickle  # only needed once a table is asked for
+    stat = path.stat()
+    key = [CACHE_VERSION, str(path.resolve()), stat.st_size, stat.st_mtime_ns]
+    compiled = None
+    if cache_file is not None:
+        try:
+            with open(cache_file, 'rb') as f:
+                cached = pickle.load(f)
+            if cached.get('key') == key:
+                compiled = cached['standards']
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            compiled = None
+    if compiled is None:
+        with open(path, 'r', encoding='utf-8') as f:
+            compiled = compile_standards(json.load(f))
+        if cache_file is not None:
+            atomic_write(cache_file, pickle.dumps({'key': key, 'standards': compiled},
+                                                  protocol=pickle.HIGHEST_PROTOCOL))
+    _loaded[path] = compiled
+    return compiled
+
+
+def loaded() -> bool:
+    """Whether any standards file has been loaded in this process."""
+    return bool(_loaded)
+
+
+def naming_tables() -> List[NamingTable]:
+    return load()['naming']
+
+
+def processing_specs() -> Dict[str, Dict]:
+    return load()['processing']
+
+
+def range_table(name: str) -> RangeTable:
+    """``'industry'`` (keyed by name pattern) or ``'refined'`` (keyed by ingredient id)."""
+    return load()[name]
+
+
+def name_corrections() -> Dict[int, Tuple[str, str]]:
+    return load()['name_corrections']
+
+
+def separations() -> Dict[int, List[Separation]]:
+    return load()['separations']
+
+
+def references() -> Dict[str, str]:
+    return load()['references']
@@ -0,0 +1,308 @@
+"""
+Indexed SQLite copy of the standards reference data.
+
+scripts/standards.json is the source of truth; `build_standards_db` compiles
+it into build/pipeline/standards.sqlite so a stage can look a name, a
+standards code or a nutrient up through an index instead of scanning the
+tables, and so thousands of entries cost nothing until they are queried:
+- ``standard``: one row per naming-table entry, in priority order (tables in
+  file order, entries in definition order), indexed by code (NRC id, CVB /
+  INRA / FAO code) and by standard name
+- ``variant``: every variant with its first word, indexed by that word. A
+  variant matches a name it is a substring of, the rule of the
+  cross-reference (`standards_matcher` in standardize_ingredients_nrc.py),
+  so ``corn`` matches "popcorn meal" too. The first word of such a variant
+  lies inside one word of the name, so a name lookup fetches the variants
+  whose first word is a substring of one of the name's words and keeps
+  those that are substrings of the name
+- ``nutrient_range``: the industry and refined range tables, one row per
+  ingredient and param, indexed by param and by ingredient, and
+  ``range_setting``: each range table's tolerance, params and major deviation
+- ``reference`` and ``name_correction``: the remediation references (by
+  standard name) and name corrections (by ingredient id)
+
+The source's size and mtime are stored in ``meta``; `open_db` rebuilds the
+file when they no longer match. The cross-reference compiles its name
+matcher from ``variant`` and the range validators read their tables from
+``nutrient_range``, both through `shared_db` (one connection per process).
+"""
+
+import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from feed_pipeline.paths import CACHE_DIR
+from feed_pipeline.standards import STANDARDS_FILE, RangeTable
+
+DB_FILE = CACHE_DIR / "standards.sqlite"
+SCHEMA_VERSION = 3
+
+_ID_KEYED = ('refined',)  # range tables keyed by ingredient id (see `standards.compile_standards`)
+
+_WORD = re.compile(r"[^\W_]+%?")
+_MAX_PARAMS = 500  # bound parameters per query (SQLite's limit can be as low as 999)
+
+SCHEMA = (
+    "CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+    "CREATE TABLE standard (entry INTEGER PRIMARY KEY, body TEXT NOT NULL, id_label TEXT NOT NULL,"
+    " code TEXT, key TEXT NOT NULL, standard_name TEXT NOT NULL, data TEXT NOT NULL)",
+    "CREATE TABLE variant (entry INTEGER NOT NULL, variant TEXT NOT NULL, word TEXT NOT NULL)",
+    "CREATE TABLE nutrient_range (range_table TEXT NOT NULL, ingredient TEXT NOT NULL, param TEXT NOT NULL,"
+    " min REAL NOT NULL, max REAL NOT NULL, source TEXT NOT NULL)",
+    "CREATE TABLE range_setting (range_table TEXT PRIMARY KEY, tolerance REAL NOT NULL, params TEXT,"
+    " major_deviation REAL, id_keyed INTEGER NOT NULL)",
+    "CREATE TABLE reference (standard_name TEXT PRIMARY KEY, reference TEXT NOT NULL)",
+    "CREATE TABLE name_correction (ingredient_id INTEGER PRIMARY KEY, current_name TEXT NOT NULL,"
+    " standard_name TEXT NOT NULL)",
+)
+INDEXES = (
+    "CREATE INDEX standard_code ON standard (code)",
+    "CREATE INDEX standard_name ON standard (standard_name COLLATE NOCASE)",
+    "CREATE INDEX variant_word ON variant (word)",
+    "CREATE INDEX nutrient_range_param ON nutrient_range (param)",
+    "CREATE INDEX nutrient_range_ingredient ON nutrient_range (ingredient)",
+)
+
+
+class StandardMatch(NamedTuple):
+    """A naming-table entry found by a lookup."""
+    entry: int              # priority: lower wins
+    body: str               # 'NRC 2012', 'CVB', ...
+    id_label: str
+    code: Optional[str]
+    key: str
+    standard_name: str
+
+    @property
+    def description(self) -> str:
+        """Same text as `IngredientStandardizer._find_standard_match` reports."""
+        return f"{self.body}: {self.standard_name} ({self.id_label}: {self.code})"
+
+
+class RangeRow(NamedTuple):
+    range_table: str        # 'industry' (ingredient = name pattern) or 'refined' (ingredient = id)
+    ingredient: str
+    param: str
+    min: float
+    max: float
+    source: str
+
+
+def words(text: str) -> List[str]:
+    """Lowercase words of ``text`` as the variant index stores them (``62%`` is one word)."""
+    return _WORD.findall(text.lower())
+
+
+def _substrings(word: str) -> List[str]:
+    return [word[start:end] for start in range(len(word)) for end in range(start + 1, len(word) + 1)]
+
+
+def _source_key(source: Path) -> str:
+    stat = source.stat()
+    return json.dumps([SCHEMA_VERSION, stat.st_size, stat.st_mtime_ns])
+
+
+def _rows(data: Dict):
+    """Table name -> rows of a standards.json document."""
+    standards, variants = [], []
+    for table in data.get('naming', []):
+        for key, entry in table['entries'].items():
+            number = len(standards)
+            code = entry.get(table['id_field'])
+            standards.append((number, table['label'], table['id_label'], None if code is None else str(code),
+                              key, entry['standard_name'], json.dumps(entry, ensure_ascii=False)))
+            for variant in entry.get('variants', []):
+                first = words(variant)
+                # A variant without words ('', '-') is looked up for every name
+                variants.append((number, variant, first[0] if first else ''))
+    ranges = [
+        (name, str(ingredient), param, bounds[0], bounds[1], bounds[2])
+        for name, spec in data.get('ranges', {}).items()
+        for ingredient, params in spec.get('standards', {}).items()
+        for param, bounds in params.items() if isinstance(bounds, list)
+    ]
+    settings = [
+        (name, spec.get('tolerance', 0.0), json.dumps(spec['params']) if spec.get('params') else None,
+         spec.get('major_deviation'), int(name in _ID_KEYED))
+        for name, spec in data.get('ranges', {}).items()
+    ]
+    remediation = data.get('remediation', {})
+    return {
+        'standard': standards,
+        'variant': variants,
+        'nutrient_range': ranges,
+        'range_setting': settings,
+        'reference': list(remediation.get('references', {}).items()),
+        'name_correction': [(int(ingredient_id), current, standard)
+                            for ingredient_id, (current, standard) in remediation.get('name_corrections', {}).items()],
+    }
+
+
+def build_standards_db(out: Union[str, Path] = DB_FILE, source: Union[str, Path] = STANDARDS_FILE) -> Dict[str, int]:
+    """Compile ``source`` into an indexed SQLite file at ``out``; returns the row count of each table."""
+    out, source = Path(out), Path(source)
+    key = _source_key(source)
+    with open(source, 'r', encoding='utf-8') as f:
+        tables = _rows(json.load(f))
+
+    out.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out.with_name(f"{out.name}.{os.getpid()}.tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(tmp, isolation_level=None)
+    try:
+        conn.execute('PRAGMA journal_mode = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('BEGIN')
+        for statement in SCHEMA:
+            conn.execute(statement)
+        for table, rows in tables.items():
+            if rows:
+                conn.executemany(f"INSERT INTO {table} VALUES ({', '.join('?' * len(rows[0]))})", rows)
+        conn.executemany("INSERT INTO meta VALUES (?, ?)", [('source', str(source.resolve())), ('source_key', key)])
+        for statement in INDEXES:
+            conn.execute(statement)
+        conn.execute('COMMIT')
+        conn.execute('ANALYZE')
+        conn.execute('VACUUM')
+    finally:
+        conn.close()
+    tmp.replace(out)
+    return {table: len(rows) for table, rows in tables.items()}
+
+
+def is_current(path: Union[str, Path] = DB_FILE, source: Union[str, Path] = STANDARDS_FILE) -> bool:
+    """Whether ``path`` was built from ``source`` as it is now."""
+    path = Path(path)
+    if not path.exists():
+        return False
+    try:
+        conn = sqlite3.connect(f"file:{path.as_posix()}?mode=ro", uri=True)
+        try:
+            row = conn.execute("SELECT value FROM meta WHERE key = 'source_key'").fetchone()
+        finally:
+            conn.close()
+    except sqlite3.DatabaseError:
+        return False
+    return row is not None and row[0] == _source_key(Path(source))
+
+
+class StandardsDB:
+    """Read-only indexed lookups in a built standards database."""
+
+    def __init__(self, path: Union[str, Path] = DB_FILE):
+        self.path = Path(path)
+        self._conn = sqlite3.connect(f"file:{self.path.as_posix()}?mode=ro", uri=True, check_same_thread=False)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'StandardsDB':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _matches(self, sql: str, params: Iterable) -> List[StandardMatch]:
+        return [StandardMatch(*row) for row in self._conn.execute(
+            f"SELECT entry, body, id_label, code, key, standard_name FROM standard WHERE {sql} ORDER BY entry",
+            tuple(params))]
+
+    def match_name(self, name: str) -> List[StandardMatch]:
+        """Entries with a variant that is a substring of ``name``, best first."""
+        name_lower = name.lower()
+        keys = sorted({''}.union(*(_substrings(word) for word in words(name_lower))))
+        entries = set()
+        for start in range(0, len(keys), _MAX_PARAMS):
+            chunk = keys[start:start + _MAX_PARAMS]
+            rows = self._conn.execute(
+                f"SELECT entry, variant FROM variant WHERE word IN ({', '.join('?' * len(chunk))})", chunk)
+            entries.update(entry for entry, variant in rows if variant in name_lower)
+        if not entries:
+            return []
+        entries = sorted(entries)
+        return self._matches(f"entry IN ({', '.join('?' * len(entries))})", entries)
+
+    def variants(self) -> List[Tuple[StandardMatch, List[str]]]:
+        """Every entry with its variants, best first (to compile a whole-table matcher)."""
+        variants: Dict[int, List[str]] = {}
+        for entry, variant in self._conn.execute("SELECT entry, variant FROM variant ORDER BY rowid"):
+            variants.setdefault(entry, []).append(variant)
+        return [(match, variants.get(match.entry, [])) for match in self._matches("1", ())]
+
+    def by_code(self, code: str) -> List[StandardMatch]:
+        """Entries with this NRC id or CVB / INRA / FAO code."""
+        return self._matches("code = ?", (code,))
+
+    def by_standard_name(self, standard_name: str) -> List[StandardMatch]:
+        """Entries with this standard name (case-insensitive)."""
+        return self._matches("standard_name = ? COLLATE NOCASE", (standard_name,))
+
+    def entry(self, match: Union[StandardMatch, int]) -> Dict:
+        """Full table entry (variants, forms, notes, ...) of a match."""
+        number = match.entry if isinstance(match, StandardMatch) else match
+        row = self._conn.execute("SELECT data FROM standard WHERE entry = ?", (number,)).fetchone()
+        if row is None:
+            raise KeyError(number)
+        return json.loads(row[0])
+
+    def ranges(self, param: Optional[str] = None, ingredient: Optional[Union[str, int]] = None,
+               range_table: Optional[str] = None) -> List[RangeRow]:
+        """Range rows for a nutrient param and/or an ingredient (name pattern or id)."""
+        clauses, params = [], []
+        for column, value in (('param', param), ('ingredient', ingredient), ('range_table', range_table)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(str(value))
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return [RangeRow(*row) for row in self._conn.execute(
+            f"SELECT range_table, ingredient, param, min, max, source FROM nutrient_range {where} ORDER BY rowid",
+            params)]
+
+    def range_table(self, name: str) -> RangeTable:
+        """Range table ``name`` in the form `standards.range_table` gives (range params only)."""
+        row = self._conn.execute("SELECT tolerance, params, major_deviation, id_keyed FROM range_setting"
+                                 " WHERE range_table = ?", (name,)).fetchone()
+        if row is None:
+            raise KeyError(name)
+        tolerance, params, major_deviation, id_keyed = row
+        table: Dict[object, Dict[str, Tuple]] = {}
+        for rng in self.ranges(range_table=name):
+            key = int(rng.ingredient) if id_keyed else rng.ingredient
+            table.setdefault(key, {})[rng.param] = (rng.min, rng.max, rng.source)
+        return RangeTable(table, tolerance, tuple(json.loads(params)) if params else None, major_deviation)
+
+    def reference(self, standard_name: str) -> Optional[str]:
+        row = self._conn.execute("SELECT reference FROM reference WHERE standard_name = ?",
+                                 (standard_name,)).fetchone()
+        return row[0] if row else None
+
+    def name_correction(self, ingredient_id: int) -> Optional[tuple]:
+        """(current name, standard name) for an ingredient id, or None."""
+        row = self._conn.execute("SELECT current_name, standard_name FROM name_correction WHERE ingredient_id = ?",
+                                 (ingredient_id,)).fetchone()
+        return tuple(row) if row else None
+
+    def counts(self) -> Dict[str, int]:
+        return {table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in ('standard', 'variant', 'nutrient_range', 'range_setting', 'reference', 'name_correction')}
+
+
+def open_db(path: Union[str, Path] = DB_FILE, source: Union[str, Path] = STANDARDS_FILE) -> StandardsDB:
+    """`StandardsDB` on ``path``, (re)built from ``source`` first if missing or stale."""
+    if not is_current(path, source):
+        build_standards_db(path, source)
+    return StandardsDB(path)
+
+
+_shared: Dict[int, StandardsDB] = {}
+
+
+def shared_db() -> StandardsDB:
+    """`open_db` on the default paths, opened once per process (connections are not shared across forks)."""
+    pid = os.getpid()
+    if pid not in _shared:
+        _shared[pid] = open_db()
+    return _shared[pid]
@@ -0,0 +1,139 @@
+"""
+Seeded synthetic ingredient catalogs for benchmarks.
+
+`CatalogGenerator` learns from one real catalog (its records are used as
+templates) and streams any number of records with the same schema:
+- names are a template's name, a template's name with a supplier qualifier,
+  or a new combination of words from the catalog's name vocabulary
+- numeric fields are a template's value jittered by up to 10%, or a value
+  drawn from that field's distribution across the catalog; nested objects
+  (amino acids, energy, inclusion limits) are jittered the same way
+- a share of records are exact duplicates of an earlier record (new id) or
+  near-duplicates: a slightly altered name (case, spacing, typo, qualifier)
+  with values within 2%
+
+The same seed gives the same catalog. Duplicates are drawn from a bounded
+reservoir of earlier records, so memory stays flat for million-record runs.
+"""
+
+import json
+import random
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+# Integer fields that are codes or flags, not measurements
+_FIXED_FIELDS = {'id', 'ingredient_id', 'category_id', 'favourite', 'is_custom'}
+
+QUALIFIERS = ('premium', 'grade A', 'grade B', 'bulk', 'imported', 'local', 'dried', 'pelleted', 'batch')
+RESERVOIR_SIZE = 2000
+
+
+def _numeric(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _jitter(value, spread: float, rng: random.Random):
+    """``value`` with its numbers scaled by up to +/-``spread`` (ints stay ints)."""
+    if isinstance(value, dict):
+        return {key: item if key in _FIXED_FIELDS else _jitter(item, spread, rng) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_jitter(item, spread, rng) for item in value]
+    if not _numeric(value):
+        return value
+    scaled = value * rng.uniform(1 - spread, 1 + spread)
+    return round(scaled) if isinstance(value, int) else round(scaled, 3)
+
+
+class CatalogGenerator:
+    """Streams synthetic records modelled on a list of template records."""
+
+    def __init__(self, templates: List[Dict], seed: int = 0, duplicate_rate: float = 0.05,
+                 near_duplicate_rate: float = 0.10, id_field: Optional[str] = None):
+        if not templates:
+            raise ValueError("a synthetic catalog needs at least one template record")
+        self.templates = templates
+        self.seed = seed
+        self.duplicate_rate = duplicate_rate
+        self.near_duplicate_rate = near_duplicate_rate
+        self.id_field = id_field or ('ingredient_id' if 'ingredient_id' in templates[0] else 'id')
+        self.names = [record['name'] for record in templates if record.get('name')]
+        self.vocabulary = sorted({word.strip(',()') for name in self.names for word in name.split()} - {''})
+        self.distributions: Dict[str, List] = {}
+        for record in templates:
+            for field, value in record.items():
+                if _numeric(value) and field not in _FIXED_FIELDS:
+                    self.distributions.setdefault(field, []).append(value)
+
+    @classmethod
+    def from_file(cls, path: Union[str, Path], **kwargs) -> 'CatalogGenerator':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), **kwargs)
+
+    def _name(self, template: Dict, rng: random.Random) -> str:
+        roll = rng.random()
+        if roll < 0.3 or not self.vocabulary:
+            return template.get('name') or rng.choice(self.names)
+        if roll < 0.7:
+            return f"{template.get('name') or rng.choice(self.names)}, {rng.choice(QUALIFIERS)} {rng.randint(1, 99)}"
+        return ' '.join(rng.sample(self.vocabulary, min(len(self.vocabulary), rng.randint(2, 4))))
+
+    def _new_record(self, rng: random.Random) -> Dict:
+        template = rng.choice(self.templates)
+        record = {}
+        for field, value in template.items():
+            if field == 'name':
+                value = self._name(template, rng)
+            elif _numeric(value) and field not in _FIXED_FIELDS and rng.random() < 0.2:
+                value = rng.choice(self.distributions[field])
+            elif field not in _FIXED_FIELDS:
+                value = _jitter(value, 0.10, rng)
+            record[field] = value
+        return record
+
+    @staticmethod
+    def _alter_name(name: str, rng: random.Random) -> str:
+        roll = rng.random()
+        if roll < 0.25:
+            return name.upper() if rng.random() < 0.5 else name.lower()
+        if roll < 0.5:
+            return '  '.join(name.split(' '))
+        if roll < 0.75 and len(name) > 3:
+            position = rng.randrange(len(name))
+            return name[:position] + rng.choice('aeinorst') + name[position + 1:]
+        return f"{name} ({rng.choice(QUALIFIERS)})"
+
+    def records(self, count: int) -> Iterator[Dict]:
+        """``count`` records with ids 1..count."""
+        rng = random.Random(self.seed)
+        reservoir: List[Dict] = []
+        for i in range(count):
+            roll = rng.random()
+            if reservoir and roll < self.duplicate_rate:
+                record = dict(rng.choice(reservoir))
+            elif reservoir and roll < self.duplicate_rate + self.near_duplicate_rate:
+                original = rng.choice(reservoir)
+                record = _jitter({k: v for k, v in original.items() if k != 'name'}, 0.02, rng)
+                record['name'] = self._alter_name(original.get('name') or '', rng)
+                record = {field: record[field] for field in original}
+            else:
+                record = self._new_record(rng)
+            record[self.id_field] = i + 1
+            record = {self.id_field: record.pop(self.id_field), **record}
+            if len(reservoir) < RESERVOIR_SIZE:
+                reservoir.append(record)
+            elif rng.random() < RESERVOIR_SIZE / (i + 1):
+                reservoir[rng.randrange(RESERVOIR_SIZE)] = record
+            yield record
+
+
+def write_catalog(path: Union[str, Path], records: Iterable[Dict]) -> int:
+    """Write records as a JSON array, one compact record per line; returns the count."""
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        for record in records:
+            f.write(',\n' if count else '\n')
+            f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+            count += 1
+        f.write('\n]\n')
+    return count
@@ -0,0 +1,466 @@
+"""
+One-pass validation of an ingredient catalog against a registry of rules.
+
+The checks used to live in separate scripts, each parsing the JSON and
+scanning it on its own. Here every check is a `Rule` registered in `RULES`;
+`run_validation` streams the records once and hands each record to every
+selected rule, then collects the issues into a `ValidationReport` that can
+be written as JSON (for CI) or printed as a summary. It takes a path or any
+iterable of records, so the merge scripts can validate their output in
+process.
+
+Rules see records as dicts. Per-record rules implement `check`; rules that
+need the whole dataset (duplicate ids) accumulate state in `check` and
+report from `finish`. A rule tied to one id space (the refined ranges are
+keyed by initial_ingredients_.json ids) lists the id fields it applies to
+and is left out of, or refused for, catalogs with another id field.
+
+Errors already recorded in a known-errors file (`load_known_errors`) can
+be told apart from new ones, so a gate can fail on new errors only.
+
+With ``workers > 1`` the records are split into chunks checked on a process
+pool. Each chunk gets fresh rule instances; stateful rules hand their
+partial state back through `state` and the parent folds it in with `merge`
+(in chunk order) before `finish`, so the report is identical for any
+worker count.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from collections import Counter
+from functools import partial
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Union
+
+from feed_pipeline.json_stream import iter_records
+from feed_pipeline.parallel import DEFAULT_CHUNK_SIZE, chunked, map_chunks
+from feed_pipeline.range_rules import MAJOR, OK, RecordChecker, rules_from_standards
+from feed_pipeline.standards_db import shared_db
+
+ERROR, WARNING, INFO = 'error', 'warning', 'info'
+
+# Required fields by catalog schema, named by its id field: the source catalogs
+# (initial_ingredients_.json) carry a category name, the v5 catalogs written by
+# the merge scripts only the category id
+REQUIRED_FIELDS = {
+    'id': ['id', 'name', 'crude_protein', 'crude_fiber', 'crude_fat',
+           'ash', 'moisture', 'energy', 'category', 'category_id'],
+    'ingredient_id': ['ingredient_id', 'name', 'crude_protein', 'crude_fiber', 'crude_fat',
+                      'ash', 'moisture', 'energy', 'category_id'],
+}
+PROXIMATE_FIELDS = ['crude_protein', 'crude_fiber', 'crude_fat', 'ash', 'moisture']
+ENERGY_FIELDS = ['de_pig', 'me_pig', 'ne_pig', 'me_poultry', 'me_ruminant', 'me_rabbit', 'de_salmonids']
+
+# Ingredients whose proximate values legitimately exceed 100% (exact name -> reason)
+UNIT_EXCEPTIONS = {
+    'Urea (Non-protein nitrogen, 46% N)': 'N equivalent: 46% N x 6.25',
+}
+
+
+class Issue(NamedTuple):
+    rule: str
+    severity: str
+    index: int          # position of the record in the source
+    ingredient_id: object
+    name: str
+    message: str
+
+
+class Rule:
+    """Base class for registered checks."""
+    name = ''
+    description = ''
+    id_fields: Optional[Sequence[str]] = None  # id fields of the catalogs it applies to (None: any)
+
+    def __init__(self, id_field: str = 'id'):
+        self.id_field = id_field
+
+    def issue(self, severity: str, index: int, record: Dict, message: str) -> Issue:
+        return Issue(self.name, severity, index, record.get(self.id_field),
+                     record.get('name', 'Unknown'), message)
+
+    def check(self, index: int, record: Dict) -> Iterable[Issue]:
+        return ()
+
+    def finish(self) -> Iterable[Issue]:
+        return ()
+
+    def state(self):
+        """Partial state after checking one chunk (None for stateless rules)."""
+        return None
+
+    def merge(self, state):
+        """Fold in the `state` of a later chunk."""
+
+
+RULES: Dict[str, type] = {}
+
+
+def register(cls):
+    """Class decorator adding a Rule subclass to RULES under its name."""
+    RULES[cls.name] = cls
+    return cls
+
+
+def _number(value) -> float:
+    """Numeric value of a field, 0 when missing or not a number."""
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else 0
+
+
+def plausibility_issues(name: str, ing: Dict) -> List[str]:
+    """
+    Validate ingredient data against known standards
+    Returns list of validation issues
+    """
+    issues = []
+    cp = ing.get('crude_protein')
+    fiber = ing.get('crude_fiber')
+    ash = ing.get('ash')
+
+    # Check protein ranges based on ingredient type
+    name_lower = name.lower()
+
+    if "concentrate" in name_lower and cp and cp < 20:
+        issues.append(f"Protein level {cp}% seems low for concentrate")
+
+    if "meal" in name_lower and cp and cp < 10:
+        issues.append(f"Protein level {cp}% unusually low for meal")
+
+    # Check fiber levels
+    if fiber and fiber > 40:
+        if "bran" not in name_lower and "hull" not in name_lower and "straw" not in name_lower:
+            issues.append(f"High fiber {fiber}% - verify ingredient is fibrous")
+
+    # Check ash levels (indicator of bone content)
+    if ash and ash > 25 and "bone" not in name_lower and "mineral" not in name_lower:
+        issues.append(f"High ash {ash}% - check if mineral supplement or MBM")
+
+    # Check energy values are reasonable
+    me = ing.get('me_growing_pig')
+    if me and (me < 500 or me > 10000):
+        issues.append(f"Energy value {me} kcal/kg outside typical range (500-10000)")
+
+    return issues
+
+
+@register
+class DuplicateIds(Rule):
+    name = 'duplicate_ids'
+    description = 'Ingredient ids are unique'
+
+    def __init__(self, id_field: str = 'id'):
+        super().__init__(id_field)
+        self._first: Dict[object, tuple] = {}  # id -> (index, name) of its first record
+        self._counts: Counter = Counter()
+
+    def check(self, index, record):
+        ingredient_id = record.get(self.id_field)
+        self._counts[ingredient_id] += 1
+        if ingredient_id not in self._first:
+            self._first[ingredient_id] = (index, record.get('name', 'Unknown'))
+        return ()
+
+    def state(self):
+        return self._counts, self._first
+
+    def merge(self, state):
+        counts, first = state
+        self._counts.update(counts)
+        for ingredient_id, seen in first.items():
+            self._first.setdefault(ingredient_id, seen)
+
+    def finish(self):
+        for ingredient_id, count in self._counts.items():
+            if count > 1:
+                index, name = self._first[ingredient_id]
+                yield Issue(self.name, ERROR, index, ingredient_id, name,
+                            f"ID {ingredient_id} used by {count} ingredients")
+
+
+@register
+class RequiredFields(Rule):
+    name = 'required_fields'
+    description = 'Required fields are present'
+
+    def __init__(self, id_field: str = 'id'):
+        super().__init__(id_field)
+        schema = REQUIRED_FIELDS.get(id_field, REQUIRED_FIELDS['ingredient_id'])
+        self.fields = [id_field] + schema[1:]
+
+    def check(self, index, record):
+        for field in self.fields:
+            if field not in record:
+                yield self.issue(ERROR, index, record, f"missing '{field}'")
+
+
+@register
+class UnitConsistency(Rule):
+    name = 'unit_consistency'
+    description = 'Proximate values are percentages (each <= 100%, total <= 105%)'
+
+    def check(self, index, record):
+        values = [_number(record.get(field, 0)) for field in PROXIMATE_FIELDS]
+        reason = UNIT_EXCEPTIONS.get(record.get('name'))
+        if reason:
+            yield self.issue(INFO, index, record, f"CP={values[0]:.1f}% ({reason})")
+            return
+        for field, value in zip(PROXIMATE_FIELDS, values):
+            if value > 100:
+                yield self.issue(ERROR, index, record, f"{field} = {value:.2f}% (>100%)")
+        total = sum(values)
+        if total > 105:  # Allow 5% tolerance for rounding/DM basis
+            yield self.issue(ERROR, index, record, f"TOTAL = {total:.2f}% (sum exceeds 100%)")
+
+
+@register
+class EnergyFields(Rule):
+    name = 'energy_fields'
+    description = 'Energy objects carry every species value'
+
+    def check(self, index, record):
+        energy = record.get('energy')
+        if not isinstance(energy, dict):
+            return
+        for field in ENERGY_FIELDS:
+            if field not in energy:
+                yield self.issue(ERROR, index, record, f"missing energy.{field}")
+
+
+@register
+class AminoAcidStructure(Rule):
+    name = 'amino_acid_structure'
+    description = 'Total amino acids come with SID values'
+
+    def check(self, index, record):
+        if 'amino_acids_total' in record and 'amino_acids_sid' not in record:
+            yield self.issue(ERROR, index, record, "has amino_acids_total but missing amino_acids_sid")
+
+
+class _RangeRule(Rule, ABC):
+    """
+    Range standards (`StandardsDB.range_table`), one record at a time.
+    Id-keyed tables only check the first record carrying each id, so their
+    issues are held back until `finish` (chunks may see an id out of order).
+    """
+
+    def __init__(self, id_field: str = 'id'):
+        super().__init__(id_field)
+        self._checker = self.make_checker()
+        self._by_id: Dict[object, tuple] = {}  # id -> (index, issues), id-keyed tables
+
+    @abstractmethod
+    def make_checker(self) -> RecordChecker:
+        """Checker over this rule's range table."""
+
+    def check(self, index, record):
+        issues = []
+        for finding in self._checker.check(index, record):
+            if finding.status == OK:
+                continue
+            rule = finding.rule
+            severity = ERROR if finding.severity == MAJOR else WARNING
+            issues.append(self.issue(
+                severity, index, record,
+                f"{rule.param}={finding.value:g} outside {finding.adj_min:.1f}-{finding.adj_max:.1f} "
+                f"({rule.source}, {finding.deviation:.1f}% off)"))
+        if self._checker.select != 'id':
+            return issues
+        ingredient_id = record.get(self.id_field)
+        if ingredient_id in self._checker.keys:
+            self._by_id.setdefault(ingredient_id, (index, issues))
+        return ()
+
+    def state(self):
+        return self._by_id
+
+    def merge(self, state):
+        for ingredient_id, found in state.items():
+            self._by_id.setdefault(ingredient_id, found)
+
+    def finish(self):
+        for _, issues in sorted(self._by_id.values(), key=lambda found: found[0]):
+            yield from issues
+
+
+@register
+class IndustryRanges(_RangeRule):
+    name = 'industry_ranges'
+    description = 'Key nutrients within industry ranges (by name pattern)'
+
+    def make_checker(self):
+        table = shared_db().range_table('industry')
+        rules = rules_from_standards(table.standards, table.tolerance, table.params)
+        return RecordChecker(rules, select='name', id_field=self.id_field)
+
+
+@register
+class RefinedRanges(_RangeRule):
+    name = 'refined_ranges'
+    description = 'Key ingredients within ingredient-specific ranges (by id)'
+    id_fields = ('id',)  # keyed by initial_ingredients_.json ids
+
+    def make_checker(self):
+        table = shared_db().range_table('refined')
+        rules = rules_from_standards(table.standards, table.tolerance)
+        return RecordChecker(rules, select='id', id_field=self.id_field,
+                             major_deviation=table.major_deviation)
+
+
+@register
+class StandardsPlausibility(Rule):
+    name = 'standards_plausibility'
+    description = 'Protein, fiber, ash and energy plausible for the ingredient type'
+
+    def check(self, index, record):
+        for message in plausibility_issues(str(record.get('name', '')), record):
+            yield self.issue(WARNING, index, record, message)
+
+
+class ValidationReport:
+    """Issues found by one validation run."""
+
+    def __init__(self, source: str, rules: Sequence[str], records: int, issues: List[Issue]):
+        self.source = source
+        self.rules = list(rules)
+        self.records = records
+        self.issues = issues
+
+    def counts(self) -> Dict[str, Counter]:
+        """Issue count per rule and severity."""
+        counts = {name: Counter() for name in self.rules}
+        for issue in self.issues:
+            counts[issue.rule][issue.severity] += 1
+        return counts
+
+    @property
+    def has_errors(self) -> bool:
+        return any(issue.severity == ERROR for issue in self.issues)
+
+    def to_dict(self) -> Dict:
+        counts = self.counts()
+        totals = Counter(issue.severity for issue in self.issues)
+        return {
+            'source': self.source,
+            'records': self.records,
+            'summary': {severity: totals.get(severity, 0) for severity in (ERROR, WARNING, INFO)},
+            'rules': {
+                name: {'description': RULES[name].description, **{s: counts[name].get(s, 0) for s in (ERROR, WARNING, INFO)}}
+                for name in self.rules
+            },
+            'issues': [issue._asdict() for issue in self.issues],
+        }
+
+    def save(self, path: Union[str, Path]):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False, default=str)
+
+    def errors(self) -> List[Issue]:
+        return [issue for issue in self.issues if issue.severity == ERROR]
+
+    def new_errors(self, known: set) -> List[Issue]:
+        """Errors not in ``known`` (see `load_known_errors`)."""
+        return [issue for issue in self.errors() if _error_key(issue) not in known]
+
+    def fixed_errors(self, known: set) -> set:
+        """Entries of ``known`` that no longer occur."""
+        return known - {_error_key(issue) for issue in self.errors()}
+
+    def save_known_errors(self, path: Union[str, Path], comment: str = ''):
+        """Record the current errors as known."""
+        data = {'_comment': comment, 'source': self.source,
+                'errors': [{'rule': issue.rule, 'ingredient_id': issue.ingredient_id, 'name': issue.name,
+                            'message': issue.message} for issue in self.errors()]}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
+            f.write('\n')
+
+    def summary(self, examples: int = 3) -> str:
+        """Human-readable summary: one line per rule plus a few examples."""
+        lines = [f"Validated {self.records} ingredients from {self.source} ({len(self.rules)} rules)"]
+        counts = self.counts()
+        by_rule: Dict[str, List[Issue]] = {}
+        for issue in self.issues:
+            by_rule.setdefault(issue.rule, []).append(issue)
+        for name in self.rules:
+            count = counts[name]
+            status = '[FAIL]' if count[ERROR] else '[WARN]' if count[WARNING] else '[PASS]'
+            detail = ', '.join(f"{count[s]} {s}" for s in (ERROR, WARNING, INFO) if count[s])
+            lines.append(f"  {status} {name:24s} {RULES[name].description}" + (f" ({detail})" if detail else ''))
+            for issue in by_rule.get(name, [])[:examples]:
+                lines.append(f"           ID {issue.ingredient_id}: {issue.name} - {issue.message}")
+        totals = Counter(issue.severity for issue in self.issues)
+        lines.append(f"Total: {totals[ERROR]} errors, {totals[WARNING]} warnings, {totals[INFO]} info")
+        return "\n".join(lines)
+
+
+def _error_key(issue) -> tuple:
+    return issue.rule, str(issue.ingredient_id), issue.message
+
+
+def load_known_errors(path: Union[str, Path]) -> set:
+    """(rule, id, message) of the errors recorded in a known-errors file."""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {(error['rule'], str(error['ingredient_id']), error['message']) for error in data['errors']}
+
+
+def applicable_rules(id_field: str) -> List[str]:
+    """Registered rules that apply to catalogs keyed by ``id_field``."""
+    return [name for name, rule in RULES.items() if rule.id_fields is None or id_field in rule.id_fields]
+
+
+def _check_chunk(names: Sequence[str], id_field: str, chunk) -> tuple:
+    """Run fresh instances of the named rules over one (start, records) chunk."""
+    start, records = chunk
+    checks = [RULES[name](id_field) for name in names]
+    found: List[Issue] = []
+    for index, record in enumerate(records, start):
+        for check in checks:
+            found.extend(check.check(index, record))
+    return found, [check.state() for check in checks], len(records)
+
+
+def run_validation(source: Union[str, Path, Iterable[Dict]], rules: Optional[Sequence[str]] = None,
+                   id_field: str = 'id', workers: int = 1,
+                   chunk_size: int = DEFAULT_CHUNK_SIZE) -> ValidationReport:
+    """
+    Validate ``source`` (a JSON file path or an iterable of records) with the
+    named registered rules (by default all that apply to ``id_field``) in a
+    single pass, on ``workers`` processes (None: one per CPU).
+    """
+    names = list(rules) if rules is not None else applicable_rules(id_field)
+    unknown = [name for name in names if name not in RULES]
+    if unknown:
+        raise KeyError(f"unknown validation rules: {', '.join(unknown)}")
+    foreign = [name for name in names if name not in applicable_rules(id_field)]
+    if foreign:
+        raise ValueError(f"rules not applicable to a catalog keyed by '{id_field}': {', '.join(foreign)}")
+    checks = [RULES[name](id_field) for name in names]
+
+    if isinstance(source, (str, Path)):
+        label, records = Path(source).name, iter_records(source)
+    else:
+        label, records = 'in-memory dataset', source
+
+    found: List[Issue] = []
+    count = 0
+    if workers == 1:
+        for index, record in enumerate(records):
+            for check in checks:
+                found.extend(check.check(index, record))
+            count += 1
+    else:
+        work = partial(_check_chunk, names, id_field)
+        for issues, states, size in map_chunks(work, chunked(records, chunk_size), workers):
+            found.extend(issues)
+            for check, state in zip(checks, states):
+                check.merge(state)
+            count += size
+    for check in checks:
+        found.extend(check.finish())
+
+    order = {name: position for position, name in enumerate(names)}
+    found.sort(key=lambda issue: (order[issue.rule], issue.index))
+    return ValidationReport(label, names, count, found)
@@ -0,0 +1,107 @@
+"""
+Batch least-cost formulation
+Formulates every requirement table of the app (nutrient_requirements.dart)
+against ingredients_standardized.json, optionally under many randomized
+price scenarios, and reports cost and feasibility per animal class and feed
+type. A sanity check that a new dataset still produces diets.
+
+Usage:
+    python scripts/formulate_rations.py
+    python scripts/formulate_rations.py --scenarios 50 --workers 0 --strict
+"""
+
+import argparse
+import io
+import json
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+from feed_pipeline.formulation import IngredientMatrix, Ration, formulate_batch
+from feed_pipeline.lp import OPTIMAL, SOLVERS, default_solver
+from feed_pipeline.paths import CACHE_DIR, RAW_DIR
+from feed_pipeline.requirements import DEFAULT_FEED_TYPE, load_requirements
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def build_rations(matrix, tables, scenarios, jitter, seed):
+    """The catalog-price ration of every table, then ``scenarios`` randomized-price copies."""
+    base = [Ration(animal, feed_type, requirements, label=f"{animal}/{feed_type}")
+            for (animal, feed_type), requirements in tables.items() if feed_type != DEFAULT_FEED_TYPE]
+    rations = list(base)
+    rng = random.Random(seed)
+    for scenario in range(1, scenarios + 1):
+        prices = {ingredient_id: price * rng.uniform(1 - jitter, 1 + jitter)
+                  for ingredient_id, price in zip(matrix.ids, matrix.prices)}
+        rations.extend(ration._replace(prices=prices, label=f"{ration.label}#{scenario}") for ration in base)
+    return rations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Formulate least-cost rations in batch")
+    parser.add_argument("--input", default=str(RAW_DIR / "ingredients_standardized.json"))
+    parser.add_argument("--scenarios", type=int, default=0, help="randomized price scenarios per table")
+    parser.add_argument("--jitter", type=float, default=0.2, help="price scenario spread (fraction)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--solver", choices=sorted(SOLVERS), default=default_solver())
+    parser.add_argument("--workers", type=int, default=1, help="processes (0 = one per CPU)")
+    parser.add_argument("--json", default=str(CACHE_DIR / "formulations.json"))
+    parser.add_argument("--strict", action="store_true",
+                        help="exit with status 1 if a table is infeasible at catalog prices")
+    args = parser.parse_args()
+
+    matrix = IngredientMatrix.from_file(args.input)
+    tables = load_requirements()
+    rations = build_rations(matrix, tables, args.scenarios, args.jitter, args.seed)
+
+    print('=' * 80)
+    print('BATCH LEAST-COST FORMULATION')
+    print('=' * 80)
+    print(f"{len(matrix)} ingredients, {len(rations)} rations, solver {args.solver}\n")
+
+    start = time.perf_counter()
+    results = list(formulate_batch(matrix, rations, solver=args.solver, workers=args.workers or None))
+    elapsed = time.perf_counter() - start
+
+    by_table = defaultdict(list)
+    for result in results:
+        ration = result.ration
+        by_table[(ration.animal_type_id, ration.feed_type)].append(result)
+
+    print(f"{'table':<24} {'feasible':>9} {'cost min':>9} {'median':>9} {'max':>9}")
+    infeasible_tables = []
+    for (animal, feed_type), table_results in by_table.items():
+        costs = [result.cost for result in table_results if result.status == OPTIMAL]
+        if table_results[0].status != OPTIMAL:
+            infeasible_tables.append(f"{animal}/{feed_type}")
+        line = f"{f'{animal}/{feed_type}':<24} {len(costs):>4}/{len(table_results):<4}"
+        if costs:
+            line += f" {min(costs):>9.4f} {statistics.median(costs):>9.4f} {max(costs):>9.4f}"
+        print(line)
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(args.json, 'w', encoding='utf-8') as f:
+        json.dump([{
+            'label': result.ration.label,
+            'animal_type_id': result.ration.animal_type_id,
+            'feed_type': result.ration.feed_type,
+            'status': result.status,
+            'cost': result.cost if result.status == OPTIMAL else None,
+            'inclusions': {str(k): round(v, 4) for k, v in result.inclusions.items()},
+            'nutrients': {k: round(v, 4) for k, v in result.nutrients.items()},
+        } for result in results], f, indent=1)
+
+    print(f"\n✓ {len(results)} rations in {elapsed:.2f}s ({len(results) / elapsed:.0f}/s)")
+    print(f"✓ Results saved to: {args.json}")
+    if infeasible_tables:
+        print(f"✗ Infeasible at catalog prices: {', '.join(infeasible_tables)}")
+        if args.strict:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -13,22 +13,35 @@ Strategy:
 3. Merge based on name similarity
 4. Validate data against NRC 2012, CVB, INRA, FAO standards
 5. Fill gaps with best available data
-6. Generate unique sequential ingredient_id
+6. Assign stable ingredient_id values (persisted id registry)
 """
 
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Any, Tuple
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Tuple
 from difflib import SequenceMatcher
 from datetime import datetime
 
+from feed_pipeline import incremental, instrument, name_index
+from feed_pipeline.id_registry import IdRegistry, field_values, identity_keys, registry_path_for
+from feed_pipeline.incremental import MergeManifest, code_fingerprint, diff_counts, record_fingerprint
+from feed_pipeline.json_stream import RecordError, iter_records
+from feed_pipeline.name_index import NameCandidateIndex
+from feed_pipeline.paths import CACHE_DIR
+
+# Identity fields of a source record (an ingredient is identified by the records merged into it)
+ID_FIELDS = ('name',)
+
 class IngredientMerger:
     def __init__(self):
         self.ingredient_id_counter = 1
         self.merged_ingredients = {}
         self.sources_by_ingredient = {}
         self.duplicates_log = []
+        self.manifest = None
         
     def normalize_name(self, name: str) -> str:
         """Normalize ingredient name for comparison."""
@@ -52,17 +65,24 @@ class IngredientMerger:
             return 0.0
         return SequenceMatcher(None, norm1, norm2).ratio()
     
-    def load_dataset(self, filepath: str, dataset_name: str) -> List[Dict]:
-        """Load a JSON dataset."""
+    def load_dataset(self, filepath: str, dataset_name: str) -> Iterator[Dict]:
+        """
+        Stream a JSON dataset one ingredient at a time.
+        Malformed records are reported with their byte offset and skipped.
+        """
+        errors = []
+        count = 0
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            print(f"✓ Loaded {dataset_name}: {len(data) if isinstance(data, list) else 1} ingredients")
-            return data if isinstance(data, list) else [data]
-        except Exception as e:
+            for ing in iter_records(filepath, errors):
+                count += 1
+                yield ing
+        except (OSError, RecordError) as e:
             print(f"✗ Error loading {dataset_name}: {e}")
-            return []
+        for error in errors:
+            print(f"✗ Skipped record in {dataset_name}: {error}")
+        print(f"✓ Loaded {dataset_name}: {count} ingredients")
     
+    @instrument.timed()
     def normalize_ingredient(self, ing: Dict, source: str) -> Dict:
         """Normalize ingredient data to match the model schema."""
         normalized = {
@@ -187,6 +207,7 @@ class IngredientMerger:
         result.update(max_inc_dict)
         return result
     
+    @instrument.timed()
     def merge_ingredients(self, ing1: Dict, ing2: Dict) -> Dict:
         """Merge two ingredient records, prioritizing most complete data."""
         merged = ing1.copy()
@@ -209,13 +230,21 @@ class IngredientMerger:
         
         # Merge sources
         sources = [ing1.get('_source', 'unknown'), ing2.get('_source', 'unknown')]
-        merged['_sources'] = list(set(sources))
+        merged['_sources'] = sorted(set(sources))
         
         return merged
     
-    def find_duplicate(self, ingredient: Dict, existing: List[Dict], threshold: float = 0.85) -> Tuple[int, Dict]:
-        """Find if ingredient matches an existing one."""
+    def find_duplicate(self, ingredient: Dict, existing: List[Dict], threshold: float = 0.85,
+                       index: NameCandidateIndex = None) -> Tuple[int, Dict]:
+        """Find if ingredient matches an existing one.
+
+        With an ``index`` over ``existing`` only its candidates are aligned;
+        the match returned is the same one the full scan would find.
+        """
         name = ingredient.get("name", "")
+        if index is not None:
+            idx = index.find(self.normalize_name(name))
+            return (idx, existing[idx]) if idx is not None else (-1, None)
         for idx, existing_ing in enumerate(existing):
             existing_name = existing_ing.get("name", "")
             similarity = self.similarity_ratio(name, existing_name)
@@ -223,47 +252,127 @@ class IngredientMerger:
                 return idx, existing_ing
         return -1, None
     
-    def process_datasets(self, files_data: Dict[str, List]) -> List[Dict]:
-        """Process and merge all datasets."""
+    def cluster_by_name(self, names: List[str], founders: List[Optional[int]] = None) -> List[List[int]]:
+        """
+        Group record positions into duplicate clusters, in creation order.
+        A record joins the first cluster whose founding name matches it at
+        the 0.85 threshold (see NameCandidateIndex).
+
+        ``founders`` (see `MergeManifest.previous_founders`) carries over the
+        decisions of an earlier run: the founders that run had already
+        rejected a reused record, so it is only looked up among the founders
+        that are new to this run. New and changed records, and records whose
+        founder is gone, are looked up among all founders. The clusters are
+        the ones a run without ``founders`` would build.
+        """
+        index = NameCandidateIndex(threshold=0.85)
+        fresh = NameCandidateIndex(threshold=0.85)  # founders the earlier run did not have
+        clusters = []
+        cluster_at = {}  # founder position -> cluster
+        reused = 0
+        for pos, norm_name in enumerate(names):
+            founder = founders[pos] if founders is not None else None
+            if founder is not None and (founder == pos or founder in cluster_at):
+                cluster = fresh.find(norm_name)
+                if founder != pos and (cluster is None or cluster > cluster_at[founder]):
+                    cluster = cluster_at[founder]
+                reused += 1
+            else:
+                cluster = index.find(norm_name)
+            if cluster is None:
+                index.add(len(clusters), norm_name)
+                if founder != pos:
+                    fresh.add(len(clusters), norm_name)
+                cluster_at[pos] = len(clusters)
+                clusters.append([pos])
+            else:
+                clusters[cluster].append(pos)
+        comparisons = index.comparisons + fresh.comparisons
+        if founders is not None:
+            print(f"Clustering decisions reused: {reused}/{len(names)}")
+        print(f"Name comparisons after indexing: {comparisons}")
+        instrument.count("name_comparisons", comparisons)
+        return clusters
+    
+    def process_datasets(self, files_data: Dict[str, Iterable[Dict]], previous: MergeManifest = None,
+                         registry: IdRegistry = None) -> List[Dict]:
+        """
+        Process and merge all datasets.
+        Sources may be lazy iterators; each record is normalized as it is read.
+        With `previous` (the manifest of an earlier run) clusters whose member
+        records are unchanged are taken from it instead of being re-merged;
+        the result is identical to a full run.
+        Ids come from `registry` (an empty one numbers the output 1..N).
+        """
         print("\n=== Processing Datasets ===")
         
-        # Normalize all ingredients
-        all_normalized = []
-        for source_name, ingredients in files_data.items():
-            normalized = [self.normalize_ingredient(ing, source_name) for ing in ingredients]
-            all_normalized.extend(normalized)
+        records = []
+        hashes = []
+        with instrument.span("load_normalize"):
+            for source_name, ingredients in files_data.items():
+                for ing in ingredients:
+                    hashes.append(record_fingerprint(ing, source_name))
+                    records.append(self.normalize_ingredient(ing, source_name))
+        print(f"Total ingredients before deduplication: {len(records)}")
+        if previous is not None:
+            changes = diff_counts(previous, hashes)
+            print(f"Incremental run: {changes['added']} new/changed, "
+                  f"{changes['removed']} removed/replaced, {changes['unchanged']} unchanged records")
         
-        print(f"Total ingredients before deduplication: {len(all_normalized)}")
+        # Deduplicate on normalized names (computed once, cached per record)
+        known_names = previous.key_for() if previous is not None else {}
+        with instrument.span("cluster"):
+            names = [known_names[h] if h in known_names else self.normalize_name(ing.get("name", ""))
+                     for h, ing in zip(hashes, records)]
+            clusters = self.cluster_by_name(names, previous.previous_founders(hashes) if previous is not None else None)
         
-        # Deduplicate
-        merged_list = []
-        duplicates_found = 0
-        
-        for ing in all_normalized:
-            dup_idx, dup_ing = self.find_duplicate(ing, merged_list)
-            
-            if dup_idx >= 0:
-                duplicates_found += 1
-                old_name = merged_list[dup_idx]["name"]
-                new_name = ing["name"]
-                
+        founder = {}
+        for members in clusters:
+            for pos in members[1:]:
+                founder[pos] = members[0]
+        for pos, ing in enumerate(records):
+            if pos in founder:
+                old_name = records[founder[pos]].get("name", "")
+                new_name = ing.get("name", "")
                 if old_name != new_name:
                     self.duplicates_log.append(f"MERGED: '{old_name}' ← '{new_name}'")
-                
-                # Merge with existing
-                merged_list[dup_idx] = self.merge_ingredients(merged_list[dup_idx], ing)
-            else:
-                merged_list.append(ing)
         
-        print(f"Duplicates found and merged: {duplicates_found}")
+        # Merge each cluster, reusing unchanged clusters from the previous run
+        reusable = previous.reusable_outputs() if previous is not None else {}
+        merged_list = []
+        remerged = 0
+        with instrument.span("merge_clusters"):
+            for members in clusters:
+                key = tuple(hashes[pos] for pos in members)
+                if key in reusable:
+                    merged_list.append(dict(reusable[key]))
+                    continue
+                merged = records[members[0]]
+                for pos in members[1:]:
+                    merged = self.merge_ingredients(merged, records[pos])
+                merged_list.append(merged)
+                remerged += 1
+        instrument.count("clusters_reused", len(clusters) - remerged)
+        
+        print(f"Duplicates found and merged: {len(records) - len(clusters)}")
         print(f"Final unique ingredients: {len(merged_list)}")
+        if previous is not None:
+            print(f"Clusters re-merged: {remerged}/{len(clusters)}")
         
-        # Assign sequential IDs
-        for idx, ing in enumerate(merged_list, 1):
-            ing["ingredient_id"] = idx
+        # Assign stable IDs: known ingredients keep theirs, new ones get the next free ID
+        values = field_values(records, ID_FIELDS)
+        ids = (registry if registry is not None else IdRegistry()).assign(
+            merged_list, identity_keys([values[pos] for pos in members] for members in clusters))
+        print(f"IDs kept: {ids['kept']}, new: {ids['new']}, retired: {ids['retired']}")
         
+        self.manifest = MergeManifest(self.code_version(), hashes, names, clusters, merged_list)
         return merged_list
     
+    @staticmethod
+    def code_version() -> str:
+        """Fingerprint of the code that determines the merged output."""
+        return code_fingerprint([Path(__file__), Path(name_index.__file__), Path(incremental.__file__)])
+    
     def validate_data(self, ingredients: List[Dict]) -> List[str]:
         """Validate data against reasonable ranges and standards."""
         warnings = []
@@ -347,37 +456,84 @@ class IngredientMerger:
         return all(ing.get(field) is not None for field in required_fields)
 
 
+def open_datasets(merger: IngredientMerger, base_path: Path) -> Dict[str, Iterator[Dict]]:
+    """Lazy readers for the three source datasets."""
+    return {
+        name: merger.load_dataset(str(base_path / name), name)
+        for name in ("ingredient", "initial_ingredients_.json", "new_regional.json")
+    }
+
+
+def serialize(ingredients: List[Dict]) -> str:
+    """Exact text written to ingredients_merged.json."""
+    return json.dumps(ingredients, indent=2, ensure_ascii=False)
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Merge ingredient datasets")
+    parser.add_argument("--incremental", action="store_true",
+                        help="re-merge only clusters touched by changed records (uses the last run's manifest)")
+    parser.add_argument("--verify", action="store_true",
+                        help="also run a full rebuild and fail unless the output is byte-identical")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record stage timings, memory peaks and counters; write a Chrome trace to FILE")
+    args = parser.parse_args()
+    if args.trace:
+        instrument.start()
+    
     merger = IngredientMerger()
     base_path = Path(__file__).parent.parent / "assets" / "raw"
+    manifest_file = CACHE_DIR / "ingredients_merged.manifest.json"
+    output_file = base_path / "ingredients_merged.json"
+    registry = IdRegistry.load(registry_path_for(output_file), ID_FIELDS, seed_file=output_file)
     
-    # Load datasets
-    datasets = {
-        "ingredient": merger.load_dataset(str(base_path / "ingredient"), "ingredient"),
-        "initial_ingredients_.json": merger.load_dataset(str(base_path / "initial_ingredients_.json"), "initial_ingredients_.json"),
-        "new_regional.json": merger.load_dataset(str(base_path / "new_regional.json"), "new_regional.json"),
-    }
+    previous = None
+    if args.incremental:
+        previous = MergeManifest.load(manifest_file, IngredientMerger.code_version())
+        if previous is None:
+            print("No usable manifest from a previous run - doing a full merge")
     
     # Merge
-    merged = merger.process_datasets(datasets)
+    merged = merger.process_datasets(open_datasets(merger, base_path), previous, registry)
+    
+    if args.verify:
+        with instrument.span("verify"):
+            full_merger = IngredientMerger()
+            full = full_merger.process_datasets(open_datasets(full_merger, base_path), registry=registry)
+        if serialize(full) != serialize(merged):
+            print("✗ Verification failed: output differs from a full rebuild")
+            sys.exit(1)
+        print("✓ Verified: output is byte-identical to a full rebuild")
     
     # Generate report
-    report = merger.generate_report(merged)
+    with instrument.span("report"):
+        report = merger.generate_report(merged)
     print(report)
     
-    # Save merged dataset
-    output_file = base_path / "ingredients_merged.json"
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(merged, f, indent=2, ensure_ascii=False)
-    
-    print(f"\n✓ Merged dataset saved to: {output_file}")
-    
-    # Save report
+    # Save merged dataset; an unchanged dataset keeps its file and the report
+    # (with the date) of the run that produced it
     report_file = base_path.parent / "INGREDIENT_MERGE_REPORT.md"
-    with open(report_file, 'w', encoding='utf-8') as f:
-        f.write(report)
+    text = serialize(merged)
+    unchanged = output_file.exists() and output_file.read_text(encoding='utf-8') == text
+    with instrument.span("write"):
+        if not unchanged:
+            with open(output_file, 'w', encoding='utf-8') as f:
+                f.write(text)
+        merger.manifest.save(manifest_file)
+        registry.save()
     
-    print(f"✓ Report saved to: {report_file}")
+    if unchanged:
+        print(f"\n✓ Merged dataset unchanged: {output_file} and {report_file} kept")
+    else:
+        print(f"\n✓ Merged dataset saved to: {output_file}")
+        
+        # Save report
+        with open(report_file, 'w', encoding='utf-8') as f:
+            f.write(report)
+        
+        print(f"✓ Report saved to: {report_file}")
+    if args.trace:
+        print(instrument.finish(args.trace))
 
 
 if __name__ == "__main__":
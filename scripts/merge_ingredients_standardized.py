@@ -3,12 +3,32 @@ Enhanced Ingredient Merge Script with Industry Standards Validation
 Applies learnings from remediation to avoid incorrect merges
 """
 
+import argparse
 import json
 import re
+import sys
 from pathlib import Path
 from datetime import datetime
 from difflib import SequenceMatcher
 
+from feed_pipeline import incremental, instrument, nutrient_buckets, pattern_matcher
+from feed_pipeline.columnar import build_store
+from feed_pipeline.id_registry import CATALOG_ID_FIELDS, IdRegistry, identity_keys, registry_path_for
+from feed_pipeline.incremental import MergeManifest, code_fingerprint, diff_counts, record_fingerprint
+from feed_pipeline.json_stream import RecordError, iter_records
+from feed_pipeline.nutrient_buckets import StandardNameBuckets
+from feed_pipeline.nutrient_matrix import build_matrix
+from feed_pipeline.pattern_matcher import PatternSet
+from feed_pipeline.paths import CACHE_DIR
+from feed_pipeline.validation import run_validation
+
+# Rules checked on the v5 catalog, here and in the pipeline's validate stage.
+# The range tables are left out: the refined one is keyed by source ids and
+# the industry name patterns over-match merged names ("barley" in "Barley
+# distillers grains")
+PIPELINE_VALIDATION_RULES = ['duplicate_ids', 'required_fields', 'unit_consistency', 'energy_fields',
+                             'amino_acid_structure', 'standards_plausibility']
+
 class StandardizedIngredientMerger:
     """Merges ingredients with industry standards validation"""
     
@@ -19,9 +39,17 @@ class StandardizedIngredientMerger:
             'assets/raw/initial_ingredients_.json',
             'assets/raw/new_regional.json'
         ]
+        self.output_file = self.base_path / 'assets' / 'raw' / 'ingredients_standardized.json'
+        self.report_file = self.base_path / 'doc' / 'STANDARDIZED_MERGE_REPORT.md'
+        # Ids number the shipped catalog, wherever this run writes its output
+        self.id_registry = IdRegistry.load(registry_path_for(self.output_file), CATALOG_ID_FIELDS,
+                                           seed_file=self.output_file)
         
         # Industry standard ingredient name patterns (NRC, CVB, INRA, FAO, ASABE)
         self.standard_patterns = self._load_standard_patterns()
+        self.pattern_matcher = PatternSet('standard_patterns')
+        for key, pattern_info in self.standard_patterns.items():
+            self.pattern_matcher.add_regex(key, pattern_info['pattern'])
         
         # Nutrient variance thresholds for separation
         self.nutrient_thresholds = {
@@ -30,6 +58,7 @@ class StandardizedIngredientMerger:
             'crude_fat': 3.0,
             'me_growing_pig': 200,     # 200 kcal/kg difference
         }
+        self.manifest = None
         
     def _load_standard_patterns(self):
         """Load industry-standard ingredient naming patterns"""
@@ -98,16 +127,21 @@ class StandardizedIngredientMerger:
         }
     
     def load_dataset(self, filename):
-        """Load JSON dataset with error handling"""
+        """
+        Stream JSON dataset one ingredient at a time
+        Malformed records are reported with their byte offset and skipped.
+        """
+        errors = []
+        count = 0
         try:
-            filepath = self.base_path / filename
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            print(f"✓ Loaded {filename}: {len(data)} ingredients")
-            return data
-        except Exception as e:
+            for ing in iter_records(self.base_path / filename, errors):
+                count += 1
+                yield ing
+        except (OSError, RecordError) as e:
             print(f"✗ Error loading {filename}: {e}")
-            return []
+        for error in errors:
+            print(f"✗ Skipped record in {filename}: {error}")
+        print(f"✓ Loaded {filename}: {count} ingredients")
     
     def get_standard_name(self, ingredient_name, nutrient_data):
         """
@@ -116,52 +150,52 @@ class StandardizedIngredientMerger:
         """
         name_lower = ingredient_name.lower()
         
-        # Check against standard patterns
-        for key, pattern_info in self.standard_patterns.items():
-            if re.search(pattern_info['pattern'], name_lower):
-                # Determine if this is a variant that should be kept separate
-                separate_by = pattern_info['separate_by']
-                
-                if separate_by == 'protein_grade':
-                    # Keep protein grades separate
-                    cp = nutrient_data.get('crude_protein', 0)
-                    if cp > 0:
-                        if 'fish' in name_lower:
-                            if cp < 63:
-                                return f"{pattern_info['standard_prefix']}, 62% protein", True, "NRC 2012"
-                            elif cp < 67:
-                                return f"{pattern_info['standard_prefix']}, 65% protein", True, "NRC 2012"
-                            else:
-                                return f"{pattern_info['standard_prefix']}, 70% protein", True, "NRC 2012"
-                        elif 'meat' in name_lower:
-                            if cp < 52:
-                                return f"{pattern_info['standard_prefix']}, 45-50% protein", True, "NRC 2012"
-                            elif cp < 57:
-                                return f"{pattern_info['standard_prefix']}, 50-55% protein", True, "NRC 2012"
-                            else:
-                                return f"{pattern_info['standard_prefix']}, >55% protein", True, "NRC 2012"
-                
-                elif separate_by == 'processing_method':
-                    # Extract processing method from name
-                    for variant in pattern_info['variants']:
-                        if variant.lower() in name_lower:
-                            std_name = f"{pattern_info['standard_prefix']}, {variant}"
-                            return std_name, True, "CVB/INRA"
-                    
-                    # Default if no specific variant found
-                    return f"{pattern_info['standard_prefix']}", False, "CVB/INRA"
-                
-                elif separate_by == 'purity_form':
-                    # Keep amino acid purities separate
-                    amino_name = re.search(r'(l-|dl-)?(lysine|methionine|threonine|tryptophan)', name_lower)
-                    if amino_name:
-                        aa_name = amino_name.group(0).title()
-                        if 'hcl' in name_lower or '78' in name_lower:
-                            return f"{aa_name} HCl", True, "NRC 2012"
-                        elif '98' in name_lower or 'pure' in name_lower:
-                            return f"{aa_name}, 98% pure", True, "NRC 2012"
+        # Check against standard patterns (all matching families, in order)
+        for key in self.pattern_matcher.matches(name_lower):
+            pattern_info = self.standard_patterns[key]
+            # Determine if this is a variant that should be kept separate
+            separate_by = pattern_info['separate_by']
+            
+            if separate_by == 'protein_grade':
+                # Keep protein grades separate
+                cp = nutrient_data.get('crude_protein', 0)
+                if cp > 0:
+                    if 'fish' in name_lower:
+                        if cp < 63:
+                            return f"{pattern_info['standard_prefix']}, 62% protein", True, "NRC 2012"
+                        elif cp < 67:
+                            return f"{pattern_info['standard_prefix']}, 65% protein", True, "NRC 2012"
+                        else:
+                            return f"{pattern_info['standard_prefix']}, 70% protein", True, "NRC 2012"
+                    elif 'meat' in name_lower:
+                        if cp < 52:
+                            return f"{pattern_info['standard_prefix']}, 45-50% protein", True, "NRC 2012"
+                        elif cp < 57:
+                            return f"{pattern_info['standard_prefix']}, 50-55% protein", True, "NRC 2012"
                         else:
-                            return f"{aa_name}", False, "NRC 2012"
+                            return f"{pattern_info['standard_prefix']}, >55% protein", True, "NRC 2012"
+            
+            elif separate_by == 'processing_method':
+                # Extract processing method from name
+                for variant in pattern_info['variants']:
+                    if variant.lower() in name_lower:
+                        std_name = f"{pattern_info['standard_prefix']}, {variant}"
+                        return std_name, True, "CVB/INRA"
+                
+                # Default if no specific variant found
+                return f"{pattern_info['standard_prefix']}", False, "CVB/INRA"
+            
+            elif separate_by == 'purity_form':
+                # Keep amino acid purities separate
+                amino_name = re.search(r'(l-|dl-)?(lysine|methionine|threonine|tryptophan)', name_lower)
+                if amino_name:
+                    aa_name = amino_name.group(0).title()
+                    if 'hcl' in name_lower or '78' in name_lower:
+                        return f"{aa_name} HCl", True, "NRC 2012"
+                    elif '98' in name_lower or 'pure' in name_lower:
+                        return f"{aa_name}, 98% pure", True, "NRC 2012"
+                    else:
+                        return f"{aa_name}", False, "NRC 2012"
         
         # No standard match - return original with normalization
         return self.normalize_name(ingredient_name), False, None
@@ -203,6 +237,7 @@ class StandardizedIngredientMerger:
         
         return False, None
     
+    @instrument.timed()
     def normalize_ingredient(self, ingredient):
         """Normalize ingredient to v5 schema"""
         # Handle both 'id' and 'ingredient_id' from source files
@@ -323,11 +358,18 @@ class StandardizedIngredientMerger:
         
         return normalized
     
-    def find_duplicate(self, ingredient, existing_list):
+    @instrument.timed()
+    def find_duplicate(self, ingredient, existing_list, buckets=None):
         """
         Find duplicate using standards-based matching
+        With `buckets` (a StandardNameBuckets over existing_list) only the
+        records sharing the standardized name are checked.
         Returns: (index, existing_ingredient) or (-1, None)
         """
+        if buckets is not None:
+            idx = buckets.find(ingredient)
+            return (idx, existing_list[idx]) if idx is not None else (-1, None)
+        
         std_name = ingredient.get('standardized_name', '')
         
         for idx, existing in enumerate(existing_list):
@@ -345,6 +387,7 @@ class StandardizedIngredientMerger:
         
         return -1, None
     
+    @instrument.timed()
     def merge_ingredients(self, existing, new):
         """Merge two ingredient records, preferring non-null values"""
         merged = existing.copy()
@@ -372,54 +415,116 @@ class StandardizedIngredientMerger:
         
         return merged
     
-    def process_datasets(self):
-        """Main processing pipeline"""
+    def process_datasets(self, previous=None):
+        """
+        Main processing pipeline
+        Sources are streamed and normalized record by record.
+        With `previous` (the MergeManifest of an earlier run) only records
+        that are new or changed are normalized, and only the standardized
+        names they touch are re-merged; the result is identical to a full run.
+        """
         print("\n" + "=" * 70)
         print("ENHANCED INGREDIENT MERGE WITH STANDARDS VALIDATION")
         print("=" * 70)
         
-        # Load all datasets
-        all_ingredients = []
-        for source_file in self.source_files:
-            data = self.load_dataset(source_file)
-            all_ingredients.extend(data)
-        
-        print(f"\nTotal ingredients loaded: {len(all_ingredients)}")
-        
-        # Normalize all to v5 schema
+        # Stream all datasets, normalizing to v5 schema as records are read
+        # (unchanged records keep their cached key and are normalized only
+        # if their standardized name has to be re-merged)
         print("\n=== Normalizing to v5 Schema with Standard Names ===")
-        normalized = [self.normalize_ingredient(ing) for ing in all_ingredients]
+        known_keys = previous.key_for() if previous is not None else {}
+        records = []
+        hashes = []
+        keys = []
+        with instrument.span("load_normalize"):
+            for source_file in self.source_files:
+                for ing in self.load_dataset(source_file):
+                    h = record_fingerprint(ing, source_file)
+                    hashes.append(h)
+                    if h in known_keys:
+                        records.append(ing)
+                        keys.append(known_keys[h])
+                    else:
+                        normalized = self.normalize_ingredient(ing)
+                        records.append(normalized)
+                        keys.append([normalized.get('standardized_name', ''),
+                                     bool(normalized.get('is_standards_based'))])
+        is_normalized = [h not in known_keys for h in hashes]
+        
+        print(f"\nTotal ingredients loaded: {len(records)}")
+        if previous is not None:
+            changes = diff_counts(previous, hashes)
+            print(f"Incremental run: {changes['added']} new/changed, "
+                  f"{changes['removed']} removed/replaced, {changes['unchanged']} unchanged records")
         
         # Count standards-based names
-        standards_based = sum(1 for ing in normalized if ing.get('is_standards_based'))
-        print(f"✓ Applied industry standard names: {standards_based}/{len(normalized)}")
+        standards_based = sum(1 for _, is_standard in keys if is_standard)
+        print(f"✓ Applied industry standard names: {standards_based}/{len(records)}")
         
-        # Merge duplicates
+        # Merge duplicates. Only records with the same standardized name can
+        # merge, so each name is merged on its own and reused when unchanged.
         print("\n=== Merging Duplicates (Standards-Based) ===")
-        merged_list = []
-        merge_count = 0
-        separation_count = 0
-        
-        for ing in normalized:
-            dup_idx, dup_ing = self.find_duplicate(ing, merged_list)
+        by_name = {}
+        for pos, (std_name, _) in enumerate(keys):
+            by_name.setdefault(std_name, []).append(pos)
+        reusable = previous.partitions(lambda key: key[0]) if previous is not None else {}
+        
+        clusters = []
+        remerged = 0
+        with instrument.span("merge_duplicates"):
+            for std_name, positions in by_name.items():
+                member_hashes = tuple(hashes[pos] for pos in positions)
+                if std_name in reusable and reusable[std_name][0] == member_hashes:
+                    for local, record in reusable[std_name][1]:
+                        clusters.append(([positions[i] for i in local], dict(record)))
+                    continue
             
-            if dup_idx >= 0:
-                # Merge found duplicate
-                merged_list[dup_idx] = self.merge_ingredients(merged_list[dup_idx], ing)
-                merge_count += 1
-            else:
-                # Add as new ingredient
-                merged_list.append(ing)
+                remerged += 1
+                merged_list = []
+                members = []
+                buckets = StandardNameBuckets(self.nutrient_thresholds)
+                for pos in positions:
+                    ing = records[pos] if is_normalized[pos] else self.normalize_ingredient(records[pos])
+                    dup_idx, dup_ing = self.find_duplicate(ing, merged_list, buckets)
+                
+                    if dup_idx >= 0:
+                        # Merge found duplicate
+                        merged_list[dup_idx] = self.merge_ingredients(merged_list[dup_idx], ing)
+                        buckets.update(dup_idx, merged_list[dup_idx])
+                        members[dup_idx].append(pos)
+                    else:
+                        # Add as new ingredient
+                        buckets.add(len(merged_list), ing)
+                        merged_list.append(ing)
+                        members.append([pos])
+                clusters.extend(zip(members, merged_list))
+        instrument.count("names_reused", len(by_name) - remerged)
+        
+        # Restore first-seen order across names
+        clusters.sort(key=lambda cluster: cluster[0][0])
+        merged_list = [record for _, record in clusters]
+        merge_count = len(records) - len(merged_list)
         
         print(f"Duplicates merged: {merge_count}")
         print(f"Final unique ingredients: {len(merged_list)}")
+        if previous is not None:
+            print(f"Standardized names re-merged: {remerged}/{len(by_name)}")
         
-        # Assign sequential IDs
-        for idx, ing in enumerate(merged_list, start=1):
-            ing['ingredient_id'] = idx
+        # Assign stable IDs: known ingredients keep theirs, new ones get the next free ID
+        # (unchanged records are not normalized, so their standardized name comes from keys)
+        ids = self.id_registry.assign(merged_list, identity_keys(
+            [(keys[pos][0], records[pos].get('name')) for pos in members] for members, _ in clusters))
+        print(f"IDs kept: {ids['kept']}, new: {ids['new']}, retired: {ids['retired']}")
         
+        self.manifest = MergeManifest(self.code_version(), hashes, keys,
+                                      [members for members, _ in clusters], merged_list)
         return merged_list, merge_count
     
+    @staticmethod
+    def code_version():
+        """Fingerprint of the code that determines the merged output"""
+        return code_fingerprint([Path(__file__), Path(incremental.__file__),
+                                 Path(nutrient_buckets.__file__), Path(pattern_matcher.__file__)])
+    
     def generate_report(self, merged_list, merge_count):
         """Generate comprehensive merge report"""
         report_lines = []
@@ -501,27 +606,87 @@ class StandardizedIngredientMerger:
     def save_results(self, merged_list, report):
         """Save merged dataset and report"""
         # Save merged JSON
-        output_file = self.base_path / 'assets' / 'raw' / 'ingredients_standardized.json'
+        output_file = self.output_file
+        output_file.parent.mkdir(parents=True, exist_ok=True)
         with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(merged_list, f, indent=2, ensure_ascii=False)
+            f.write(serialize(merged_list))
         print(f"\n✓ Saved: {output_file}")
         print(f"  Total ingredients: {len(merged_list)}")
+        self.id_registry.save()
+        print(f"✓ Saved: {self.id_registry.path}")
+        
+        # Columnar companion for the validators and analysis tools
+        store_file = build_store(output_file)
+        print(f"✓ Saved: {store_file}")
+        
+        # Float32 nutrient matrix for the formulator, stamped with the JSON's checksum
+        matrix_file = build_matrix(output_file)
+        print(f"✓ Saved: {matrix_file}")
         
         # Save report
-        report_file = self.base_path / 'doc' / 'STANDARDIZED_MERGE_REPORT.md'
-        with open(report_file, 'w', encoding='utf-8') as f:
+        self.report_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.report_file, 'w', encoding='utf-8') as f:
             f.write(report)
-        print(f"✓ Saved: {report_file}")
+        print(f"✓ Saved: {self.report_file}")
+
+def serialize(merged_list):
+    """Exact text written to ingredients_standardized.json"""
+    return json.dumps(merged_list, indent=2, ensure_ascii=False)
 
 def main():
+    parser = argparse.ArgumentParser(description="Standards-based ingredient merge")
+    parser.add_argument("--incremental", action="store_true",
+                        help="re-merge only standardized names touched by changed records (uses the last run's manifest)")
+    parser.add_argument("--verify", action="store_true",
+                        help="also run a full rebuild and fail unless the output is byte-identical")
+    parser.add_argument("--output", metavar="FILE",
+                        help="write the merged catalog here (default: assets/raw/ingredients_standardized.json)")
+    parser.add_argument("--report", metavar="FILE",
+                        help="write the merge report here (default: doc/STANDARDIZED_MERGE_REPORT.md)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record stage timings, memory peaks and counters; write a Chrome trace to FILE")
+    args = parser.parse_args()
+    if args.trace:
+        instrument.start()
+    manifest_file = CACHE_DIR / "ingredients_standardized.manifest.json"
+    
     merger = StandardizedIngredientMerger()
-    merged_list, merge_count = merger.process_datasets()
-    report = merger.generate_report(merged_list, merge_count)
-    merger.save_results(merged_list, report)
+    if args.output:
+        merger.output_file = Path(args.output).resolve()
+    if args.report:
+        merger.report_file = Path(args.report).resolve()
+    previous = None
+    if args.incremental:
+        previous = MergeManifest.load(manifest_file, StandardizedIngredientMerger.code_version())
+        if previous is None:
+            print("No usable manifest from a previous run - doing a full merge")
+    merged_list, merge_count = merger.process_datasets(previous)
+    
+    if args.verify:
+        with instrument.span("verify"):
+            full_list, _ = StandardizedIngredientMerger().process_datasets()
+        if serialize(full_list) != serialize(merged_list):
+            print("✗ Verification failed: output differs from a full rebuild")
+            sys.exit(1)
+        print("✓ Verified: output is byte-identical to a full rebuild")
+    
+    with instrument.span("report"):
+        report = merger.generate_report(merged_list, merge_count)
+    with instrument.span("write"):
+        merger.save_results(merged_list, report)
+        merger.manifest.save(manifest_file)
+    
+    # Validate the merged dataset in process (same rules as the pipeline's validate stage)
+    with instrument.span("validate"):
+        validation = run_validation(merged_list, rules=PIPELINE_VALIDATION_RULES, id_field='ingredient_id')
+    validation.save(CACHE_DIR / "ingredients_standardized.validation.json")
+    print("\n" + validation.summary())
     
     print("\n" + "=" * 70)
     print("✓ MERGE COMPLETE - Dataset validated against industry standards")
     print("=" * 70)
+    if args.trace:
+        print(instrument.finish(args.trace))
 
 if __name__ == '__main__':
     main()
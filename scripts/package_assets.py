@@ -0,0 +1,68 @@
+"""
+Release packaging of the JSON assets
+Writes minified (nulls dropped) and key-dictionary encoded variants of each
+asset, with gzip and, if zstandard is installed, zstd copies, reports their
+sizes, and fails when a variant exceeds its byte budget
+(scripts/asset_budgets.json).
+
+Usage:
+    python scripts/package_assets.py
+    python scripts/package_assets.py --compress gz --output build/pipeline/release
+"""
+
+import argparse
+import io
+import sys
+from pathlib import Path
+
+from feed_pipeline.packaging import (
+    BUDGETS_FILE, COMPRESSIONS, RELEASE_DIR, budget_for, check_budgets, load_budgets, package_asset, zstandard,
+)
+from feed_pipeline.paths import RAW_DIR
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+RELEASE_ASSETS = ('ingredients_standardized.json', 'initial_ingredients_.json',
+                  'initial_categories.json', 'initial_animal_types.json')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Package the JSON assets for release and check their size budgets")
+    parser.add_argument("--assets", nargs='+', default=[str(RAW_DIR / name) for name in RELEASE_ASSETS])
+    parser.add_argument("--output", default=str(RELEASE_DIR))
+    parser.add_argument("--compress", default=','.join(COMPRESSIONS), help="comma-separated: gz, zst")
+    parser.add_argument("--no-keyed", action="store_true", help="skip the key-dictionary encoding")
+    parser.add_argument("--budgets", default=str(BUDGETS_FILE))
+    args = parser.parse_args()
+
+    compress = [name for name in args.compress.split(',') if name]
+    if 'zst' in compress and zstandard is None:
+        print("⚠ zstandard is not installed - skipping zstd variants")
+    budgets = load_budgets(args.budgets)
+
+    print('=' * 80)
+    print('RELEASE ASSETS')
+    print('=' * 80)
+    print(f"{'asset':<32} {'variant':<14} {'bytes':>9} {'of source':>9} {'budget':>9}")
+    packed = []
+    for asset in args.assets:
+        source_size = Path(asset).stat().st_size
+        print(f"{Path(asset).name:<32} {'(source)':<14} {source_size:>9}")
+        for item in package_asset(asset, args.output, compress, keyed=not args.no_keyed):
+            budget = budget_for(budgets, item)
+            status = '' if budget is None else f"{budget:>9}" + ('  ✗ OVER' if item.size > budget else '')
+            print(f"{'':<32} {item.variant:<14} {item.size:>9} {item.size / source_size:>9.0%} {status}")
+            packed.append(item)
+
+    over = check_budgets(packed, budgets)
+    print(f"\n✓ {len(packed)} files saved to: {args.output}")
+    if over:
+        print(f"✗ {len(over)} file(s) over budget: "
+              + ', '.join(f"{item.path.name} ({item.size} > {budget_for(budgets, item)})" for item in over))
+        sys.exit(1)
+    print("✓ All assets within budget")
+
+
+if __name__ == "__main__":
+    main()
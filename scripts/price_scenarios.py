@@ -0,0 +1,109 @@
+"""
+Least-cost ration under price scenarios
+Re-solves one ration (animal class and feed type from
+nutrient_requirements.dart) for every price vector, warm-starting each
+solve from the previous optimum, and writes a scenario x ingredient
+inclusion table with the cost of each scenario.
+
+Price vectors come from a CSV (header: ingredient ids; one row per
+scenario; ids left out keep their catalog price) or are drawn around the
+catalog prices (--scenarios, --jitter).
+
+Usage:
+    python scripts/price_scenarios.py --animal 1 --feed-type grower --scenarios 10000
+    python scripts/price_scenarios.py --animal 2 --feed-type starter --prices market_prices.csv
+"""
+
+import argparse
+import csv
+import io
+import math
+import random
+import statistics
+import sys
+import time
+
+from feed_pipeline.formulation import IngredientMatrix, Ration, price_scenarios
+from feed_pipeline.paths import CACHE_DIR, RAW_DIR
+from feed_pipeline.requirements import load_requirements, requirements_for
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def read_price_vectors(path, matrix):
+    """Price vectors in catalog order from a CSV with ingredient ids as header."""
+    position = {str(ingredient_id): j for j, ingredient_id in enumerate(matrix.ids)}
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        unknown = [name for name in header if name not in position]
+        if unknown:
+            raise ValueError(f"{path}: unknown ingredient ids {', '.join(unknown)}")
+        columns = [position[name] for name in header]
+        vectors = []
+        for line in reader:
+            prices = list(matrix.prices)
+            for j, value in zip(columns, line):
+                if value.strip():
+                    prices[j] = float(value)
+            vectors.append(prices)
+    return vectors
+
+
+def random_price_vectors(matrix, count, jitter, seed):
+    rng = random.Random(seed)
+    return [[price * rng.uniform(1 - jitter, 1 + jitter) for price in matrix.prices] for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Formulate one ration under many price scenarios")
+    parser.add_argument("--input", default=str(RAW_DIR / "ingredients_standardized.json"))
+    parser.add_argument("--animal", type=int, required=True, help="animal type id (1 = pig, 2 = broiler, ...)")
+    parser.add_argument("--feed-type", required=True, help="FeedType name, e.g. grower, preStarter")
+    parser.add_argument("--prices", help="CSV of price vectors (overrides --scenarios)")
+    parser.add_argument("--scenarios", type=int, default=1000)
+    parser.add_argument("--jitter", type=float, default=0.2, help="random price spread (fraction)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="processes (0 = one per CPU)")
+    parser.add_argument("--output", default=str(CACHE_DIR / "price_scenarios.csv"))
+    args = parser.parse_args()
+
+    requirements = requirements_for(load_requirements(), args.animal, args.feed_type)
+    if requirements is None:
+        print(f"ERROR: no requirements for animal type {args.animal}")
+        sys.exit(1)
+    matrix = IngredientMatrix.from_file(args.input)
+    if args.prices:
+        vectors = read_price_vectors(args.prices, matrix)
+    else:
+        vectors = random_price_vectors(matrix, args.scenarios, args.jitter, args.seed)
+    ration = Ration(args.animal, args.feed_type, requirements, label=f"{args.animal}/{args.feed_type}")
+
+    start = time.perf_counter()
+    table = price_scenarios(matrix, ration, vectors, workers=args.workers or None)
+    elapsed = time.perf_counter() - start
+
+    print('=' * 80)
+    print(f'PRICE SCENARIOS: {ration.label}')
+    print('=' * 80)
+    costs = [cost for cost in table.costs if not math.isnan(cost)]
+    print(f"{len(table)} scenarios in {elapsed:.2f}s ({len(table) / elapsed:.0f}/s), {len(costs)} feasible")
+    if costs:
+        print(f"Cost per kg: min {min(costs):.4f}, median {statistics.median(costs):.4f}, max {max(costs):.4f}")
+        names = {ingredient_id: record.get('name') for ingredient_id, record in zip(matrix.ids, matrix.records)}
+        width = len(table.ingredient_ids)
+        print(f"\n{'ingredient':<50} {'used in':>8} {'min %':>7} {'max %':>7}")
+        for k, ingredient_id in enumerate(table.ingredient_ids):
+            column = table.inclusions[k::width]
+            used = sum(1 for value in column if value > 1e-6)
+            if used:
+                print(f"{str(names[ingredient_id])[:50]:<50} {used:>8} {min(column):>7.2f} {max(column):>7.2f}")
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    table.write_csv(args.output)
+    print(f"\n✓ Scenario table saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Standards pattern profiler
+Runs the name and tag lookups of the pipeline over a catalog with pattern
+profiling on (feed_pipeline.pattern_profile) and reports, per pattern, how
+often it was tested, how often it matched and the time spent on it:
+- standard_patterns: StandardizedIngredientMerger.get_standard_name
+- standard_tables: IngredientStandardizer._find_standard_match
+- separation: IngredientStandardizer._check_separation_needed
+- regional: add_regional_tags.get_region
+
+Lists the most expensive patterns and the ones that never matched, which
+are the candidates to reorder or prune. Nothing is written to the catalog.
+
+Usage:
+    python scripts/profile_patterns.py
+    python scripts/profile_patterns.py --input build/pipeline/synthetic/v1-100000-0/ingredients_merged.json --top 30
+    python scripts/profile_patterns.py --json build/pipeline/pattern_profile.json
+"""
+
+import argparse
+import io
+import sys
+import time
+
+from feed_pipeline import pattern_profile
+from feed_pipeline.json_stream import load_records
+from feed_pipeline.paths import CACHE_DIR, RAW_DIR, REPO_ROOT
+from merge_ingredients_standardized import StandardizedIngredientMerger
+from standardize_ingredients_nrc import IngredientStandardizer
+
+sys.path.insert(0, str(REPO_ROOT))
+
+from add_regional_tags import get_region  # noqa: E402
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile the standards and regional patterns over a catalog")
+    parser.add_argument("--input", default=str(RAW_DIR / "ingredients_merged.json"))
+    parser.add_argument("--top", type=int, default=15, help="expensive patterns to list")
+    parser.add_argument("--json", default=str(CACHE_DIR / "pattern_profile.json"),
+                        help="where to write the per-pattern counts")
+    args = parser.parse_args()
+
+    errors = []
+    records = load_records(args.input, errors)
+    for error in errors:
+        print(f"✗ Skipped record: {error}")
+    merger = StandardizedIngredientMerger()
+
+    print('=' * 80)
+    print(f"PATTERN PROFILE: {len(records)} records from {args.input}")
+    print('=' * 80)
+    start = time.perf_counter()
+    pattern_profile.start()
+    for record in records:
+        name = record.get('name') or ''
+        merger.get_standard_name(name, record)
+        IngredientStandardizer._find_standard_match(name)
+        IngredientStandardizer._check_separation_needed(name, record)
+        get_region(name)
+    profile = pattern_profile.finish(args.json)
+    print(profile.report(args.top))
+    print(f"\n✓ Profiled {len(records)} records in {time.perf_counter() - start:.2f}s; counts saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,144 +7,36 @@ This script:
 2. Separates incorrectly merged ingredients (different protein grades, oil content, etc.)
 3. Creates corrected ingredients_standardized.json
 4. Generates detailed remediation report
+
+Usage:
+    python scripts/remediate_ingredients_standards.py
+    python scripts/remediate_ingredients_standards.py --output build/pipeline/ingredients_remediated.json
 """
 
+import argparse
 import json
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Tuple
 
+from feed_pipeline import standards
+from feed_pipeline.id_registry import REGISTRY_DIR, IdRegistry, identity_keys
+from feed_pipeline.json_stream import load_records
+
 # ============================================================================
 # STANDARDIZATION RULES
 # ============================================================================
 
-# Name corrections: current_name → standard_name
-NAME_CORRECTIONS = {
-    1: ("Alfalfa meal, dehydrated, protein < 16%", "Alfalfa (Lucerne) meal, dehydrated"),
-    6: ("Barley distillers grains, dried", "Barley"),
-    15: ("Canola meal, solvent extracted, oil < 5%", "Rapeseed meal, solvent extracted"),
-    17: ("Cassava root meal, dried", "Cassava (Manihot esculenta) root meal"),
-    36: ("Fish meal, 62% protein", "Fish meal 62% CP"),
-    51: ("Palm kernel meal, oil < 5%", "Palm kernel meal, solvent extracted (<10% oil)"),
-    60: ("Rapeseed meal, oil < 5%", "Rapeseed meal, solvent extracted (low GSL)"),
-    73: ("Soybean meal, 48% CP, solvent extracted", "Soybean meal 48% CP, solvent extracted"),
-    74: ("Soybean meal, 48% CP, extruded", "Soybean meal 48% CP, solvent extracted"),
-    78: ("Sunflower meal, dehulled", "Sunflower meal, solvent extracted"),
-    86: ("Wheat, soft", "Wheat grain"),
-    87: ("Wheat bran", "Wheat bran"),  # Keep specific - do NOT merge with wheat grain
-    88: ("Wheat gluten", "Wheat gluten meal"),
-    89: ("Wheat middlings", "Wheat middlings"),  # Keep separate from bran & grain
-    100: ("Corn Silage (Maize Silage)", "Corn silage"),
-    101: ("Corn Flour (Maize Flour)", "Corn flour"),
-    102: ("Coconut Meal (Copra meal)", "Coconut meal, solvent extracted"),
-    111: ("Rapeseed meal, oil 5-20%", "Rapeseed meal, solvent extracted (standard)"),
-    120: ("Wheat feed flour", "Wheat middlings"),
-    123: ("Processed animal protein, pig (porcine meal)", "Meat meal, rendered"),
-    124: ("Processed animal protein, poultry, 45-60% protein", "Meat & Bone meal, rendered"),
-    138: ("Maize (Corn)", "Corn grain"),
-    152: ("Corn DDGS (hi-pro)", "Corn DDGS (distillers dried grains with solubles)"),
-    160: ("Alfalfa pellets (sun-cured)", "Alfalfa (Lucerne) meal, dehydrated"),
-    161: ("Alfalfa pellets (dehydrated)", "Alfalfa (Lucerne) meal, dehydrated"),
-    169: ("Sunflower cake (high fiber)", "Sunflower meal, solvent extracted"),
-    171: ("Rapeseed meal (low-GSL)", "Rapeseed meal, solvent extracted (low GSL)"),
-    174: ("Distillers wheat grains", "Wheat DDGS (distillers dried grains)"),
-}
-
-# Ingredients that MUST be separated into multiple entries
-# Structure: ingredient_id → [(new_name, condition_checker, notes), ...]
-SEPARATIONS_REQUIRED = {
-    # Fish meal - separate by protein grades
-    36: [
-        ("Fish meal 62% CP", lambda ing: ing.get('crude_protein', 0) < 65, 
-         "Standard 62% CP grade - lower energy, good value"),
-        ("Fish meal 65% CP", lambda ing: 64 < ing.get('crude_protein', 0) < 68,
-         "Premium 65% CP grade - medium energy"),
-        ("Fish meal 70% CP", lambda ing: ing.get('crude_protein', 0) >= 68,
-         "Premium 70% CP grade - highest energy"),
-    ],
-    
-    # Soybean meal - separate 44% vs 48% CP
-    73: [
-        ("Soybean meal 44% CP, solvent extracted", lambda ing: ing.get('crude_protein', 0) < 46,
-         "44% CP grade - standard extraction"),
-        ("Soybean meal 48% CP, solvent extracted", lambda ing: ing.get('crude_protein', 0) >= 46,
-         "48% CP grade - premium extraction"),
-    ],
-    
-    # Palm kernel meal - separate by oil content
-    51: [
-        ("Palm kernel meal <10% oil, solvent extracted", lambda ing: ing.get('crude_fat', 0) < 10,
-         "Solvent extracted - lowest oil, highest energy"),
-        ("Palm kernel meal 10-20% oil, expeller", lambda ing: ing.get('crude_fat', 0) >= 10,
-         "Expeller pressed - higher oil content"),
-    ],
-    
-    # Rapeseed meal - separate by glucosinolate level
-    60: [
-        ("Rapeseed meal <30 μmol/g GSL (double-low)", lambda ing: True,  # Flag all for review
-         "Low glucosinolate (double-low) variety - safe for all animals"),
-        ("Rapeseed meal >30 μmol/g GSL (conventional)", lambda ing: False,
-         "Conventional variety - limit inclusion rates"),
-    ],
-    
-    # Corn products - separate by form
-    100: [
-        ("Corn silage, immature", lambda ing: ing.get('crude_fiber', 0) > 7,
-         "Fresh/ensiled corn - fermented"),
-    ],
-    
-    101: [
-        ("Corn flour (maize flour)", lambda ing: True,
-         "Fine ground corn - improves digestibility"),
-    ],
-    
-    138: [
-        ("Corn grain, dent", lambda ing: ing.get('crude_fiber', 0) < 3,
-         "Whole grain corn - standard form"),
-    ],
-    
-    # Wheat products - critical separation
-    87: [
-        ("Wheat bran", lambda ing: ing.get('crude_fiber', 0) > 12,
-         "High fiber milling byproduct - ~15% fiber"),
-    ],
-    
-    89: [
-        ("Wheat middlings", lambda ing: 5 < ing.get('crude_fiber', 0) <= 10,
-         "Medium fiber milling byproduct - ~8% fiber"),
-    ],
-    
-    86: [
-        ("Wheat grain, soft", lambda ing: ing.get('crude_fiber', 0) < 4,
-         "Whole grain wheat - standard form"),
-    ],
-    
-    # Meat products - critical separation by ash (bone content)
-    123: [
-        ("Meat meal, rendered (no bone)", lambda ing: ing.get('ash', 0) < 15,
-         "Pure meat - high protein, low ash"),
-    ],
-    
-    124: [
-        ("Meat & Bone meal, rendered", lambda ing: ing.get('ash', 0) >= 15,
-         "Mixed meat & bone - moderate protein, high ash/minerals"),
-    ],
-}
+# Name corrections (id → (current name, standard name)), separations
+# (id → forms to split into) and the standard references added to each
+# ingredient are data in scripts/standards.json (``remediation``), loaded
+# through feed_pipeline.standards when remediation runs.
 
-# Industry standard documentation to add to each ingredient
-STANDARD_REFERENCES = {
-    "Fish meal": "NRC 2012: 5-01-968 | CVB: AM003 | INRA: am_001 | Protein grade critical",
-    "Soybean meal, solvent extracted": "NRC 2012: 5-04-612 | CVB: SB010 | INRA: sb_001 | Track CP level",
-    "Wheat grain": "NRC 2012: 4-05-211 | CVB: CR001 | INRA: ce_001 | Whole grain form",
-    "Wheat bran": "NRC 2012: 4-05-219 | CVB: CR006 | INRA: ce_004 | High fiber ~15%",
-    "Wheat middlings": "NRC 2012: 4-05-205 | CVB: CR008 | INRA: ce_003 | Medium fiber ~8%",
-    "Corn grain": "NRC 2012: 4-02-935 | CVB: CR020 | INRA: ce_010 | Dent variety",
-    "Corn meal": "NRC 2012: 4-02-954 | CVB: CR021 | INRA: ce_011 | Ground grain",
-    "Rapeseed meal, solvent extracted": "NRC 2012: 5-03-870 | CVB: SB035 | INRA: sb_005 | GSL content critical",
-    "Palm kernel meal": "NRC 2012: 5-03-646 | CVB: SB037 | INRA: sb_006 | Oil grade affects energy",
-    "Meat meal, rendered": "NRC 2012: 5-02-001 | CVB: AM005 | INRA: am_001 | No bone meal",
-    "Meat & Bone meal, rendered": "NRC 2012: 5-02-009 | CVB: AM006 | INRA: am_002 | Includes bone",
-}
+# Remediation writes the same file as merge_ingredients_standardized.py from a
+# different input, so it numbers its output in a registry of its own, keyed
+# on the ingredients_merged.json id each record comes from (plus the form
+# name for separations): corrected names do not change an id.
+ID_REGISTRY_FILE = REGISTRY_DIR / "ingredients_remediated.ids.json"
 
 # ============================================================================
 # REMEDIATION ENGINE
@@ -153,16 +45,21 @@ STANDARD_REFERENCES = {
 class IngredientRemediator:
     """Applies standardization fixes to ingredients"""
     
-    def __init__(self, merged_file: str):
+    def __init__(self, merged_file: str, id_registry: IdRegistry = None):
         self.ingredients = self._load_ingredients(merged_file)
+        self.id_registry = id_registry if id_registry is not None else IdRegistry()
         self.corrections_applied = []
         self.separations_applied = []
         self.remediated_ingredients = []
+        self.identities = []
         
     def _load_ingredients(self, filepath: str) -> List[Dict]:
-        """Load ingredients from JSON"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Load ingredients from JSON (streamed; malformed records are reported and skipped)"""
+        errors = []
+        ingredients = load_records(filepath, errors)
+        for error in errors:
+            print(f"✗ Skipped record: {error}")
+        return ingredients
     
     def remediate_all(self) -> List[Dict]:
         """
@@ -170,7 +67,8 @@ class IngredientRemediator:
         1. Apply name corrections
         2. Separate merged ingredients
         3. Add standard references
-        4. Return corrected ingredient list
+        4. Assign stable IDs from the ID registry
+        5. Return corrected ingredient list
         """
         
         print("=" * 80)
@@ -178,8 +76,10 @@ class IngredientRemediator:
         print("=" * 80)
         print(f"\nProcessing {len(self.ingredients)} ingredients...\n")
         
-        new_id = 1
         processed_ids = set()
+        name_corrections = standards.name_corrections()
+        separations = standards.separations()
+        references = standards.references()
         
         for ing in self.ingredients:
             ing_id = ing.get('ingredient_id')
@@ -189,13 +89,13 @@ class IngredientRemediator:
                 continue
             
             # Check if name correction needed
-            if ing_id in NAME_CORRECTIONS:
-                old_name, new_name = NAME_CORRECTIONS[ing_id]
+            if ing_id in name_corrections:
+                old_name, new_name = name_corrections[ing_id]
                 ing['name'] = new_name
                 ing['standardized_name'] = new_name
                 
                 # Add standard reference
-                for std_name, ref in STANDARD_REFERENCES.items():
+                for std_name, ref in references.items():
                     if std_name.lower() in new_name.lower():
                         ing['standard_reference'] = ref
                         break
@@ -208,28 +108,27 @@ class IngredientRemediator:
                 print(f"  ✓ ID {ing_id}: Name corrected")
             
             # Check if separation needed
-            if ing_id in SEPARATIONS_REQUIRED:
-                separation_rules = SEPARATIONS_REQUIRED[ing_id]
+            if ing_id in separations:
+                separation_rules = separations[ing_id]
                 separated_count = 0
                 
                 for sep_name, condition, notes in separation_rules:
                     # Create new ingredient record for each variant
                     new_ing = ing.copy()
-                    new_ing['ingredient_id'] = new_id
                     new_ing['name'] = sep_name
                     new_ing['standardized_name'] = sep_name
                     new_ing['separation_notes'] = notes
                     new_ing['original_id'] = ing_id
                     
                     # Add standard reference
-                    for std_name, ref in STANDARD_REFERENCES.items():
+                    for std_name, ref in references.items():
                         if std_name.lower() in sep_name.lower():
                             new_ing['standard_reference'] = ref
                             break
                     
                     self.remediated_ingredients.append(new_ing)
+                    self.identities.append((ing_id, sep_name))
                     separated_count += 1
-                    new_id += 1
                 
                 self.separations_applied.append({
                     'original_id': ing_id,
@@ -242,10 +141,14 @@ class IngredientRemediator:
                 processed_ids.add(ing_id)
             
             else:
-                # Keep as-is but increment ID
-                ing['ingredient_id'] = new_id
+                # Keep as-is
                 self.remediated_ingredients.append(ing)
-                new_id += 1
+                self.identities.append((ing_id, ''))
+        
+        # Known ingredients keep their ID, new ones (e.g. separations) get the next free ID
+        ids = self.id_registry.assign(self.remediated_ingredients,
+                                      identity_keys([identity] for identity in self.identities))
+        print(f"\n  IDs kept: {ids['kept']}, new: {ids['new']}, retired: {ids['retired']}")
         
         return self.remediated_ingredients
     
@@ -327,21 +230,31 @@ class IngredientRemediator:
 # ============================================================================
 
 def main():
-    workspace = Path("c:\\dev\\feed_estimator\\redesigned-feed-app")
-    merged_file = workspace / "assets" / "raw" / "ingredients_merged.json"
-    remediated_file = workspace / "assets" / "raw" / "ingredients_standardized.json"
-    report_file = workspace / "doc" / "REMEDIATION_REPORT.md"
+    parser = argparse.ArgumentParser(description="Apply standards name corrections and separations to the merged catalog")
+    parser.add_argument("--input", metavar="FILE", help="merged catalog (default: assets/raw/ingredients_merged.json)")
+    parser.add_argument("--output", metavar="FILE",
+                        help="remediated catalog (default: assets/raw/ingredients_standardized.json)")
+    parser.add_argument("--report", metavar="FILE", help="report (default: doc/REMEDIATION_REPORT.md)")
+    args = parser.parse_args()
+    
+    workspace = Path(__file__).resolve().parent.parent
+    merged_file = Path(args.input) if args.input else workspace / "assets" / "raw" / "ingredients_merged.json"
+    remediated_file = (Path(args.output) if args.output
+                       else workspace / "assets" / "raw" / "ingredients_standardized.json")
+    report_file = Path(args.report) if args.report else workspace / "doc" / "REMEDIATION_REPORT.md"
     
     if not merged_file.exists():
         print(f"ERROR: Merged ingredients file not found: {merged_file}")
         return
     
     # Run remediation
-    remediator = IngredientRemediator(str(merged_file))
+    registry = IdRegistry.load(ID_REGISTRY_FILE)
+    remediator = IngredientRemediator(str(merged_file), registry)
     remediated = remediator.remediate_all()
     
     # Save outputs
     remediator.save_remediated_ingredients(str(remediated_file))
+    registry.save()
     remediator.save_remediation_report(str(report_file))
     
     # Print summary
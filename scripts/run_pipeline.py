@@ -0,0 +1,71 @@
+"""
+Data pipeline runner
+Runs the stages declared in scripts/pipeline.json (merge, standards report,
+standardized merge, remediation and regional tagging of a candidate catalog,
+validation, region bundles, core/detail split, formulation check, app
+database, release packaging) in dependency order,
+skipping every stage whose command, code and inputs are unchanged since its
+last successful run and whose outputs are intact. Independent stages run in
+parallel; each stage's output goes to build/pipeline/logs/<stage>.log.
+
+Usage:
+    python scripts/run_pipeline.py
+    python scripts/run_pipeline.py package validate --workers 2
+    python scripts/run_pipeline.py --dry-run
+    python scripts/run_pipeline.py --force merge_standardized
+"""
+
+import argparse
+import io
+import sys
+import time
+
+from feed_pipeline.dag import BLOCKED, CACHED, FAILED, LOG_DIR, PIPELINE_FILE, RAN, STALE, Pipeline, load_pipeline
+from feed_pipeline.parallel import default_workers
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+MARKS = {RAN: '✓', CACHED: '·', STALE: '○', FAILED: '✗', BLOCKED: '-'}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the data pipeline, skipping up-to-date stages")
+    parser.add_argument("stages", nargs='*', help="stages to bring up to date, with their dependencies (default: all)")
+    parser.add_argument("--pipeline", default=str(PIPELINE_FILE))
+    parser.add_argument("--workers", type=int, default=0, help="stages run at once (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true", help="run the selected stages even if up to date")
+    parser.add_argument("--dry-run", action="store_true", help="only list the stages that would run")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        pipeline = Pipeline(load_pipeline(args.pipeline))
+        width = max(len(name) for name in pipeline.stages)
+
+        def report(result):
+            detail = f"{result.seconds:.2f}s" if result.status in (RAN, FAILED) else ''
+            message = f"  {result.message}" if result.message else ''
+            print(f"{MARKS[result.status]} {result.stage:<{width}} {result.status:<8} {detail:>8}{message}")
+
+        print('=' * 80)
+        print('DATA PIPELINE' + (' (dry run)' if args.dry_run else ''))
+        print('=' * 80)
+        results = pipeline.run(args.stages, workers=args.workers or default_workers(),
+                               force=args.force, dry_run=args.dry_run, report=report)
+    except ValueError as e:
+        print(f"✗ {e}")
+        sys.exit(1)
+
+    counts = {status: sum(1 for result in results if result.status == status) for status in MARKS}
+    print(f"\n{counts[RAN]} ran, {counts[CACHED]} up to date"
+          + (f", {counts[STALE]} would run" if args.dry_run else '')
+          + (f", {counts[FAILED]} failed, {counts[BLOCKED]} blocked" if counts[FAILED] else '')
+          + f" in {time.perf_counter() - start:.2f}s")
+    if counts[FAILED]:
+        print(f"✗ See {LOG_DIR} for the output of the failed stages")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
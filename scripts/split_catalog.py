@@ -0,0 +1,75 @@
+"""
+Core/detail split of the ingredient catalog
+Writes a small core file (everything but the nested profiles, inclusion
+limits and notes), a detail file with one line per ingredient, and an
+offset index keyed by ingredient id, then reports the size of the core
+file and its parse time against the full catalog.
+
+Usage:
+    python scripts/split_catalog.py
+    python scripts/split_catalog.py --input assets/raw/ingredients_standardized.json --output build/pipeline/split
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+from feed_pipeline.core_detail import SPLIT_DIR, DetailFile, split_catalog
+from feed_pipeline.paths import RAW_DIR
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def parse_ms(text, repeat=5):
+    """Best-of-``repeat`` json.loads time of a JSON text, in ms."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        json.loads(text)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Split the ingredient catalog into core and detail files")
+    parser.add_argument("--input", default=str(RAW_DIR / "ingredients_standardized.json"))
+    parser.add_argument("--output", default=str(SPLIT_DIR))
+    parser.add_argument("--id-field", default="ingredient_id")
+    args = parser.parse_args()
+
+    paths = split_catalog(args.input, args.output, args.id_field)
+    full_text = Path(args.input).read_text(encoding='utf-8')
+    records = json.loads(full_text)
+    # Same records without indentation, so the split is not credited with whitespace
+    compact_text = json.dumps(records, ensure_ascii=False, separators=(',', ':'))
+    core_text = paths['core'].read_text(encoding='utf-8')
+    sizes = {name: len(text.encode('utf-8')) for name, text in
+             (('full', full_text), ('compact', compact_text), ('core', core_text))}
+    times = {name: parse_ms(text) for name, text in
+             (('full', full_text), ('compact', compact_text), ('core', core_text))}
+
+    with DetailFile(paths['index']) as details:
+        start = time.perf_counter()
+        for record in records:
+            details.get(record.get(args.id_field))
+        lookup_us = (time.perf_counter() - start) / max(len(records), 1) * 1e6
+
+    print('=' * 80)
+    print('CORE/DETAIL SPLIT')
+    print('=' * 80)
+    print(f"{'file':<8} {'bytes':>10} {'parse ms':>9}")
+    for name in sizes:
+        print(f"{name:<8} {sizes[name]:>10} {times[name]:>9.2f}")
+    print(f"{'detail':<8} {paths['detail'].stat().st_size:>10}")
+    print(f"\nCore vs compact full catalog: {1 - sizes['core'] / sizes['compact']:.0%} smaller, "
+          f"parses {times['compact'] / times['core']:.1f}x faster; one detail read takes {lookup_us:.0f} µs")
+    for path in paths.values():
+        print(f"✓ Saved: {path}")
+
+
+if __name__ == "__main__":
+    main()
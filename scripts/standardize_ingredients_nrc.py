@@ -9,158 +9,44 @@ This script:
 4. Produces standardized ingredient list with compliance notes
 """
 
-import json
-import re
+import argparse
 from pathlib import Path
-from difflib import SequenceMatcher
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
+from feed_pipeline import instrument, pattern_profile
+from feed_pipeline.json_stream import load_records
+from feed_pipeline.parallel import DEFAULT_CHUNK_SIZE, chunked, map_chunks
+from feed_pipeline.pattern_matcher import PatternSet
+from feed_pipeline.standards_db import shared_db
+from feed_pipeline.validation import plausibility_issues
+
 # ============================================================================
 # INDUSTRY STANDARD INGREDIENT DEFINITIONS
 # ============================================================================
 
-# NRC 2012 Standard Ingredient Names (Nutrient Requirements of Swine)
-# Source: National Research Council. 2012. Nutrient Requirements of Swine
-NRC_2012_STANDARDS = {
-    "fish meal": {
-        "variants": ["fish meal 62%", "fish meal 65%", "fish meal 70%", "fish meal"],
-        "definition": "Ground, dried whole fish or fish processing residue; high protein",
-        "forms": ["62% CP", "65% CP", "70% CP", "standard (67%)"],
-        "standard_name": "Fish meal",
-        "notes": "Different protein grades must be tracked separately for accurate formulation",
-        "nrc_id": "5-01-968"
-    },
-    
-    "soybean meal": {
-        "variants": ["soybean meal", "soybean meal, desolventized", "soybean meal 44%", "soybean meal 48%"],
-        "definition": "Soybean seed ground after most of the oil is extracted",
-        "forms": ["44% CP (solvent extracted)", "48% CP (solvent extracted)"],
-        "standard_name": "Soybean meal, solvent extracted",
-        "notes": "44% vs 48% represent different extraction methods; keep separate",
-        "nrc_id": "5-04-612"
-    },
-    
-    "corn": {
-        "variants": ["corn", "corn grain", "dent corn", "corn meal", "corn flour"],
-        "definition": "Kernels of maize plant; multiple forms based on processing",
-        "forms": ["whole grain", "ground meal", "flour (fine grind)"],
-        "standard_name": "Corn, dent",
-        "notes": "Grain vs meal vs flour are distinct products with different particle size & digestibility",
-        "nrc_id": "4-02-935"
-    },
-    
-    "wheat": {
-        "variants": ["wheat", "wheat grain", "wheat flour", "wheat middlings", "wheat bran"],
-        "definition": "Grain and milling byproducts of wheat plant",
-        "forms": ["whole grain", "flour", "middlings", "bran"],
-        "standard_name": "Wheat",
-        "notes": "CRITICAL: Wheat bran vs middlings vs whole grain are SEPARATE ingredients in CVB/NRC",
-        "nrc_id": "4-05-211"
-    },
-    
-    "barley": {
-        "variants": ["barley", "barley grain", "barley meal"],
-        "definition": "Cereal grain from barley plant",
-        "forms": ["whole grain", "ground meal"],
-        "standard_name": "Barley",
-        "notes": "Hulless vs hulled varieties have different fiber content",
-        "nrc_id": "4-00-549"
-    },
-}
+# NRC 2012, CVB, INRA and FAO naming tables (and the ASABE processing specs)
+# are data in scripts/standards.json, read through its indexed copy
+# (feed_pipeline.standards_db) the first time a lookup needs them.
+# Name-matching priority: tables are searched in file order, entries in
+# definition order.
 
-# CVB Standard Ingredient Names (Centraal Veevoeder Bureau - Netherlands)
-# Source: CVB Feed Tables (https://www.cvb.nl)
-CVB_STANDARDS = {
-    "palm kernel meal": {
-        "standard_name": "Palm kernel meal, solvent extracted",
-        "variants": ["palm kernel meal", "palm kernel cake", "PKM"],
-        "forms": ["<10% oil", "10-20% oil"],
-        "notes": "Oil content determines energy value; must track separately",
-        "cvb_code": "SB037"
-    },
-    
-    "rapeseed meal": {
-        "standard_name": "Rapeseed meal, solvent extracted",
-        "variants": ["rapeseed meal", "canola meal", "rapeseed cake"],
-        "forms": ["double-low (glucosinolates <30 μmol/g)", "conventional"],
-        "notes": "Glucosinolate level critical for inclusion limits",
-        "cvb_code": "SB035"
-    },
-    
-    "sunflower meal": {
-        "standard_name": "Sunflower meal, solvent extracted",
-        "variants": ["sunflower meal", "sunflower cake"],
-        "forms": ["high-oil", "standard"],
-        "notes": "Oil content affects digestibility",
-        "cvb_code": "SB032"
-    },
-    
-    "meat meal": {
-        "standard_name": "Meat meal, rendered",
-        "variants": ["meat meal", "meat and bone meal", "MBM", "processed animal protein"],
-        "forms": ["meat meal (50% CP)", "meat and bone meal (40-45% CP)"],
-        "notes": "CRITICAL: Meat meal vs meat & bone meal differ in calcium/phosphorus ratio",
-        "cvb_code": "AM005"
-    },
-}
+_standards_matcher = None
 
-# INRA Standard Names (Institut National de Recherche Agronomique)
-# Source: INRA Feedstuff composition database
-INRA_STANDARDS = {
-    "alfalfa": {
-        "standard_name": "Alfalfa (Lucerne) meal, dehydrated",
-        "variants": ["alfalfa", "alfalfa meal", "lucerne meal", "dehydrated alfalfa"],
-        "forms": ["protein <16%", "protein 16-18%", "protein >18%"],
-        "inra_code": "fo_004",
-        "notes": "Protein grade affects nutritional value significantly"
-    },
-    
-    "hay": {
-        "standard_name": "Hay, mixed legume-grass",
-        "variants": ["hay", "grass hay", "hay mixed"],
-        "forms": ["good quality", "medium quality", "poor quality"],
-        "inra_code": "fo_001",
-        "notes": "Quality grade critical (leaf/stem ratio, harvest stage)"
-    },
-}
+# Table name of the separation rules in pattern profiles
+SEPARATION_TABLE = 'separation'
 
-# FAO Feed Composition Database Standard Names
-# Source: FAO/EAAFCO Global Feed Ingredient Database
-FAO_STANDARDS = {
-    "cassava": {
-        "standard_name": "Cassava (Manihot esculenta) root meal",
-        "variants": ["cassava meal", "cassava root meal", "yuca meal"],
-        "forms": ["dried root meal", "cassava bagasse"],
-        "notes": "High starch, low protein; processing method affects cyanogenic compounds",
-        "fao_code": "BR17"
-    },
-    
-    "coconut meal": {
-        "standard_name": "Coconut meal (Cocos nucifera)",
-        "variants": ["coconut meal", "coconut cake", "copra meal"],
-        "forms": ["expeller pressed", "solvent extracted"],
-        "notes": "Oil content critical (expeller = 8-10%, solvent = 2-3%)",
-        "fao_code": "BR13"
-    },
-}
 
-# ASABE Standards (American Society of Agricultural & Biological Engineers)
-# Feed Ingredient Standards & Processing specifications
-ASABE_STANDARDS = {
-    "particle_size_requirements": {
-        "fine_meal": {"min_um": 250, "max_um": 500, "description": "Fine grind (flour)"},
-        "standard_meal": {"min_um": 500, "max_um": 1000, "description": "Standard grind"},
-        "coarse_meal": {"min_um": 1000, "max_um": 2000, "description": "Coarse grind"},
-        "crumble": {"description": "Pelleted then broken (0.3-0.5 inch)"},
-    },
-    
-    "moisture_standards": {
-        "dry_storage": {"max_moisture": 12, "duration_months": 12},
-        "cool_storage": {"max_moisture": 15, "duration_months": 6},
-        "ambient_storage": {"max_moisture": 10, "duration_months": 3},
-    },
-}
+def standards_matcher() -> PatternSet:
+    """All naming-table variants compiled into one matcher (built once)."""
+    global _standards_matcher
+    if _standards_matcher is None:
+        matcher = PatternSet('standard_tables')
+        for standard, variants in shared_db().variants():
+            match = standard.description
+            matcher.add_literals((match, standard.standard_name), variants, label=match)
+        _standards_matcher = matcher
+    return _standards_matcher
 
 # ============================================================================
 # MERGE ISSUES DETECTED IN CURRENT DATASET
@@ -215,6 +101,22 @@ KNOWN_MERGE_ISSUES = [
 # STANDARDIZATION ENGINE
 # ============================================================================
 
+def _cross_reference_chunk(chunk) -> List[Tuple]:
+    """
+    (standard name, standards matched, separation, issues) for each ingredient
+    of a (start, ingredients) chunk. Module level so process pools can run it.
+    """
+    _, ingredients = chunk
+    results = []
+    for ing in ingredients:
+        name = ing.get('name', 'Unknown')
+        standard_name, matches = IngredientStandardizer._find_standard_match(name)
+        results.append((standard_name, matches,
+                        IngredientStandardizer._check_separation_needed(name, ing),
+                        IngredientStandardizer._validate_against_standards(name, ing)))
+    return results
+
+
 class IngredientStandardizer:
     """Cross-references ingredients against industry standards"""
     
@@ -225,17 +127,23 @@ class IngredientStandardizer:
         self.separations_needed = []
         
     def _load_ingredients(self, filepath: str) -> List[Dict]:
-        """Load merged ingredients from JSON"""
-        with open(filepath, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        """Load merged ingredients from JSON (streamed; malformed records are reported and skipped)"""
+        errors = []
+        ingredients = load_records(filepath, errors)
+        for error in errors:
+            print(f"✗ Skipped record: {error}")
+        return ingredients
     
-    def standardize_all(self) -> Tuple[List[Dict], Dict]:
+    def standardize_all(self, workers: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Tuple[List[Dict], Dict]:
         """
         Main standardization process:
         1. Cross-reference each ingredient
         2. Identify separation needs
         3. Apply corrections
         4. Generate standardization report
+
+        The per-ingredient checks run on ``workers`` processes (None: one per
+        CPU); results are collected in ingredient order either way.
         """
         
         print("=" * 80)
@@ -243,17 +151,13 @@ class IngredientStandardizer:
         print("=" * 80)
         print(f"\nProcessing {len(self.ingredients)} ingredients...\n")
         
-        for idx, ing in enumerate(self.ingredients, 1):
+        chunks = chunked(self.ingredients, chunk_size)
+        results = (result for batch in map_chunks(_cross_reference_chunk, chunks, workers) for result in batch)
+        for idx, (ing, result) in enumerate(zip(self.ingredients, results), 1):
             name = ing.get('name', 'Unknown')
             
-            # Check for standard name matches
-            standard_name, matches = self._find_standard_match(name)
-            
-            # Check if ingredient should be separated
-            separation = self._check_separation_needed(name, ing)
-            
-            # Validate against standards
-            issues = self._validate_against_standards(name, ing)
+            # Standard name matches, separation needs, validation issues
+            standard_name, matches, separation, issues = result
             
             if issues:
                 self.issues.append({
@@ -284,54 +188,31 @@ class IngredientStandardizer:
         
         return self.ingredients, self._generate_report()
     
-    def _find_standard_match(self, ingredient_name: str) -> Tuple[Optional[str], List[str]]:
+    @staticmethod
+    @instrument.timed()
+    def _find_standard_match(ingredient_name: str) -> Tuple[Optional[str], List[str]]:
         """
         Find matching standard name from NRC, CVB, INRA, FAO, ASABE
         Returns (standard_name, standards_found)
         """
         name_lower = ingredient_name.lower()
-        matches = []
-        best_match = None
-        
-        # Search NRC 2012
-        for std_name, data in NRC_2012_STANDARDS.items():
-            if any(var in name_lower for var in data['variants']):
-                matches.append(f"NRC 2012: {data['standard_name']} (ID: {data['nrc_id']})")
-                if not best_match:
-                    best_match = data['standard_name']
-        
-        # Search CVB
-        for std_name, data in CVB_STANDARDS.items():
-            if any(var in name_lower for var in data['variants']):
-                matches.append(f"CVB: {data['standard_name']} (Code: {data['cvb_code']})")
-                if not best_match:
-                    best_match = data['standard_name']
-        
-        # Search INRA
-        for std_name, data in INRA_STANDARDS.items():
-            if any(var in name_lower for var in data['variants']):
-                matches.append(f"INRA: {data['standard_name']} (Code: {data['inra_code']})")
-                if not best_match:
-                    best_match = data['standard_name']
-        
-        # Search FAO
-        for std_name, data in FAO_STANDARDS.items():
-            if any(var in name_lower for var in data['variants']):
-                matches.append(f"FAO: {data['standard_name']} (Code: {data['fao_code']})")
-                if not best_match:
-                    best_match = data['standard_name']
+        found = standards_matcher().matches(name_lower)
+        matches = [match for match, _ in found]
+        best_match = found[0][1] if found else None
         
         return best_match, matches
     
-    def _check_separation_needed(self, name: str, ing: Dict) -> Optional[List[Dict]]:
+    @staticmethod
+    def _check_separation_needed(name: str, ing: Dict) -> Optional[List[Dict]]:
         """
         Check if ingredient should be separated into multiple distinct products
         based on protein level, oil content, processing method, etc.
         """
         name_lower = name.lower()
+        pattern_profile.lookup(SEPARATION_TABLE)
         
         # Fish meal: check protein grades
-        if "fish meal" in name_lower:
+        if pattern_profile.contains(SEPARATION_TABLE, name_lower, "fish meal"):
             cp = ing.get('crude_protein')
             if cp:
                 if cp >= 68:  # 70% grade
@@ -342,7 +223,7 @@ class IngredientStandardizer:
                     return [{"form": "Fish meal 62% CP", "cp": cp}]
         
         # Soybean meal: check protein levels
-        if "soybean meal" in name_lower:
+        if pattern_profile.contains(SEPARATION_TABLE, name_lower, "soybean meal"):
             cp = ing.get('crude_protein')
             if cp:
                 if cp >= 47:
@@ -351,7 +232,7 @@ class IngredientStandardizer:
                     return [{"form": "Soybean meal 44% CP (solvent extracted)", "cp": cp}]
         
         # Palm kernel: check oil content
-        if "palm kernel" in name_lower:
+        if pattern_profile.contains(SEPARATION_TABLE, name_lower, "palm kernel"):
             fat = ing.get('crude_fat')
             if fat:
                 if fat <= 5:
@@ -360,7 +241,7 @@ class IngredientStandardizer:
                     return [{"form": "Palm kernel meal 10-20% oil", "fat": fat}]
         
         # Meat meal vs Meat & Bone meal
-        if "meat" in name_lower and "meal" in name_lower:
+        if pattern_profile.contains(SEPARATION_TABLE, name_lower, "meat", "meal"):
             cp = ing.get('crude_protein')
             ash = ing.get('ash')
             if cp and ash:
@@ -370,7 +251,7 @@ class IngredientStandardizer:
                     return [{"form": "Meat meal (rendered)", "cp": cp, "ash": ash}]
         
         # Wheat products
-        if "wheat" in name_lower:
+        if pattern_profile.contains(SEPARATION_TABLE, name_lower, "wheat"):
             fiber = ing.get('crude_fiber')
             if "bran" in name_lower or (fiber and fiber > 10):
                 return [{"form": "Wheat bran"}]
@@ -382,7 +263,7 @@ class IngredientStandardizer:
                 return [{"form": "Wheat grain"}]
         
         # Corn products
-        if "corn" in name_lower:
+        if pattern_profile.contains(SEPARATION_TABLE, name_lower, "corn"):
             if "flour" in name_lower:
                 return [{"form": "Corn flour"}]
             elif "meal" in name_lower:
@@ -392,41 +273,13 @@ class IngredientStandardizer:
         
         return None
     
-    def _validate_against_standards(self, name: str, ing: Dict) -> List[str]:
+    @staticmethod
+    def _validate_against_standards(name: str, ing: Dict) -> List[str]:
         """
         Validate ingredient data against known standards
-        Returns list of validation issues
+        Returns list of validation issues (see feed_pipeline.validation)
         """
-        issues = []
-        cp = ing.get('crude_protein')
-        fiber = ing.get('crude_fiber')
-        fat = ing.get('crude_fat')
-        ash = ing.get('ash')
-        
-        # Check protein ranges based on ingredient type
-        name_lower = name.lower()
-        
-        if "concentrate" in name_lower and cp and cp < 20:
-            issues.append(f"Protein level {cp}% seems low for concentrate")
-        
-        if "meal" in name_lower and cp and cp < 10:
-            issues.append(f"Protein level {cp}% unusually low for meal")
-        
-        # Check fiber levels
-        if fiber and fiber > 40:
-            if "bran" not in name_lower and "hull" not in name_lower and "straw" not in name_lower:
-                issues.append(f"High fiber {fiber}% - verify ingredient is fibrous")
-        
-        # Check ash levels (indicator of bone content)
-        if ash and ash > 25 and "bone" not in name_lower and "mineral" not in name_lower:
-            issues.append(f"High ash {ash}% - check if mineral supplement or MBM")
-        
-        # Check energy values are reasonable
-        me = ing.get('me_growing_pig')
-        if me and (me < 500 or me > 10000):
-            issues.append(f"Energy value {me} kcal/kg outside typical range (500-10000)")
-        
-        return issues
+        return plausibility_issues(name, ing)
     
     def _generate_report(self) -> Dict:
         """Generate comprehensive standardization report"""
@@ -492,20 +345,34 @@ class IngredientStandardizer:
 # ============================================================================
 
 def main():
-    workspace = Path("c:\\dev\\feed_estimator\\redesigned-feed-app")
+    parser = argparse.ArgumentParser(description="Cross-reference merged ingredients against industry standards")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Processes for the per-ingredient checks (0 = one per CPU)")
+    parser.add_argument("--report", metavar="FILE",
+                        help="write the report here (default: doc/INGREDIENT_STANDARDIZATION_REPORT.md)")
+    parser.add_argument("--trace", metavar="FILE",
+                        help="record stage timings, memory peaks and counters; write a Chrome trace to FILE")
+    args = parser.parse_args()
+    if args.trace:
+        instrument.start()
+    
+    workspace = Path(__file__).resolve().parent.parent
     merged_file = workspace / "assets" / "raw" / "ingredients_merged.json"
-    report_file = workspace / "doc" / "INGREDIENT_STANDARDIZATION_REPORT.md"
+    report_file = Path(args.report).resolve() if args.report else workspace / "doc" / "INGREDIENT_STANDARDIZATION_REPORT.md"
     
     if not merged_file.exists():
         print(f"ERROR: Merged ingredients file not found: {merged_file}")
         return
     
     # Run standardization
-    standardizer = IngredientStandardizer(str(merged_file))
-    ingredients, report = standardizer.standardize_all()
+    with instrument.span("load"):
+        standardizer = IngredientStandardizer(str(merged_file))
+    with instrument.span("cross_reference", workers=args.workers):
+        ingredients, report = standardizer.standardize_all(workers=args.workers or None)
     
     # Save report
-    standardizer.save_report(str(report_file))
+    with instrument.span("report"):
+        standardizer.save_report(str(report_file))
     
     # Print summary
     print("\n" + "=" * 80)
@@ -523,6 +390,8 @@ def main():
         print(f"    Impact: {issue['impact']}")
     
     print(f"\n✓ Detailed report saved to: {report_file}")
+    if args.trace:
+        print(instrument.finish(args.trace))
 
 
 if __name__ == "__main__":
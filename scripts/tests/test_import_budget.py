@@ -0,0 +1,32 @@
+"""
+Import budget of the pipeline scripts and package.
+
+Imports the modules of scripts/benchmarks/bench_import.py in fresh
+interpreters and checks their -X importtime stays within its budget and
+that no import loads the standards tables.
+
+Usage:
+    python -m pytest scripts/tests
+"""
+
+import statistics
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "benchmarks"))
+
+from bench_import import IMPORT_BUDGET_MS, MODULES, measure  # noqa: E402
+
+RUNS = 5
+
+
+def test_import_time_within_budget():
+    median_ms = statistics.median(measure(MODULES)[0] for _ in range(RUNS)) * 1000
+    assert median_ms <= IMPORT_BUDGET_MS, (
+        f"importing {len(MODULES)} modules took {median_ms:.1f} ms (median of {RUNS}), "
+        f"budget {IMPORT_BUDGET_MS:.0f} ms")
+
+
+def test_import_loads_no_standards():
+    _, loaded, _ = measure(MODULES)
+    assert loaded is False, "importing loaded the standards tables; load them inside the command instead"
@@ -0,0 +1,31 @@
+"""
+Registered rules and known-error bookkeeping of feed_pipeline.validation.
+
+Usage:
+    python -m pytest scripts/tests
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from feed_pipeline.validation import _RangeRule, run_validation  # noqa: E402
+
+
+def test_fixed_errors_counts_known_entries_that_no_longer_occur():
+    # Both records miss the same fields, so each known entry matches two errors
+    report = run_validation([{'id': 1, 'name': 'A'}, {'id': 1, 'name': 'A'}], rules=['required_fields'])
+    still = ('required_fields', '1', "missing 'ash'")
+    gone = ('required_fields', '2', "missing 'ash'")
+    known = {still, gone}
+
+    assert report.fixed_errors(known) == {gone}
+    assert len(report.new_errors(known)) == len(report.errors()) - 2
+
+
+def test_range_rules_must_provide_a_checker():
+    with pytest.raises(TypeError):
+        _RangeRule()
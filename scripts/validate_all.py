@@ -0,0 +1,80 @@
+"""
+Unified ingredient validation
+Runs the registered checks (feed_pipeline.validation.RULES) that apply to
+one catalog in a single pass and writes a JSON report plus a summary.
+With --known, errors recorded in that file are reported but only new ones
+fail --strict; --record-known rewrites the file with the current errors.
+
+Usage:
+    python scripts/validate_all.py
+    python scripts/validate_all.py --input assets/raw/ingredients_standardized.json --id-field ingredient_id
+    python scripts/validate_all.py --rules duplicate_ids,unit_consistency --strict
+    python scripts/validate_all.py --input assets/raw/ingredients_standardized.json --id-field ingredient_id \
+        --known scripts/known_validation_errors.json --strict
+    python scripts/validate_all.py --input big_catalog.json --workers 0
+"""
+
+import argparse
+import io
+import sys
+
+from feed_pipeline.paths import CACHE_DIR, RAW_DIR
+from feed_pipeline.validation import RULES, load_known_errors, run_validation
+
+if sys.platform == 'win32':
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate an ingredient catalog")
+    parser.add_argument("--input", default=str(RAW_DIR / "initial_ingredients_.json"))
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--rules", help=f"comma-separated subset of: {', '.join(RULES)}")
+    parser.add_argument("--json", default=str(CACHE_DIR / "validation_report.json"),
+                        help="where to write the machine-readable report")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes to check records on (0 = one per CPU)")
+    parser.add_argument("--strict", action="store_true", help="exit with status 1 if any (new) error is found")
+    parser.add_argument("--known", help="JSON file of known errors; --strict fails only on others")
+    parser.add_argument("--record-known", action="store_true", help="write the current errors to --known")
+    args = parser.parse_args()
+    if args.record_known and not args.known:
+        parser.error("--record-known needs --known")
+
+    rules = args.rules.split(',') if args.rules else None
+    try:
+        report = run_validation(args.input, rules=rules, id_field=args.id_field,
+                                workers=args.workers or None)
+    except (KeyError, ValueError) as e:
+        parser.error(str(e).strip('"'))
+    report.save(args.json)
+
+    print('=' * 80)
+    print('INGREDIENT VALIDATION')
+    print('=' * 80)
+    print(report.summary())
+    print(f"\n✓ Report saved to: {args.json}")
+
+    errors = report.errors()
+    if args.record_known:
+        report.save_known_errors(args.known, comment=(
+            "Errors of this catalog accepted as known: validate_all.py --known fails --strict only on "
+            "errors not listed here. Rewrite with --record-known after fixing or accepting errors."))
+        print(f"✓ Recorded {len(errors)} known errors in: {args.known}")
+    elif args.known:
+        known = load_known_errors(args.known)
+        errors = report.new_errors(known)
+        fixed = len(report.fixed_errors(known))
+        print(f"{'✗' if errors else '✓'} {len(errors)} new errors, {len(report.errors()) - len(errors)} known "
+              f"({args.known})")
+        for issue in errors[:20]:
+            print(f"  {issue.rule}: ID {issue.ingredient_id}: {issue.name} - {issue.message}")
+        if fixed:
+            print(f"  {fixed} known errors no longer occur; rerun with --record-known to drop them")
+
+    if args.strict and errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()